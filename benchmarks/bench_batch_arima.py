@@ -0,0 +1,74 @@
+"""
+Benchmark of the batched estimation of one order on many series against statsmodels one by one.
+
+    python -m benchmarks.bench_batch_arima --count 500 --length 1000 --order 1,1,1
+"""
+import sys
+import time
+import argparse
+import warnings
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_pipeline import generate_series
+from src.models.batch_arima import BatchARIMA
+
+
+def run_benchmark(count: int, length: int, order: tuple[int, int, int], sample: int = 10, steps: int = 24) -> dict:
+    """
+    Args:
+        count: Number of series
+        length: Number of points of each series
+        order: The (p, d, q) order estimated on every series
+        sample(optional) default 10: Number of series fitted one by one with statsmodels, extrapolated to count
+        steps(optional) default 24: Number of periods forecasted
+
+    Returns:
+        A dict with the seconds of each mode, the speedup and the largest forecast difference in standard deviations.
+    """
+
+    from statsmodels.tsa.arima.model import ARIMA
+
+    data = pd.DataFrame({f'BENCH{seed}': generate_series(length, order=order, seed=seed)['Close'] for seed in range(count)})
+    warnings.simplefilter('ignore')
+
+    start = time.perf_counter()
+    forecasts = BatchARIMA(order).fit(data).forecast(steps)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    differences = []
+    for symbol in data.columns[:sample]:
+        forecast = ARIMA(data[symbol], order=order).fit().get_forecast(steps)
+        deviation = np.sqrt(forecast.var_pred_mean.to_numpy())
+        differences.append(np.max(np.abs(forecasts[symbol].to_numpy() - forecast.predicted_mean.to_numpy()) / deviation))
+    single_seconds = (time.perf_counter() - start) / min(sample, count) * count
+
+    return {
+        'count': count,
+        'length': length,
+        'order': list(order),
+        'batch_seconds': batch_seconds,
+        'single_seconds_estimated': single_seconds,
+        'speedup': single_seconds / batch_seconds,
+        'max_forecast_difference_sd': float(max(differences)),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark of the batched ARIMA estimation.')
+    parser.add_argument('--count', type=int, default=200, help='Number of series')
+    parser.add_argument('--length', type=int, default=1000, help='Number of points of each series')
+    parser.add_argument('--order', default='1,1,1', help='ARIMA order of every series')
+    parser.add_argument('--sample', type=int, default=10, help='Number of series fitted one by one')
+    args = parser.parse_args(argv)
+
+    order = tuple(int(value) for value in args.order.split(','))
+    for name, value in run_benchmark(args.count, args.length, order, sample=args.sample).items():
+        print(f"{name:<28} {value}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,91 @@
+"""
+Benchmark of the order search with a cheap pre-screening against pmdarima's auto_arima.
+
+    python -m benchmarks.bench_order_prescreen --length 1000 --repeat 2 --top-k 3
+"""
+import io
+import sys
+import time
+import argparse
+import warnings
+from contextlib import redirect_stdout
+from typing import List, Optional
+
+from benchmarks.bench_pipeline import generate_series
+from src.models.order_prescreen import PrescreenOrderSearch, _fit_auto_arima_aic
+
+ORDERS = [(0, 1, 0), (1, 1, 0), (0, 1, 1), (1, 1, 1), (2, 1, 0), (0, 1, 2), (2, 1, 1), (1, 0, 0), (1, 0, 1), (2, 1, 2)]
+
+
+def run_benchmark(length: int, repeat: int, top_k: int) -> dict:
+    """
+    Args:
+        length: Number of points of each series
+        repeat: Number of series of each true order
+        top_k: Number of candidates fitted by exact maximum likelihood
+
+    Returns:
+        A dict with the seconds of each search, how often both choose the same order, how often the chosen
+        order has an AIC at most as high as the one of auto_arima (or at most 2 higher, a difference the
+        AIC does not resolve), and the exact fits of each search, auto_arima's counted from its trace.
+    """
+
+    import pmdarima as pm
+
+    cases, same_order, as_good, within_2, auto_fits, exact_fits, grid = 0, 0, 0, 0, 0, 0, 0
+    auto_seconds, prescreen_seconds = 0.0, 0.0
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for round_ in range(repeat):
+            for index, order in enumerate(ORDERS):
+                data = generate_series(length, order=order, seed=round_ * len(ORDERS) + index)['Close']
+
+                trace = io.StringIO()
+                start = time.perf_counter()
+                with redirect_stdout(trace):
+                    auto_order = pm.auto_arima(data.to_numpy(), start_p=1, start_d=1, start_q=1, error_action='ignore', suppress_warnings=True, trace=True).order
+                auto_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                result = PrescreenOrderSearch(top_k=top_k).run(data)
+                prescreen_seconds += time.perf_counter() - start
+
+                difference = 0.0 if result.order == auto_order else result.results[result.order] - _fit_auto_arima_aic(data.to_numpy(), auto_order)
+                cases += 1
+                same_order += result.order == auto_order
+                as_good += difference <= 0
+                within_2 += difference <= 2
+                auto_fits += sum(line.startswith(' ARIMA(') for line in trace.getvalue().splitlines())
+                exact_fits += len(result.results)
+                grid += len(result.approximate)
+
+    return {
+        'cases': cases,
+        'length': length,
+        'top_k': top_k,
+        'auto_arima_seconds': auto_seconds,
+        'prescreen_seconds': prescreen_seconds,
+        'speedup': auto_seconds / prescreen_seconds,
+        'same_order_rate': same_order / cases,
+        'aic_as_good_rate': as_good / cases,
+        'aic_within_2_rate': within_2 / cases,
+        'auto_arima_fits': auto_fits,
+        'exact_fits': exact_fits,
+        'fits_avoided': auto_fits - exact_fits,
+        'candidates_screened': grid,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark of the order search with pre-screening.')
+    parser.add_argument('--length', type=int, default=1000, help='Number of points of each series')
+    parser.add_argument('--repeat', type=int, default=2, help='Number of series of each true order')
+    parser.add_argument('--top-k', type=int, default=3, help='Number of candidates fitted by exact maximum likelihood')
+    args = parser.parse_args(argv)
+
+    for name, value in run_benchmark(args.length, args.repeat, args.top_k).items():
+        print(f"{name:<28} {value}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
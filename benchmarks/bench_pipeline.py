@@ -0,0 +1,234 @@
+"""
+Benchmark of the prediction pipeline on synthetic ARIMA series, without network.
+
+    python -m benchmarks.bench_pipeline --length 2000 --count 10 --output benchmark_results.json
+    python -m benchmarks.bench_pipeline --compare benchmark_results.json
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima_process import arma_generate_sample
+
+from src.models.data_source import DataSource
+from src.models.model_store import ModelStore
+from src.models.predictor import Predictor
+from src.models.cache_handler import fingerprint
+
+STAGES = (
+    'preprocess',
+    'autofit_ARIMA',
+    'create_ARIMA_model',
+    'make_forecast',
+    'make_performance_prediction',
+    'cache_write',
+    'cache_read',
+)
+
+
+def generate_series(length: int, order: tuple[int, int, int] = (1, 1, 1), seed: int = 0) -> pd.DataFrame:
+    """
+    Generates a synthetic closing price series following an ARIMA process
+
+    Args:
+        length: Number of business days
+        order(optional) default (1, 1, 1): The (p, d, q) order of the process
+        seed(optional) default 0: Seed of the random generator
+
+    Returns:
+        A Pandas DataFrame with a 'Close' column, like a download.
+    """
+
+    p, d, q = order
+    rng = np.random.default_rng(seed)
+    ar = np.r_[1, -rng.uniform(0.1, 0.5, p) / max(p, 1)]
+    ma = np.r_[1, rng.uniform(0.1, 0.5, q) / max(q, 1)]
+    values = arma_generate_sample(ar, ma, length, scale=0.5, distrvs=rng.standard_normal, burnin=100)
+    for _ in range(d):
+        values = np.cumsum(values)
+    close = 100 + values - min(values.min(), 0)
+    dates = pd.date_range('1990-01-01', periods=length, freq='B')
+    return pd.DataFrame({'Close': close}, index=dates)
+
+
+class SyntheticDataSource(DataSource):
+    """ A data source with synthetic ARIMA series, the symbol is 'BENCH{seed}' """
+    def __init__(self, length: int, order: tuple[int, int, int] = (1, 1, 1)) -> None:
+        self._length = length
+        self._order = order
+
+    def download(self, symbol: str, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        data = generate_series(self._length, self._order, seed=int(symbol.removeprefix('BENCH')))
+        return data if start is None else data[data.index >= start]
+
+
+def _timed(function: Callable, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _peak_memory(function: Callable, *args, **kwargs) -> int:
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _run_series(predictor: Predictor, symbol: str, raw: pd.DataFrame, steps: int, timings: Dict[str, List[float]]) -> None:
+    """Times every stage of the pipeline on one series"""
+    close_prices, seconds = _timed(predictor._preprocess_data, raw, symbol=symbol)
+    timings['preprocess'].append(seconds)
+
+    pdq_order, seconds = _timed(predictor.autofit_ARIMA, close_prices, symbol=symbol, trace=False)
+    timings['autofit_ARIMA'].append(seconds)
+
+    model, seconds = _timed(predictor.create_ARIMA_model, close_prices, pdq_order, symbol=symbol)
+    timings['create_ARIMA_model'].append(seconds)
+
+    _, seconds = _timed(model.forecast, steps=steps)
+    timings['make_forecast'].append(seconds)
+
+    _, seconds = _timed(predictor.make_performance_prediction, model=model, data=close_prices)
+    timings['make_performance_prediction'].append(seconds)
+
+    cache = predictor._cache
+    _, seconds = _timed(cache.insert_series, {f'{symbol}_close_prices': close_prices})
+    timings['cache_write'].append(seconds)
+    _, seconds = _timed(cache.get_series, f'{symbol}_close_prices')
+    timings['cache_read'].append(seconds)
+
+    _cleanup(predictor, symbol, close_prices, pdq_order)
+
+
+def _cleanup(predictor: Predictor, symbol: str, close_prices: pd.Series, pdq_order: tuple[int, int, int]) -> None:
+    """Removes what the benchmark wrote in the cache, so every run starts cold"""
+    cache = predictor._cache
+    cache.delete_series(f'{symbol}_close_prices')
+    cache.delete([
+        ModelStore.key(symbol, pdq_order, fingerprint(close_prices)),
+        f'arima_{symbol}_latest',
+        predictor._orders.key(symbol, close_prices),
+    ])
+    predictor._orders.invalidate(symbol)
+
+
+def _summarize(samples: List[float]) -> dict:
+    values = np.asarray(samples)
+    return {
+        'n': len(values),
+        'total_s': float(values.sum()),
+        'throughput_per_s': float(len(values) / values.sum()) if values.sum() else None,
+        'p50_ms': float(np.percentile(values, 50) * 1000),
+        'p99_ms': float(np.percentile(values, 99) * 1000),
+    }
+
+
+def run_benchmark(length: int = 1000, count: int = 5, order: tuple[int, int, int] = (1, 1, 1), steps: int = 24, memory: bool = True) -> dict:
+    """
+    Runs the pipeline on count synthetic series of the given length
+
+    Args:
+        length(optional) default 1000: Number of points of each series
+        count(optional) default 5: Number of series
+        order(optional) default (1, 1, 1): The (p, d, q) order of the generated series
+        steps(optional) default 24: Number of forecasted periods
+        memory(optional) default True: Measures the peak memory of each stage on an extra run of the first series
+
+    Returns:
+        A dict with the metadata of the run and the statistics of each stage.
+    """
+
+    source = SyntheticDataSource(length, order)
+    predictor = Predictor(data_source=source)
+    timings = {stage: [] for stage in STAGES}
+
+    for seed in range(count):
+        symbol = f'BENCH{seed}'
+        _run_series(predictor, symbol, source.download(symbol), steps, timings)
+
+    stages = {stage: _summarize(samples) for stage, samples in timings.items()}
+
+    if memory:
+        symbol = 'BENCH0'
+        raw = source.download(symbol)
+        close_prices = predictor._preprocess_data(raw, symbol=symbol)
+        pdq_order = predictor.autofit_ARIMA(close_prices, symbol=symbol, trace=False)
+        model = predictor.create_ARIMA_model(close_prices, pdq_order, symbol=symbol)
+        _cleanup(predictor, symbol, close_prices, pdq_order)
+        peaks = {
+            'preprocess': lambda: predictor._preprocess_data(raw, symbol=symbol),
+            'autofit_ARIMA': lambda: predictor._search_order(close_prices, trace=False),
+            'create_ARIMA_model': lambda: predictor.create_ARIMA_model(close_prices, pdq_order, symbol=symbol),
+            'make_forecast': lambda: model.forecast(steps=steps),
+            'make_performance_prediction': lambda: predictor.make_performance_prediction(model=model, data=close_prices),
+            'cache_write': lambda: predictor._cache.insert_series({f'{symbol}_close_prices': close_prices}),
+            'cache_read': lambda: predictor._cache.get_series(f'{symbol}_close_prices'),
+        }
+        for stage, function in peaks.items():
+            stages[stage]['peak_memory_bytes'] = _peak_memory(function)
+        _cleanup(predictor, symbol, close_prices, pdq_order)
+
+    return {
+        'meta': {
+            'length': length,
+            'count': count,
+            'order': list(order),
+            'steps': steps,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'stages': stages,
+    }
+
+
+def compare(current: dict, baseline: dict) -> str:
+    """Formats the p50 latency of each stage against a previous result"""
+    lines = [f"{'stage':<30}{'baseline p50':>14}{'current p50':>14}{'ratio':>8}"]
+    for stage, stats in current['stages'].items():
+        old = baseline['stages'].get(stage)
+        if old is None:
+            continue
+        ratio = stats['p50_ms'] / old['p50_ms'] if old['p50_ms'] else float('nan')
+        lines.append(f"{stage:<30}{old['p50_ms']:>12.2f}ms{stats['p50_ms']:>12.2f}ms{ratio:>8.2f}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark of the prediction pipeline on synthetic series.')
+    parser.add_argument('--length', type=int, default=1000, help='Number of points of each series')
+    parser.add_argument('--count', type=int, default=5, help='Number of series')
+    parser.add_argument('--order', default='1,1,1', help='ARIMA order of the generated series')
+    parser.add_argument('--steps', type=int, default=24, help='Number of forecasted periods')
+    parser.add_argument('--no-memory', action='store_true', help='Skips the peak memory measurement')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file with the results')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare with')
+    args = parser.parse_args(argv)
+
+    order = tuple(int(value) for value in args.order.split(','))
+    results = run_benchmark(args.length, args.count, order, args.steps, memory=not args.no_memory)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    for stage, stats in results['stages'].items():
+        print(f"{stage:<30} p50={stats['p50_ms']:9.2f}ms p99={stats['p99_ms']:9.2f}ms "
+              f"throughput={stats['throughput_per_s'] or 0:9.2f}/s peak={stats.get('peak_memory_bytes', 0) / 1e6:8.2f}MB")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print('\n' + compare(results, json.load(f)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,85 @@
+"""
+Benchmark of the application startup: each measurement runs in a new interpreter, so nothing is imported before.
+
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Optional
+
+from src.models.warmup import HEAVY_MODULES
+
+# Each snippet prints the seconds it measured
+SNIPPETS = {
+    'import_controller': (
+        "import time; start = time.perf_counter()\n"
+        "import src.controllers.predictor_controller\n"
+        "print(time.perf_counter() - start)"
+    ),
+    'create_predictor': (
+        "import time; start = time.perf_counter()\n"
+        "from src.models.predictor import Predictor; Predictor()\n"
+        "print(time.perf_counter() - start)"
+    ),
+    'import_heavy_modules': (
+        "import time, importlib; start = time.perf_counter()\n"
+        f"[importlib.import_module(module) for module in {HEAVY_MODULES!r}]\n"
+        "print(time.perf_counter() - start)"
+    ),
+}
+
+
+def measure(snippet: str, repeat: int = 3) -> Dict[str, float]:
+    """
+    Runs a snippet in new interpreters
+
+    Args:
+        snippet: Python code that prints the seconds it measured
+        repeat(optional) default 3: Number of interpreters
+
+    Returns:
+        A dict with the median, min and max milliseconds.
+    """
+
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', snippet], capture_output=True, text=True, check=True).stdout
+        times.append(float(output.strip().splitlines()[-1]) * 1000)
+
+    return {'median_ms': statistics.median(times), 'min_ms': min(times), 'max_ms': max(times)}
+
+
+def loaded_modules(module: str = 'src.controllers.predictor_controller') -> List[str]:
+    """Names of the heavy modules already in sys.modules after importing the given module"""
+    snippet = (
+        f"import sys, {module}\n"
+        f"print(','.join(name for name in {HEAVY_MODULES + ('matplotlib.pyplot',)!r} if name in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, '-c', snippet], capture_output=True, text=True, check=True).stdout
+    return [name for name in output.strip().split(',') if name]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark of the application startup.')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of interpreters per measurement')
+    parser.add_argument('--output', help='JSON file with the results')
+    args = parser.parse_args(argv)
+
+    results = {name: measure(snippet, args.repeat) for name, snippet in SNIPPETS.items()}
+    results['loaded_at_startup'] = loaded_modules()
+
+    for name, stats in results.items():
+        if name != 'loaded_at_startup':
+            print(f"{name:<25} median={stats['median_ms']:9.2f}ms min={stats['min_ms']:9.2f}ms max={stats['max_ms']:9.2f}ms")
+    print(f"{'loaded_at_startup':<25} {', '.join(results['loaded_at_startup']) or '-'}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
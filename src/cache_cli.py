@@ -0,0 +1,50 @@
+import json
+import argparse
+
+from src.models.cache_config import CacheConfig
+from src.models.cache_handler import CacheHandler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Inspects and maintains the cache of the predictor.')
+    parser.add_argument('--config', help='JSON file with the cache configuration, default is $STOCKPREDICTOR_CACHE_CONFIG')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('config', help='Shows the configuration in use')
+    commands.add_parser('stats', help='Shows the size and the entries of each namespace')
+    keys = commands.add_parser('keys', help='Lists the keys of the disk tier')
+    keys.add_argument('--prefix', default='', help='Only the keys that start with this prefix, e.g. pdq_AAPL')
+    delete = commands.add_parser('delete', help='Deletes keys from the disk tier')
+    delete.add_argument('keys', nargs='+')
+    commands.add_parser('expire', help='Removes the expired entries')
+    commands.add_parser('clear', help='Deletes every entry')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = CacheConfig.load(path=args.config)
+
+    if args.command == 'config':
+        print(json.dumps(config.to_dict(), indent=2))
+        return
+
+    cache = CacheHandler(config=config)
+    try:
+        if args.command == 'stats':
+            print(json.dumps(cache.inspect(), indent=2))
+        elif args.command == 'keys':
+            for key in sorted(cache.keys(args.prefix)):
+                print(key)
+        elif args.command == 'delete':
+            cache.delete(args.keys)
+            cache.delete_series(args.keys)
+        elif args.command == 'expire':
+            print(f"{cache.expire()} expired entries removed")
+        elif args.command == 'clear':
+            cache.clear()
+    finally:
+        cache.close()
+
+
+if __name__ == '__main__':
+    main()
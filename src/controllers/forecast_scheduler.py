@@ -0,0 +1,105 @@
+import threading
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Optional
+
+from ..models.forecast_store import ForecastStore
+from ..models.prediction_request import PredictionRequest
+from ..models.predictor import Predictor
+from ..models.watchlist import Watchlist
+
+
+class ForecastScheduler:
+    """
+    Precomputes the forecasts of a watchlist on a background thread: every weekday after the market
+    closes, or on a fixed interval. The stale symbols are refreshed the most requested first, and the
+    results go to a ForecastStore where the GUI and the service read them without waiting.
+    """
+    def __init__(self, predictor: Predictor, watchlist: Watchlist, store: ForecastStore, interval: Optional[float] = None, after_close: time = time(18, 30), request_factory: Optional[Callable[[str], PredictionRequest]] = None) -> None:
+        """
+        Args:
+            predictor: The Predictor that computes the forecasts
+            watchlist: The symbols to precompute
+            store: Where the results are kept
+            interval(optional): Seconds between two runs, None to run once a weekday at after_close
+            after_close(optional) default 18:30: Local time of the daily run, after the market closes
+            request_factory(optional): Creates the PredictionRequest of a symbol, default is PredictionRequest(symbol)
+        """
+
+        self.predictor = predictor
+        self.watchlist = watchlist
+        self.store = store
+        self.interval = interval
+        self.after_close = after_close
+        self._request_factory = request_factory if request_factory is not None else PredictionRequest
+        self._stop = threading.Event()
+        self._running = threading.Lock()  # One run at a time, a triggered run waits for the scheduled one
+        self._thread: Optional[threading.Thread] = None
+        self.last_run: Optional[datetime] = None
+
+    def start(self) -> None:
+        """Runs once for the stale symbols and then on the schedule, until stop()"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='forecast-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops after the symbol being computed"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def next_run(self, now: datetime) -> datetime:
+        """The time of the run after now"""
+        if self.interval is not None:
+            return now + timedelta(seconds=self.interval)
+
+        run = datetime.combine(now.date(), self.after_close)
+        if run <= now:
+            run += timedelta(days=1)
+        while run.weekday() >= 5:  # Saturday and Sunday have no new bars
+            run += timedelta(days=1)
+        return run
+
+    def run_once(self, force: bool = False) -> Dict[str, str]:
+        """
+        Recomputes the forecasts of the watchlist, the most requested symbols first
+
+        Args:
+            force(optional) default False: Recomputes also the symbols whose record is still fresh
+
+        Returns:
+            The outcome of each symbol: 'computed', 'fresh' or the error.
+        """
+
+        outcomes = {}
+        self.watchlist.flush()  # The requests counted since the last run are saved even when no request comes
+        with self._running:
+            for symbol in self.watchlist.by_priority():
+                if self._stop.is_set():
+                    break
+                if not force and not self.store.is_stale(self.store.load(symbol)):
+                    outcomes[symbol] = 'fresh'
+                    continue
+
+                try:
+                    with self.predictor.metrics.span('precompute'):
+                        request = self.predictor.predict(self._request_factory(symbol))
+                    self.store.save(request)
+                    self.predictor.metrics.incr('precomputed')
+                    outcomes[symbol] = 'computed'
+                except Exception as error:
+                    print(f"Error precomputing {symbol}: {error}")
+                    outcomes[symbol] = f"{type(error).__name__}: {error}"
+
+            self.last_run = datetime.now()
+        return outcomes
+
+    def _loop(self) -> None:
+        self.run_once()
+        while not self._stop.is_set():
+            now = datetime.now()
+            if self._stop.wait((self.next_run(now) - now).total_seconds()):
+                break
+            self.run_once(force=True)
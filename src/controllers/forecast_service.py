@@ -0,0 +1,343 @@
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Sequence
+from urllib.parse import parse_qs, urlparse
+
+from ..models.compact_arima import CompactARIMA
+from ..models.data_source import DataSource
+from ..models.lru_cache import LRUCache, sizeof
+from ..models.predictor import Predictor
+
+
+class ServiceBusy(Exception):
+    """ Raised when too many fits are already waiting for a worker """
+
+
+class SymbolNotFound(Exception):
+    """ Raised when the data source has no data for a symbol """
+
+
+class ServiceTimeout(Exception):
+    """ Raised when a task does not finish before the request timeout """
+
+
+class ForecastService:
+    """
+    Keeps a Predictor, its cache and the fitted models in memory and answers forecast requests.
+    Concurrent requests for the same symbol share one task, and the tasks run on a bounded pool of workers.
+    """
+    def __init__(self, predictor: Optional[Predictor] = None, data_source: Optional[DataSource] = None, max_workers: int = 4, max_pending: int = 64, timeout: Optional[float] = 300, low_memory: bool = True, model_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Args:
+            predictor(optional): The Predictor used by every request, default is a new one with the data_source.
+            data_source(optional): Where the data is downloaded from, default is Yahoo Finance.
+            max_workers(optional) default 4: Number of fits running at the same time.
+            max_pending(optional) default 64: Number of different tasks accepted before answering busy.
+            timeout(optional) default 300: Seconds a request waits for its task, None to wait forever.
+            low_memory(optional) default True: Keeps the models in memory as CompactARIMA, a few kilobytes each.
+            model_bytes(optional) default 64 MiB: Memory of the models kept, the least recently used are dropped first.
+        """
+
+        self.predictor = predictor if predictor is not None else Predictor(data_source=data_source)
+        self.metrics = self.predictor.metrics
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='forecast')
+        self._max_pending = max_pending
+        self._timeout = timeout
+        self._low_memory = low_memory
+        self._in_flight: Dict[tuple, Future] = {}
+        self._fitted = LRUCache(max_bytes=model_bytes, sizeof=self._model_size)  # symbol -> (last date, number of bars, model)
+        self._lock = threading.Lock()
+        self._profiling = threading.local()  # Set while a profiled request runs in the thread
+
+    def forecast(self, symbol: str, steps: int = 24, levels: Sequence[float] = (), profile: bool = False) -> dict:
+        """
+        Forecasts the next closing values of an action
+
+        Args:
+            symbol: The symbol of the action according to the data source
+            steps(optional) default 24: Number of periods forecasted
+            levels(optional): Coverage of the intervals to include, e.g. (0.80, 0.95)
+            profile(optional) default False: Profiles the request, see _profiled
+
+        Returns:
+            A dict with the symbol, the order, the last date of the data and the forecast by date,
+            and with levels the lower and upper bounds of each interval by date. A fresh forecast
+            precomputed for the watchlist is answered at once, with 'precomputed' and its 'age' in seconds.
+        """
+
+        return self._profiled(profile, lambda: self._forecast(symbol, steps, levels))
+
+    def _forecast(self, symbol: str, steps: int, levels: Sequence[float]) -> dict:
+        precomputed = self._precomputed(symbol, steps, levels)
+        if precomputed is not None:
+            self.predictor.watchlist.record_request(symbol)
+            return precomputed
+
+        data, model = self._wait(('model', symbol), lambda: self._load_model(symbol))
+        self.predictor.watchlist.record_request(symbol)  # Only the symbols that exist are counted
+        if not levels:
+            with self.metrics.span('forecast'):
+                forecast = model.forecast(steps=steps)
+            return self._record(symbol, data, model, 'forecast', forecast)
+
+        result = self.predictor.make_forecast_distribution(model, steps=steps, levels=levels, symbol=symbol)
+        record = self._record(symbol, data, model, 'forecast', result.point)
+        record['intervals'] = self._intervals(result, levels, steps)
+        return record
+
+    def prediction(self, symbol: str, profile: bool = False) -> dict:
+        """
+        Predicts every date of the data of an action in-sample, to evaluate the model
+
+        Args:
+            symbol: The symbol of the action according to the data source
+            profile(optional) default False: Profiles the request, see _profiled
+
+        Returns:
+            A dict with the symbol, the order, the last date of the data and the prediction by date.
+        """
+
+        def predict():
+            data, model = self._wait(('model', symbol), lambda: self._load_model(symbol))
+            prediction = self.predictor.make_performance_prediction(model=model, data=data)
+            return self._record(symbol, data, model, 'prediction', prediction)
+
+        return self._profiled(profile, predict)
+
+    def order(self, symbol: str, profile: bool = False) -> dict:
+        """
+        Looks up the ARIMA order of an action, searching it only if it is not in the cache
+
+        Args:
+            symbol: The symbol of the action according to the data source
+            profile(optional) default False: Profiles the request, see _profiled
+
+        Returns:
+            A dict with the symbol and the (p, d, q) order.
+        """
+
+        def order():
+            pdq_order = self._wait(('order', symbol), lambda: self._load_order(symbol))
+            return {'symbol': symbol, 'order': list(pdq_order)}
+
+        return self._profiled(profile, order)
+
+    def watchlist(self) -> dict:
+        """The watched symbols, the most requested first, with the staleness of their precomputed forecasts"""
+        store = self.predictor.precomputed
+        requests = self.predictor.watchlist.requests()
+        return {
+            'symbols': [
+                {'symbol': symbol, 'requests': requests.get(symbol, 0), 'precomputed': store.metadata(symbol)}
+                for symbol in self.predictor.watchlist.by_priority()
+            ],
+        }
+
+    def health(self) -> dict:
+        with self._lock:
+            in_flight = len(self._in_flight)
+        return {'status': 'ok', 'in_flight': in_flight, 'models': len(self._fitted)}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.predictor.watchlist.flush()
+
+    def submit(self, key: tuple, task: Callable[[], object]) -> Future:
+        """
+        Submits a task to the workers, unless a task with the same key is already running
+
+        Args:
+            key: Identifies the task, e.g. ('model', symbol)
+            task: The function run by the worker
+
+        Returns:
+            The Future of the task, shared by every caller with the same key.
+        """
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.metrics.incr('service_coalesced')
+                return future
+            if len(self._in_flight) >= self._max_pending:
+                raise ServiceBusy(f"{len(self._in_flight)} tasks are already pending")
+
+            future = self._executor.submit(self._run, key, task)
+            self._in_flight[key] = future
+        return future
+
+    def _run(self, key: tuple, task: Callable[[], object]):
+        try:
+            return task()
+        finally:  # Before the result is set, so a finished task is never reported as in flight
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _profiled(self, profile: bool, answer: Callable[[], dict]) -> dict:
+        """
+        Runs answer(), profiled with cProfile if profile is set. A profiled request runs its task in its own
+        thread instead of on the workers, so the profile covers it and no other request shares it.
+
+        Returns:
+            The answer, with the report of the profile in 'profile' if the request is profiled.
+        """
+
+        if not profile:
+            return answer()
+
+        self._profiling.active = True
+        try:
+            with self.metrics.profile() as report:
+                record = answer()
+        finally:
+            self._profiling.active = False
+        self.metrics.incr('service_profiled')
+        record['profile'] = report.text
+        return record
+
+    def _wait(self, key: tuple, task: Callable[[], object]):
+        if getattr(self._profiling, 'active', False):
+            return task()
+        try:
+            return self.submit(key, task).result(timeout=self._timeout)
+        except FutureTimeout:
+            self.metrics.incr('service_timeouts')
+            raise ServiceTimeout(f"No answer for {key[1]} after {self._timeout} seconds, the task goes on in the background")
+
+    def _precomputed(self, symbol: str, steps: int, levels: Sequence[float]) -> Optional[dict]:
+        """The answer from the precomputed store, if it is fresh and covers the steps and the levels"""
+        record = self.predictor.precomputed.load(symbol, fresh=True)
+        if record is None or len(record['forecast']) < steps:
+            return None
+        result = record['forecast_result']
+        if levels and (result is None or any(float(level) not in result.levels for level in levels)):
+            return None
+
+        self.metrics.incr('service_precomputed_hits')
+        answer = {
+            'symbol': symbol,
+            'order': list(record['order']),
+            'last_date': record['last_date'].isoformat(),
+            'forecast': self._by_date(record['forecast'].iloc[:steps]),
+            'precomputed': True,
+            'age': record['age'],
+        }
+        if levels:
+            answer['intervals'] = self._intervals(result, levels, steps)
+        return answer
+
+    def _intervals(self, result, levels: Sequence[float], steps: int) -> dict:
+        return {
+            f'{float(level):g}': {bound: self._by_date(result.interval(float(level))[bound].iloc[:steps]) for bound in ('lower', 'upper')}
+            for level in levels
+        }
+
+    def _load_data(self, symbol: str):
+        data = self.predictor.load_closing_data(symbol)
+        if data is None:
+            raise SymbolNotFound(f"No data found for symbol: {symbol}")
+        return data
+
+    def _load_order(self, symbol: str) -> tuple[int, int, int]:
+        """Runs on a worker"""
+        data = self._load_data(symbol)
+        return self.predictor.autofit_ARIMA(data, symbol=symbol, trace=False)
+
+    def _load_model(self, symbol: str):
+        """Runs on a worker: the model in memory is reused while the data has no new bars"""
+        data = self._load_data(symbol)
+        fitted = self._fitted.get(symbol)
+        if fitted is not None and fitted[0] == data.index[-1] and fitted[1] == len(data):
+            self.metrics.incr('service_model_hits')
+            return data, fitted[2]
+
+        model = self.predictor.update_ARIMA_model(data, symbol=symbol, low_memory=self._low_memory)
+        self._fitted.set(symbol, (data.index[-1], len(data), model))
+        return data, model
+
+    @staticmethod
+    def _model_size(fitted: tuple) -> int:
+        model = fitted[2]
+        return model.nbytes if isinstance(model, CompactARIMA) else sizeof(model)
+
+    def _record(self, symbol: str, data, model, name: str, values) -> dict:
+        return {
+            'symbol': symbol,
+            'order': list(model.order if isinstance(model, CompactARIMA) else model.model.order),
+            'last_date': data.index[-1].isoformat(),
+            name: self._by_date(values),
+        }
+
+    @staticmethod
+    def _by_date(values) -> dict:
+        return {date.isoformat(): float(value) for date, value in values.items()}
+
+
+def create_forecast_server(service: ForecastService, host: str = '127.0.0.1', port: int = 8000, max_steps: int = 1000) -> ThreadingHTTPServer:
+    """
+    Creates the HTTP server of a ForecastService, with the JSON endpoints:
+        GET /forecast?symbol=X&steps=N[&levels=0.8,0.95], GET /prediction?symbol=X, GET /order?symbol=X, GET /watchlist, GET /health
+    and the metrics in the Prometheus format on GET /metrics. Add &profile=1 to /forecast, /prediction or /order
+    to receive the cProfile report of the request in 'profile'.
+
+    Returns:
+        The server; call serve_forever() to run it and shutdown() to stop it.
+    """
+
+    class ForecastHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+            try:
+                if url.path == '/health':
+                    self._send_json(200, service.health())
+                elif url.path == '/watchlist':
+                    self._send_json(200, service.watchlist())
+                elif url.path == '/metrics':
+                    self._send(200, service.metrics.to_prometheus().encode(), 'text/plain; version=0.0.4')
+                elif url.path in ('/forecast', '/prediction', '/order'):
+                    symbol = query.get('symbol', '').strip()
+                    if not symbol:
+                        raise ValueError("The 'symbol' parameter is required")
+                    profile = query.get('profile', '0') not in ('', '0', 'false')
+                    if url.path == '/forecast':
+                        steps = int(query.get('steps', 24))
+                        if not 0 < steps <= max_steps:
+                            raise ValueError(f"'steps' must be between 1 and {max_steps}")
+                        levels = [float(level) for level in query.get('levels', '').split(',') if level.strip()]
+                        self._send_json(200, service.forecast(symbol, steps=steps, levels=levels, profile=profile))
+                    elif url.path == '/prediction':
+                        self._send_json(200, service.prediction(symbol, profile=profile))
+                    else:
+                        self._send_json(200, service.order(symbol, profile=profile))
+                else:
+                    self._send_json(404, {'error': f"Unknown path: {url.path}"})
+
+            except ValueError as error:
+                self._send_json(400, {'error': str(error)})
+            except SymbolNotFound as error:
+                self._send_json(404, {'error': str(error)})
+            except ServiceBusy as error:
+                self._send_json(503, {'error': str(error)})
+            except ServiceTimeout as error:
+                self._send_json(504, {'error': str(error)})
+            except Exception as error:
+                self._send_json(500, {'error': f"{type(error).__name__}: {error}"})
+
+        def _send_json(self, status: int, content: dict) -> None:
+            self._send(status, json.dumps(content).encode(), 'application/json')
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return ThreadingHTTPServer((host, port), ForecastHandler)
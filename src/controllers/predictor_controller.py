@@ -1,55 +1,130 @@
+import re
+import threading
+
+from ..models.prediction_request import PredictionRequest
 from ..models.predictor import Predictor
+from ..models.warmup import prewarm
 from ..views.data_chart import DataChart
 from ..views.window import Window
+from .forecast_scheduler import ForecastScheduler
+from .task_runner import CANCELLED, DONE, ERROR, PROGRESS, TaskRunner
+
+STAGE_LABELS = {
+    'download': 'baixando dados',
+    'order': 'selecionando o modelo',
+    'fit': 'ajustando o modelo',
+    'forecast': 'calculando a previsão',
+    'prediction': 'avaliando o modelo',
+}
 
 class PredictorController:
     def __init__(self) -> None:
         self.main_window = Window(title='ARIMA Stock Predictor', geometry='500x400')
         self.predictor = Predictor()
-        self.data_chart = DataChart()
+        self.task_runner = TaskRunner(max_workers=4)
+        self.scheduler = ForecastScheduler(self.predictor, self.predictor.watchlist, self.predictor.precomputed)
+        self.poll_interval = 100  # Milliseconds between the checks of the background tasks
+        self.prewarm_delay = 500  # Milliseconds before importing the heavy libraries in the background
+        self._status = {}
 
     def create_main_window(self) -> Window:
-        # Creating widgets 
+        # Creating widgets
         self.main_window.create_label('Previsão de Preços de Ações', ('Arial', 20, 'bold'))
-        self.main_window.create_label('Digite o símbolo da ação:')
+        self.main_window.create_label('Digite o símbolo da ação (ou vários, separados por vírgula):')
         self.main_window.create_entry()
         self.main_window.create_button('Prever e Mostrar Gráfico', self._on_button_click)
+        self.main_window.create_button('Acompanhar (prever em segundo plano)', self._on_watch_click, bg='#2196F3', activebackground='#2196F3')
+        self.main_window.create_button('Cancelar', self._on_cancel_click, bg='#9E9E9E', activebackground='#9E9E9E')
+        self.status_label = self.main_window.create_label('', ('Arial', 10))
+        self.main_window.after(self.poll_interval, self._poll_tasks)
+        self.main_window.after(self.prewarm_delay, prewarm)  # After the window is drawn
+        self.main_window.after(self.prewarm_delay, self.scheduler.start)
         return self.main_window
 
+    def _entry_symbols(self) -> list:
+        return [symbol for symbol in re.split(r'[\s,;]+', self.main_window.get_entry_data()) if symbol]
+
     def _on_button_click(self) -> None:
-        symbol = self.main_window.get_entry_data()
-        if symbol:
-            close_prices = self.predictor.download_stock_closing_data(symbol=symbol)
-            forecast_prices = self.predictor.automake_forecast(data=close_prices)
-            model = self.predictor.get_arima_model()
-            performance_predicit = self.predictor.make_performance_prediction(data=close_prices, model=model)
-
-            forecast_dates = self.data_chart.generate_dates(close_prices.index[-1], len(forecast_prices))
-
-            self.data_chart.create_plot(
-                dates=close_prices.index, 
-                data=close_prices, 
-                label='Valores Reais',
-                color='#4CAF50',
-            )
-            self.data_chart.create_plot(
-                dates=performance_predicit.index, 
-                data=performance_predicit, 
-                label='Performance do Modelo',
-                color='#2196F3',
-                line_style='--'
-
-            )
-            self.data_chart.create_plot(
-                dates=forecast_dates, 
-                data=forecast_prices, 
-                label='Previsão',
-                color='#FF5722',
-                line_style='--'
-            )
-
-            self.data_chart.show(symbol)
+        symbols = self._entry_symbols()
+        if symbols:
+            for symbol in symbols:
+                if self.task_runner.submit(symbol, lambda report, symbol=symbol: self._run_pipeline(symbol, report)):
+                    self._status[symbol] = 'na fila'
+            self._show_status()
 
         else:
             self.main_window.warning("Aviso", "Por favor, insira um símbolo de ação!")
 
+    def _on_watch_click(self) -> None:
+        """Adds the symbols to the watchlist, whose forecasts are computed in the background after the market closes"""
+        symbols = self._entry_symbols()
+        if not symbols:
+            self.main_window.warning("Aviso", "Por favor, insira um símbolo de ação!")
+            return
+
+        for symbol in symbols:
+            self.predictor.watchlist.add(symbol)
+        threading.Thread(target=self.scheduler.run_once, daemon=True).start()  # The new symbols are stale
+        self.status_label.config(text=f"Acompanhando: {', '.join(self.predictor.watchlist.symbols())}")
+
+    def _on_cancel_click(self) -> None:
+        self.task_runner.cancel_all()
+
+    def _run_pipeline(self, symbol: str, report) -> dict:
+        """
+        Runs on a background thread; each symbol has its own PredictionRequest so concurrent symbols do not mix.
+        A fresh forecast precomputed for the watchlist is shown without computing it again.
+        """
+        record = self.predictor.precomputed.load(symbol, fresh=True)
+        if record is not None:
+            self.predictor.watchlist.record_request(symbol)
+            return {
+                'close_prices': record['close_prices'],
+                'forecast_prices': record['forecast'],
+                'performance_predicit': record['performance_prediction'],
+            }
+
+        request = PredictionRequest(symbol, trace=True)
+        try:
+            self.predictor.predict(request, report=report)
+        except ValueError:
+            if request.data is None:
+                raise ValueError(f'Nenhum dado encontrado para {symbol}')
+            raise
+        self.predictor.watchlist.record_request(symbol)  # Only the symbols that exist are counted
+        if symbol in self.predictor.watchlist:
+            self.predictor.precomputed.save(request)
+
+        return {
+            'close_prices': request.data,
+            'forecast_prices': request.forecast,
+            'performance_predicit': request.performance_prediction,
+        }
+
+    def _poll_tasks(self) -> None:
+        """Runs on the Tk main loop: updates the status and draws the finished charts"""
+        for event, symbol, value in self.task_runner.poll():
+            if event == PROGRESS:
+                self._status[symbol] = STAGE_LABELS.get(value, value)
+            elif event == DONE:
+                self._status.pop(symbol, None)
+                self._show_chart(symbol, **value)
+            elif event == ERROR:
+                self._status.pop(symbol, None)
+                self.main_window.warning("Erro", f"Falha ao prever {symbol}: {value}")
+            elif event == CANCELLED:
+                self._status.pop(symbol, None)
+        self._show_status()
+        self.main_window.after(self.poll_interval, self._poll_tasks)
+
+    def _show_status(self) -> None:
+        self.status_label.config(text='\n'.join(f'{symbol}: {stage}' for symbol, stage in self._status.items()))
+
+    def _show_chart(self, symbol: str, close_prices, forecast_prices, performance_predicit) -> None:
+        data_chart = DataChart()
+        data_chart.plot_prediction(
+            close_prices=close_prices,
+            forecast_prices=forecast_prices,
+            performance_prediction=performance_predicit,
+        )
+        data_chart.show(symbol)
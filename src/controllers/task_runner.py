@@ -0,0 +1,92 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+PROGRESS = 'progress'
+DONE = 'done'
+ERROR = 'error'
+CANCELLED = 'cancelled'
+
+
+class TaskCancelled(Exception):
+    """ Raised inside a task when it was cancelled """
+
+
+class TaskRunner:
+    """
+    Runs the tasks of the GUI on background threads.
+    The tasks never touch the widgets: they put events in a queue that the Tk main loop drains with poll().
+    """
+    def __init__(self, max_workers: int = 4) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._events: queue.Queue = queue.Queue()
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, task: Callable[[Callable[[str], None]], Any]) -> bool:
+        """
+        Submits a task, unless a task with the same key is already running
+
+        Args:
+            key: Identifies the task, e.g. the symbol
+            task: Called with a report(stage) function; report puts a progress event and
+                raises TaskCancelled if the task was cancelled
+
+        Returns:
+            True if the task was submitted.
+        """
+
+        with self._lock:
+            if key in self._cancel_events:
+                return False
+            cancel_event = threading.Event()
+            self._cancel_events[key] = cancel_event
+
+        def report(stage: str) -> None:
+            if cancel_event.is_set():
+                raise TaskCancelled()
+            self._events.put((PROGRESS, key, stage))
+
+        def run() -> None:
+            try:
+                result = task(report)
+                self._events.put((CANCELLED, key, None) if cancel_event.is_set() else (DONE, key, result))
+            except TaskCancelled:
+                self._events.put((CANCELLED, key, None))
+            except Exception as error:
+                self._events.put((ERROR, key, error))
+            finally:
+                with self._lock:
+                    del self._cancel_events[key]
+
+        self._executor.submit(run)
+        return True
+
+    def cancel(self, key: str) -> None:
+        """Cancels a task; it stops at its next report"""
+        with self._lock:
+            if key in self._cancel_events:
+                self._cancel_events[key].set()
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            for cancel_event in self._cancel_events.values():
+                cancel_event.set()
+
+    def running(self) -> List[str]:
+        with self._lock:
+            return list(self._cancel_events)
+
+    def poll(self) -> List[Tuple[str, str, Any]]:
+        """Returns the events put since the last poll, without blocking"""
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
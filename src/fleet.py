@@ -0,0 +1,46 @@
+import argparse
+
+from src.models.data_source import CSVDataSource
+from src.models.fleet import FleetForecaster
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Forecasts many stock symbols at once, without the GUI.')
+    parser.add_argument('symbols', nargs='*', help='Symbols of the actions')
+    parser.add_argument('--symbols-file', help='File with one symbol per line')
+    parser.add_argument('--output', default='forecasts.jsonl', help='JSON Lines file with the results')
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes, default is the number of cores')
+    parser.add_argument('--steps', type=int, default=24, help='Number of periods forecasted')
+    parser.add_argument('--order', help='Fixed ARIMA order for every symbol, e.g. 1,1,1')
+    parser.add_argument('--batch', action='store_true', help='Estimates the symbols together, needs --order')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Number of symbols estimated together with --batch')
+    parser.add_argument('--csv-dir', help='Reads the data from a directory of {symbol}.csv files instead of Yahoo Finance')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += [line.strip() for line in f if line.strip()]
+    if not symbols:
+        raise SystemExit('No symbols given')
+
+    order = tuple(int(value) for value in args.order.split(',')) if args.order else None
+    data_source = CSVDataSource(args.csv_dir) if args.csv_dir else None
+
+    if args.batch and order is None:
+        raise SystemExit('--batch needs --order')
+
+    fleet = FleetForecaster(data_source=data_source, max_workers=args.workers, steps=args.steps, order=order)
+    if args.batch:
+        report = fleet.run_batch(symbols, output_path=args.output, chunk_size=args.chunk_size)
+    else:
+        report = fleet.run(symbols, output_path=args.output)
+    print(report.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import warnings
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .state_space import project, system_matrices
+
+
+def _run_block(values: np.ndarray, pdq_order: tuple[int, int, int], origins: np.ndarray, horizon: int, window_size: Optional[int]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Estimates the parameters once with the data up to the first origin of the block, filters the
+    series with them and projects the state of every origin. Runs in a worker process.
+    """
+
+    from statsmodels.tsa.arima.model import ARIMA
+
+    fit_end = origins[0] + 1
+    fit_start = 0 if window_size is None else fit_end - window_size
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        params = ARIMA(values[fit_start:fit_end], order=pdq_order).fit().params
+        filter_results = ARIMA(values[fit_start:origins[-1] + 1], order=pdq_order).filter(params).filter_results
+
+    positions = origins - fit_start + 1  # Column of the state predicted for the bar after each origin
+    states = filter_results.predicted_state[:, positions].T
+    covs = np.moveaxis(filter_results.predicted_state_cov[:, :, positions], -1, 0)
+    return project(system_matrices(filter_results), states, covs, horizon)
+
+
+class BacktestResult:
+    """ Out-of-sample forecasts and errors of every origin of a backtest, as arrays """
+    def __init__(self, origins: pd.DatetimeIndex, forecasts: np.ndarray, actuals: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> None:
+        self.origins = origins
+        self.forecasts = forecasts  # (n_origins, horizon)
+        self.actuals = actuals
+        self.lower = lower
+        self.upper = upper
+
+        errors = forecasts - actuals
+        self.mae = np.abs(errors).mean(axis=1)
+        self.rmse = np.sqrt((errors ** 2).mean(axis=1))
+        self.mape = np.abs(errors / actuals).mean(axis=1) * 100
+        self.coverage = ((actuals >= lower) & (actuals <= upper)).mean(axis=1)
+
+    def summary(self) -> dict:
+        """The mean of each error metric over all origins"""
+        return {
+            'origins': len(self.origins),
+            'mae': float(self.mae.mean()),
+            'rmse': float(self.rmse.mean()),
+            'mape': float(self.mape.mean()),
+            'coverage': float(self.coverage.mean()),
+        }
+
+
+class Backtester:
+    """
+    A class to evaluate the out-of-sample accuracy of an ARIMA order with walk-forward forecasts.
+    The parameters are estimated only every refit_every origins; between estimations the forecasts of all
+    origins come from one Kalman filter pass, projected forward together with NumPy.
+    """
+    def __init__(self, pdq_order: tuple[int, int, int], horizon: int = 5, window: str = 'expanding', window_size: Optional[int] = None, refit_every: Optional[int] = None, alpha: float = 0.05, max_workers: Optional[int] = None) -> None:
+        """
+        Args:
+            pdq_order: The (p, d, q) order of the model
+            horizon(optional) default 5: Number of steps forecasted from each origin
+            window(optional) default 'expanding': 'expanding' estimates with all the data up to the origin,
+                'rolling' only with the last window_size observations
+            window_size(optional): Size of the rolling window
+            refit_every(optional): Number of origins between estimations, None to estimate once at the first origin
+            alpha(optional) default 0.05: The intervals cover 1 - alpha
+            max_workers(optional): Number of processes for the estimations, 1 runs them in this process
+        """
+
+        if window not in ('expanding', 'rolling'):
+            raise ValueError(f"Unknown window: {window}")
+        if window == 'rolling' and not window_size:
+            raise ValueError("A rolling window needs a window_size")
+
+        self._pdq_order = tuple(pdq_order)
+        self._horizon = horizon
+        self._window_size = window_size if window == 'rolling' else None
+        self._refit_every = refit_every
+        self._z = NormalDist().inv_cdf(1 - alpha / 2)
+        self._max_workers = max_workers
+
+    def run(self, data: pd.Series, n_origins: int = 100, step: int = 1) -> BacktestResult:
+        """
+        Forecasts from the last n_origins cut-off dates of the data
+
+        Args:
+            data: A normalized Pandas Series with date index and closing values.
+            n_origins(optional) default 100: Number of cut-off dates
+            step(optional) default 1: Number of bars between two cut-off dates
+
+        Returns:
+            A BacktestResult with the forecasts and error metrics of each origin.
+        """
+
+        values = data.to_numpy(dtype=np.float64)
+        last_origin = len(values) - self._horizon - 1
+        origins = np.arange(last_origin - (n_origins - 1) * step, last_origin + 1, step)
+        min_train = self._window_size or 2 * sum(self._pdq_order) + 10
+        if origins[0] + 1 < min_train:
+            raise ValueError(f"Not enough data for {n_origins} origins")
+
+        blocks = self._blocks(origins)
+        args = [(values, self._pdq_order, block, self._horizon, self._window_size) for block in blocks]
+        if len(blocks) > 1 and self._max_workers != 1:
+            with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+                results = list(executor.map(_run_block, *zip(*args)))
+        else:
+            results = [_run_block(*arg) for arg in args]
+
+        forecasts = np.concatenate([means for means, _ in results])
+        deviations = np.sqrt(np.concatenate([variances for _, variances in results]))
+        actuals = np.lib.stride_tricks.sliding_window_view(values[1:], self._horizon)[origins]
+
+        return BacktestResult(
+            origins=pd.DatetimeIndex(data.index[origins]),
+            forecasts=forecasts,
+            actuals=actuals,
+            lower=forecasts - self._z * deviations,
+            upper=forecasts + self._z * deviations,
+        )
+
+    def _blocks(self, origins: np.ndarray) -> List[np.ndarray]:
+        if self._refit_every is None:
+            return [origins]
+        return [origins[i:i + self._refit_every] for i in range(0, len(origins), self._refit_every)]
@@ -0,0 +1,366 @@
+import warnings
+from math import comb
+from statistics import NormalDist
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .price_panel import PricePanel
+
+
+def _ols(X: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Least squares of many series at once: X (n, k, r) and y (n, k), returns (k, r)"""
+    X = X.transpose(1, 2, 0)  # (k, r, n), so the products run on batched BLAS calls
+    XtX = X @ X.transpose(0, 2, 1)
+    Xty = X @ y.T[:, :, None]
+    return (np.linalg.pinv(XtX) @ Xty)[:, :, 0]
+
+
+def _lags(W: np.ndarray, p: int, start: int) -> np.ndarray:
+    """(T - start, k, p) array with w_{t-1}, ..., w_{t-p} of every t >= start"""
+    T = len(W)
+    if not p:
+        return np.empty((T - start, W.shape[1], 0))
+    windows = np.lib.stride_tricks.sliding_window_view(W, p, axis=0)  # windows[i] holds w_i, ..., w_{i+p-1}
+    return windows[start - p:T - p, :, ::-1]
+
+
+def _inside_unit_circle(coefficients: np.ndarray) -> np.ndarray:
+    """True for each row whose companion matrix has every eigenvalue inside the unit circle"""
+    k, m = coefficients.shape
+    if m == 0:
+        return np.ones(k, dtype=bool)
+    companion = np.zeros((k, m, m))
+    companion[:, 0, :] = coefficients
+    companion[:, np.arange(1, m), np.arange(m - 1)] = 1
+    return np.all(np.abs(np.linalg.eigvals(companion)) < 1 - 1e-8, axis=1)
+
+
+class BatchARIMA:
+    """
+    A class to estimate one fixed ARIMA order on many aligned series at once.
+    The series are stacked in a NumPy array and estimated together by conditional sum of squares:
+    Hannan-Rissanen regressions give the start and vectorized Gauss-Newton steps refine it,
+    so every Python-level step is shared by all the series of a block.
+    Series that cannot be stacked or whose estimate is not stationary and invertible are fitted
+    one by one with statsmodels.
+    """
+    def __init__(self, pdq_order: tuple[int, int, int], block_size: int = 500, max_iter: int = 20, tol: float = 1e-7) -> None:
+        """
+        Args:
+            pdq_order: The (p, d, q) order of every model
+            block_size(optional) default 500: Number of series estimated together, bounds the memory
+            max_iter(optional) default 20: Maximum number of Gauss-Newton steps
+            tol(optional) default 1e-7: Relative decrease of the sum of squares that stops the steps
+        """
+
+        self._pdq_order = tuple(pdq_order)
+        self._block_size = block_size
+        self._max_iter = max_iter
+        self._tol = tol
+
+    def fit(self, data: Union[pd.DataFrame, PricePanel]) -> 'BatchARIMAResults':
+        """
+        Estimates the model of every column
+
+        Args:
+            data: A Pandas DataFrame with date index and one column of closing values per symbol,
+                e.g. Predictor.download_many(symbols, as_frame=True), or a PricePanel, whose gaps
+                inside the span of a symbol are forward filled
+
+        Returns:
+            A BatchARIMAResults with the parameters of every symbol, ready to forecast.
+        """
+
+        if isinstance(data, PricePanel):
+            data = data.to_frame(fill=True)
+
+        p, d, q = self._pdq_order
+        results = BatchARIMAResults(self._pdq_order, self._frequency(data.index))
+        spans: Dict[tuple, List[str]] = {}
+
+        for symbol in data.columns:
+            column = data[symbol]
+            first, last = column.first_valid_index(), column.last_valid_index()
+            if first is None:
+                continue
+            if column.loc[first:last].isna().any():  # Gaps inside the series: it is not aligned with any other
+                results._fit_fallback(symbol, column.dropna())
+            else:
+                spans.setdefault((first, last), []).append(symbol)
+
+        min_length = d + max(p, q) + 2 * (p + q + 1) + 10 + self._long_ar_order(len(data))
+        for (first, last), symbols in spans.items():
+            values = data.loc[first:last]
+            if len(values) < min_length:
+                for symbol in symbols:
+                    results._fit_fallback(symbol, values[symbol])
+                continue
+
+            for i in range(0, len(symbols), self._block_size):
+                block = symbols[i:i + self._block_size]
+                self._fit_block(results, values[block], last)
+
+        return results
+
+    def _frequency(self, index: pd.DatetimeIndex) -> str:
+        if index.freq is not None:
+            return index.freqstr
+        return (pd.infer_freq(index) if len(index) > 2 else None) or 'B'
+
+    def _long_ar_order(self, n: int) -> int:
+        p, _, q = self._pdq_order
+        return max(int(np.log(n) ** 2), 2 * max(p, q)) if q else 0
+
+    def _fit_block(self, results: 'BatchARIMAResults', block: pd.DataFrame, last_date: pd.Timestamp) -> None:
+        p, d, q = self._pdq_order
+        levels = [block.to_numpy(dtype=np.float64)]
+        for _ in range(d):
+            levels.append(np.diff(levels[-1], axis=0))
+        W = levels[-1]
+        has_const = d == 0
+
+        const, ar, ma = self._hannan_rissanen(W, has_const)
+        if q:
+            const, ar, ma = self._gauss_newton(W, const, ar, ma, has_const)
+        residuals, _ = self._residuals(W, const, ar, ma)
+        sigma2 = np.mean(residuals ** 2, axis=0)
+
+        valid = _inside_unit_circle(ar) & _inside_unit_circle(-ma) & np.all(np.isfinite(ar), axis=1) & np.all(np.isfinite(ma), axis=1)
+        symbols = np.asarray(block.columns)
+        for symbol in symbols[~valid]:
+            results._fit_fallback(symbol, block[symbol])
+
+        results._add_block(
+            symbols=list(symbols[valid]),
+            last_date=last_date,
+            const=const[valid],
+            ar=ar[valid],
+            ma=ma[valid],
+            sigma2=sigma2[valid],
+            w_tail=W[len(W) - p:, valid].T if p else np.empty((valid.sum(), 0)),
+            e_tail=residuals[len(residuals) - q:, valid].T if q else np.empty((valid.sum(), 0)),
+            level_tails=np.array([level[-1, valid] for level in levels[:d]]).T.reshape(valid.sum(), d),
+        )
+
+    def _hannan_rissanen(self, W: np.ndarray, has_const: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """First estimate: a long autoregression gives the innovations, then one regression on their lags"""
+        p, _, q = self._pdq_order
+        T, k = W.shape
+        ones = np.ones((T, k, int(has_const)))
+
+        if not q:
+            X = np.concatenate([ones[p:], _lags(W, p, p)], axis=2)
+            coefficients = _ols(X, W[p:])
+            return self._split(coefficients, has_const)
+
+        m = self._long_ar_order(T)
+        X = np.concatenate([ones[m:], _lags(W, m, m)], axis=2)
+        innovations = np.zeros_like(W)
+        innovations[m:] = W[m:] - np.einsum('nkr,kr->nk', X, _ols(X, W[m:]))
+
+        start = m + max(p, q)
+        X = np.concatenate([ones[start:], _lags(W, p, start), _lags(innovations, q, start)], axis=2)
+        return self._split(_ols(X, W[start:]), has_const)
+
+    def _split(self, coefficients: np.ndarray, has_const: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        p, _, _ = self._pdq_order
+        c = int(has_const)
+        const = coefficients[:, 0] if has_const else np.zeros(len(coefficients))
+        return const, coefficients[:, c:c + p], coefficients[:, c + p:]
+
+    def _residuals(self, W: np.ndarray, const: np.ndarray, ar: np.ndarray, ma: np.ndarray, derivatives: bool = False) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Conditional residuals e_t = w_t - c - sum(ar_i w_{t-i}) - sum(ma_j e_{t-j}) of every series, from t = p,
+        and optionally their derivatives with respect to (c, ar, ma)
+        """
+
+        p, d, q = self._pdq_order
+        k = W.shape[1]
+        lags = _lags(W, p, p)
+        base = W[p:] - const - np.einsum('nki,ki->nk', lags, ar)
+        if not derivatives:
+            return (_ma_filter(base[:, :, None], ma)[:, :, 0] if q else base), None
+
+        # The derivatives are the regressors filtered by 1 / (1 + ma(B)), like the residuals
+        regressors = np.concatenate([base[:, :, None], -np.ones((len(base), k, int(d == 0))), -lags], axis=2)
+        filtered = _ma_filter(regressors, ma) if q else regressors
+        residuals = filtered[:, :, 0]
+        if not q:
+            return residuals, filtered[:, :, 1:]
+
+        filtered_residuals = _ma_filter(residuals[:, :, None], ma)[:, :, 0]
+        ma_gradient = np.zeros((len(base), k, q))
+        for j in range(1, q + 1):
+            ma_gradient[j:, :, j - 1] = -filtered_residuals[:-j]
+        return residuals, np.concatenate([filtered[:, :, 1:], ma_gradient], axis=2)
+
+    def _gauss_newton(self, W: np.ndarray, const: np.ndarray, ar: np.ndarray, ma: np.ndarray, has_const: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Minimizes the conditional sum of squares of every series, halving the steps that do not decrease it.
+        A series leaves the iterations as soon as it converges, so the slow ones do not keep the others busy.
+        """
+
+        params = np.concatenate([const[:, None]] * int(has_const) + [ar, ma], axis=1)
+        active = np.arange(len(params))
+
+        def ssr_of(columns, candidate):
+            return np.sum(self._residuals(W[:, columns], *self._split(candidate, has_const))[0] ** 2, axis=0)
+
+        for _ in range(self._max_iter):
+            if not len(active):
+                break
+            current = params[active]
+            residuals, gradient = self._residuals(W[:, active], *self._split(current, has_const), derivatives=True)
+            ssr = np.sum(residuals ** 2, axis=0)
+            step = -_ols(gradient, residuals)
+
+            new_ssr = ssr.copy()
+            pending = np.arange(len(active))
+            scale = 1.0
+            for _ in range(10):
+                candidate = current[pending] + scale * step[pending]
+                candidate_ssr = ssr_of(active[pending], candidate)
+                improved = (candidate_ssr <= ssr[pending]) & _inside_unit_circle(-self._split(candidate, has_const)[2])
+                params[active[pending[improved]]] = candidate[improved]
+                new_ssr[pending[improved]] = candidate_ssr[improved]
+                pending = pending[~improved]
+                if not len(pending):
+                    break
+                scale /= 2
+
+            decrease = (ssr - new_ssr) / np.maximum(ssr, 1e-300)
+            active = active[decrease >= self._tol]
+
+        return self._split(params, has_const)
+
+
+def _ma_filter(values: np.ndarray, ma: np.ndarray) -> np.ndarray:
+    """Filters (n, k, r) values by 1 / (1 + ma(B)) of each series: f_t = x_t - sum(ma_j f_{t-j}), with zeros before the start"""
+    n = len(values)
+    q = ma.shape[1]
+    coefficients = ma.T[::-1, :, None]  # (q, k, 1), ma_q first to match f_{t-q}, ..., f_{t-1}
+    filtered = np.zeros((n + q,) + values.shape[1:])
+    for t in range(n):
+        filtered[t + q] = values[t] - (coefficients * filtered[t:t + q]).sum(axis=0)
+    return filtered[q:]
+
+
+class BatchARIMAResults:
+    """ The estimates of a BatchARIMA: the parameters of every symbol and what their forecasts need """
+    def __init__(self, pdq_order: tuple[int, int, int], freq: str) -> None:
+        p, d, q = pdq_order
+        self.order = pdq_order
+        self.fallback: Dict[str, object] = {}  # symbol -> statsmodels results of the series fitted one by one
+        self._freq = freq
+        self._param_names = ['const'] * (d == 0) + [f'ar.L{i}' for i in range(1, p + 1)] + [f'ma.L{j}' for j in range(1, q + 1)] + ['sigma2']
+        self._blocks: List[dict] = []  # The symbols and last date of each block with its parameter and state arrays
+
+    @property
+    def symbols(self) -> List[str]:
+        return [symbol for block in self._blocks for symbol in block['symbols']] + list(self.fallback)
+
+    @property
+    def params(self) -> pd.DataFrame:
+        """The parameters of every symbol, named as in statsmodels (the constant is the mean of the series)"""
+        p, d, _ = self.order
+        rows = []
+        for block in self._blocks:
+            mean = block['const'] / (1 - block['ar'].sum(axis=1))
+            rows.append(np.column_stack([mean] * (d == 0) + [block['ar'], block['ma'], block['sigma2']]))
+        params = pd.DataFrame(
+            np.concatenate(rows) if rows else np.empty((0, len(self._param_names))),
+            index=[symbol for block in self._blocks for symbol in block['symbols']],
+            columns=self._param_names,
+        )
+
+        for symbol, model in self.fallback.items():
+            params.loc[symbol] = model.params.reindex(self._param_names).to_numpy()
+        return params
+
+    def forecast(self, steps: int) -> pd.DataFrame:
+        """
+        Args:
+            steps: Number of periods forecasted
+
+        Returns:
+            A Pandas DataFrame with the forecasted dates as index and one column per symbol.
+        """
+
+        return self.forecast_intervals(steps)[0]
+
+    def forecast_intervals(self, steps: int, alpha: float = 0.05) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Args:
+            steps: Number of periods forecasted
+            alpha(optional) default 0.05: The intervals cover 1 - alpha
+
+        Returns:
+            Three Pandas DataFrames with the forecasted dates as index and one column per symbol:
+            the forecasts and the lower and upper bounds of their intervals.
+        """
+
+        z = NormalDist().inv_cdf(1 - alpha / 2)
+        frames = ([], [], [])
+
+        for block in self._blocks:
+            mean, variance = self._forecast_arrays(block, steps)
+            dates = pd.date_range(block['last_date'], periods=steps + 1, freq=self._freq)[1:]
+            deviation = z * np.sqrt(variance)
+            for frame, values in zip(frames, (mean, mean - deviation, mean + deviation)):
+                frame.append(pd.DataFrame(values.T, index=dates, columns=block['symbols']))
+
+        for symbol, model in self.fallback.items():
+            forecast = model.get_forecast(steps=steps)
+            mean = forecast.predicted_mean
+            deviation = z * np.sqrt(forecast.var_pred_mean)
+            for frame, values in zip(frames, (mean, mean - deviation, mean + deviation)):
+                frame.append(values.rename(symbol).to_frame())
+
+        return tuple(pd.concat(frame, axis=1) if frame else pd.DataFrame() for frame in frames)
+
+    def _forecast_arrays(self, block: dict, steps: int) -> tuple[np.ndarray, np.ndarray]:
+        """Forecasts of the differenced series, integrated back to prices, and their variances"""
+        p, d, q = self.order
+        k = len(block['const'])
+
+        w = np.concatenate([block['w_tail'], np.zeros((k, steps))], axis=1)
+        e = np.concatenate([block['e_tail'], np.zeros((k, steps))], axis=1)
+        for h in range(steps):
+            w[:, p + h] = block['const'] \
+                + np.einsum('ki,ki->k', block['ar'], w[:, h:p + h][:, ::-1]) \
+                + np.einsum('kj,kj->k', block['ma'], e[:, h:q + h][:, ::-1])
+        forecast = w[:, p:]
+        for level in range(d - 1, -1, -1):
+            forecast = block['level_tails'][:, level:level + 1] + np.cumsum(forecast, axis=1)
+
+        # Psi weights of the integrated model: (1 - B)^d multiplies the autoregressive polynomial
+        polynomial = np.zeros((k, p + d + 1))
+        ar_polynomial = np.concatenate([np.ones((k, 1)), -block['ar']], axis=1)
+        for j in range(d + 1):
+            polynomial[:, j:j + p + 1] += (-1) ** j * comb(d, j) * ar_polynomial
+        phi = -polynomial[:, 1:]
+        psi = np.zeros((k, steps))
+        psi[:, 0] = 1
+        for h in range(1, steps):
+            psi[:, h] = (block['ma'][:, h - 1] if h <= q else 0) + np.einsum('ki,ki->k', phi[:, :min(h, p + d)], psi[:, h - 1::-1][:, :min(h, p + d)])
+        variance = block['sigma2'][:, None] * np.cumsum(psi ** 2, axis=1)
+        return forecast, variance
+
+    def _add_block(self, symbols: List[str], last_date: pd.Timestamp, **arrays) -> None:
+        if symbols:
+            self._blocks.append({'symbols': symbols, 'last_date': last_date, **arrays})
+
+    def _fit_fallback(self, symbol: str, series: pd.Series) -> None:
+        from statsmodels.tsa.arima.model import ARIMA
+
+        series = series.dropna()
+        if series.index.freq is None:
+            series = series.asfreq(self._freq) if series.index.is_unique else series
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                self.fallback[symbol] = ARIMA(series, order=self.order).fit()
+        except Exception as error:
+            print(f"Error fitting {symbol}: {error}")
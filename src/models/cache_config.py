@@ -0,0 +1,130 @@
+import os
+import json
+from typing import Dict, Mapping, Optional
+
+ENV_PREFIX = 'STOCKPREDICTOR_CACHE_'
+EVICTION_POLICIES = ('least-recently-stored', 'least-recently-used', 'least-frequently-used', 'none')
+
+# Seconds each kind of entry is kept, None to keep it until it is evicted
+DEFAULT_TTLS = {
+    'close_prices': 3600,  # Preprocessed closing series
+    'history': 3600,  # Interval between refreshes of the downloaded history
+    'orders': 24 * 3600,  # Selected ARIMA orders
+    'models': None,  # Fitted model records
+    'forecasts': 24 * 3600,  # Forecast intervals and simulated paths of a fitted model
+    'precomputed': 7 * 24 * 3600,  # Forecasts of the watchlist, computed in the background
+}
+
+
+def default_directory() -> str:
+    """~/.cache/stockpredictor, or under $XDG_CACHE_HOME when it is set"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'stockpredictor')
+
+
+class CacheConfig:
+    """ Location, size, eviction policy, sharding and time to live of the cache """
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        size_limit: int = 1024 * 1024 * 1024,
+        eviction_policy: str = 'least-recently-stored',
+        shards: int = 8,
+        timeout: float = 1.0,
+        memory_bytes: int = 64 * 1024 * 1024,
+        memory_ttl: Optional[float] = 5.0,
+        statistics: bool = False,
+        ttls: Optional[Mapping[str, Optional[float]]] = None,
+    ) -> None:
+        """
+        Args:
+            directory(optional): Directory of the cache, default is ~/.cache/stockpredictor.
+            size_limit(optional) default 1 GiB: Bytes of the disk tier before entries are evicted.
+            eviction_policy(optional) default 'least-recently-stored': One of EVICTION_POLICIES.
+            shards(optional) default 8: Number of SQLite shards, so concurrent writers rarely wait on each other.
+            timeout(optional) default 1.0: Seconds a shard waits for its lock before retrying.
+            memory_bytes(optional) default 64 MiB: Size of the in-memory tier, 0 disables it.
+            memory_ttl(optional) default 5.0: Seconds a value stays in the memory tier before it is read again
+                from the disk, so the writes of other processes are seen; None keeps it until it expires.
+            statistics(optional) default False: Counts the disk hits and misses, at a small cost on every read.
+            ttls(optional): Seconds each namespace is kept, merged over DEFAULT_TTLS.
+        """
+
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}, use one of {', '.join(EVICTION_POLICIES)}")
+        if shards < 1:
+            raise ValueError("The cache needs at least one shard")
+        unknown = set(ttls or {}) - set(DEFAULT_TTLS)
+        if unknown:
+            raise ValueError(f"Unknown cache namespaces: {', '.join(sorted(unknown))}")
+
+        self.directory = os.path.abspath(os.path.expanduser(directory or default_directory()))
+        self.size_limit = int(size_limit)
+        self.eviction_policy = eviction_policy
+        self.shards = int(shards)
+        self.timeout = float(timeout)
+        self.memory_bytes = int(memory_bytes)
+        self.memory_ttl = float(memory_ttl) if memory_ttl is not None else None
+        self.statistics = bool(statistics)
+        self.ttls: Dict[str, Optional[float]] = {**DEFAULT_TTLS, **(ttls or {})}
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, environ: Optional[Mapping[str, str]] = None) -> 'CacheConfig':
+        """
+        Reads the configuration from a JSON file and then the environment, which has precedence.
+
+        The file is the given path or $STOCKPREDICTOR_CACHE_CONFIG, with the same keys as the arguments of
+        CacheConfig. The variables are STOCKPREDICTOR_CACHE_DIR, _SIZE_LIMIT, _EVICTION_POLICY, _SHARDS,
+        _TIMEOUT, _MEMORY_BYTES, _MEMORY_TTL ('none' to disable it), _STATISTICS and _TTL_<NAMESPACE> (e.g. STOCKPREDICTOR_CACHE_TTL_ORDERS=3600,
+        'none' keeps the entries until they are evicted).
+
+        Args:
+            path(optional): Path of the JSON file.
+            environ(optional): The environment variables, default is os.environ.
+
+        Returns:
+            The CacheConfig.
+        """
+
+        environ = os.environ if environ is None else environ
+        path = path or environ.get(f'{ENV_PREFIX}CONFIG')
+        options = {}
+        if path:
+            with open(os.path.expanduser(path)) as f:
+                options = json.load(f)
+
+        variables = {
+            'directory': ('DIR', str),
+            'size_limit': ('SIZE_LIMIT', int),
+            'eviction_policy': ('EVICTION_POLICY', str),
+            'shards': ('SHARDS', int),
+            'timeout': ('TIMEOUT', float),
+            'memory_bytes': ('MEMORY_BYTES', int),
+            'memory_ttl': ('MEMORY_TTL', lambda value: None if value.lower() == 'none' else float(value)),
+            'statistics': ('STATISTICS', lambda value: value.lower() in ('1', 'true', 'yes')),
+        }
+        for option, (name, parse) in variables.items():
+            if f'{ENV_PREFIX}{name}' in environ:
+                options[option] = parse(environ[f'{ENV_PREFIX}{name}'])
+
+        ttls = dict(options.get('ttls') or {})
+        for namespace in DEFAULT_TTLS:
+            value = environ.get(f'{ENV_PREFIX}TTL_{namespace.upper()}')
+            if value is not None:
+                ttls[namespace] = None if value.lower() == 'none' else float(value)
+        options['ttls'] = ttls
+
+        return cls(**options)
+
+    def to_dict(self) -> dict:
+        return {
+            'directory': self.directory,
+            'size_limit': self.size_limit,
+            'eviction_policy': self.eviction_policy,
+            'shards': self.shards,
+            'timeout': self.timeout,
+            'memory_bytes': self.memory_bytes,
+            'memory_ttl': self.memory_ttl,
+            'statistics': self.statistics,
+            'ttls': dict(self.ttls),
+        }
@@ -1,41 +1,212 @@
 import os
-from diskcache import Cache
-from typing import List, Union, Any
+import time
+import hashlib
+from collections import Counter
+from diskcache import FanoutCache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache_config import CacheConfig
+from .lru_cache import MISSING, LRUCache
+from .metrics import Metrics
+from .series_store import SeriesStore
+
+
+def fingerprint(data: pd.Series) -> str:
+    """Returns a short hash of the dates and values of a series, used in cache keys"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(pd.DatetimeIndex(data.index).as_unit('ns').asi8.tobytes())
+    digest.update(np.ascontiguousarray(data.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def namespace(key: str) -> str:
+    """The namespace of a cache key, the unit of the configured time to live"""
+    if key.startswith('history_'):
+        return 'history'
+    if key.startswith('pdq_'):
+        return 'orders'
+    if key.startswith('arima_'):
+        return 'models'
+    if key.startswith('forecast_'):
+        return 'forecasts'
+    if key.startswith('precomputed_'):
+        return 'precomputed'
+    if key.endswith('_close_prices'):
+        return 'close_prices'
+    return 'other'
+
 
 class CacheHandler:
-    """ A class to manage the cache """
-    def __init__(self) -> None:
-        self._cache_dir = os.path.join('../../.cache/', 'stockpredictor')
+    """
+    A class to manage the cache.
+    A bounded in-memory LRU tier sits in front of the disk: the writes go to both, and the reads only go
+    to the disk (and unpickle) on a memory miss. A memory entry expires with the disk entry or after the
+    configured memory_ttl, whichever comes first, so the writes of other processes are seen.
+    The disk tier is sharded, so the processes of a pool can write to the same cache concurrently.
+    """
+    def __init__(self, metrics: Optional[Metrics] = None, memory_bytes: Optional[int] = None, config: Optional[CacheConfig] = None) -> None:
+        """
+        Args:
+            metrics(optional): Where the cache spans are recorded, default is a new Metrics.
+            memory_bytes(optional): Size of the in-memory tier, 0 disables it, default is the configured size.
+            config(optional): Location, size, eviction policy and time to live, default is CacheConfig.load().
+        """
+
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.config = config if config is not None else CacheConfig.load()
+        self._memory = LRUCache(max_bytes=memory_bytes if memory_bytes is not None else self.config.memory_bytes)
+        self._cache_dir = self.config.directory
         os.makedirs(self._cache_dir, exist_ok=True)  # Create directory if it does not exist
-        self._cache = Cache(directory=self._cache_dir, size_limit=int(1024 * 1e6))
+        self._cache = FanoutCache(
+            directory=self._cache_dir,
+            shards=self.config.shards,
+            timeout=self.config.timeout,
+            size_limit=self.config.size_limit,
+            eviction_policy=self.config.eviction_policy,
+            statistics=int(self.config.statistics),
+        )
+        self._series = SeriesStore(directory=os.path.join(self._cache_dir, 'series'))
+
+    def ttl(self, namespace: str) -> Optional[float]:
+        """The configured seconds of a namespace ('close_prices', 'history', 'orders', 'models', 'forecasts' or 'precomputed'), None for no expiration"""
+        return self.config.ttls.get(namespace)
 
     def insert(self, data: dict) -> None:
         """Inserts a data dictionary into the cache without expiration"""
-        for k, v in data.items():
-            self._cache[k] = v
+        with self.metrics.span('cache_write'):
+            for k, v in data.items():
+                self._cache.set(k, v, retry=True)
+                self._memory.set(k, v, self._memory_expire_at(None))
+
+    def insert_tmp(self, data: dict, s: Optional[float]) -> None:
+        """Inserts temporary data into the cache with expiration time, None to never expire"""
+        expire_at = time.time() + s if s is not None else None
+        with self.metrics.span('cache_write'):
+            for k, v in data.items():
+                self._cache.set(k, v, expire=s, retry=True)
+                self._memory.set(k, v, self._memory_expire_at(expire_at))
+
+    def update(self, key: str, function: Callable[[Any], Any]) -> Any:
+        """
+        Replaces a value without expiration by function(stored value or None), in one transaction of the
+        shard of the key, so the updates of concurrent processes are merged instead of overwriting each
+        other while the writers of the other shards go on
 
-    def insert_tmp(self, data: dict, s: float) -> None:
-        """Inserts temporary data into the cache with expiration time"""
-        for k, v in data.items():
-            self._cache.set(k, v, expire=s)
+        Returns:
+            The new value.
+        """
+
+        with self.metrics.span('cache_write'):
+            shard = self._shard(key)
+            with shard.transact(retry=True):
+                value = function(shard.get(key, default=None, retry=True))
+                shard.set(key, value, retry=True)
+            self._memory.set(key, value, self._memory_expire_at(None))
+        return value
 
     def get(self, keys: Union[str, List[str]]) -> Union[Any, List[Any]]:
         """Retrieves one or more values ​​from the cache"""
-        itens = []
-
         if isinstance(keys, list):
             chave_list = keys
         else:
             chave_list = [keys]
 
-        for k in chave_list:
-            item = self._cache.get(k, default=None)
-            if item is not None:
-                itens.append(item)
+        found = self.get_many(chave_list)
+        itens = [found[k] for k in chave_list if found.get(k) is not None]
         if len(itens) == 0:
             return None  # If no item is found, return None
         return itens[0] if len(itens) == 1 else itens
 
+    def _shard(self, key: str):
+        """The diskcache Cache of the FanoutCache where a key is kept, chosen as FanoutCache does (diskcache 5.6)"""
+        return self._cache._shards[self._cache._hash(key) % self._cache._count]
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Retrieves many values at once: the memory misses are read from the disk without a transaction,
+        which would lock every shard against the writers; each read sees a committed value
+
+        Returns:
+            A dict with the keys found and their values.
+        """
+
+        found = {}
+        missing = []
+        with self.metrics.span('cache_read'):
+            for k in keys:
+                value = self._memory.lookup(k)
+                if value is MISSING:
+                    missing.append(k)
+                else:
+                    found[k] = value
+
+            self.metrics.incr('memory_cache_hits', len(found))
+            self.metrics.incr('memory_cache_misses', len(missing))
+            for k in missing:
+                value, expire_at = self._cache.get(k, default=MISSING, expire_time=True, retry=True)
+                if value is not MISSING:
+                    found[k] = value
+                    self._memory.set(k, value, self._memory_expire_at(expire_at))
+        return found
+
+    def _memory_expire_at(self, expire_at: Optional[float]) -> Optional[float]:
+        """When a memory entry must be read again from the disk: at the disk expiration or after memory_ttl"""
+        if self.config.memory_ttl is None:
+            return expire_at
+        refresh_at = time.time() + self.config.memory_ttl
+        return refresh_at if expire_at is None else min(expire_at, refresh_at)
+
+    def stats(self) -> dict:
+        """Hits, misses, evictions and size of the in-memory tier, and the size of the disk tier"""
+        return {'memory': self._memory.stats(), 'disk': {'entries': len(self._cache), 'bytes': self._cache.volume()}}
+
+    def inspect(self) -> dict:
+        """
+        Detailed statistics for the inspection command: stats() plus the number of entries of each
+        namespace on disk and in the series store, and the disk hits and misses if statistics are enabled.
+        Reads every key, so it is slow on large caches.
+        """
+
+        stats = self.stats()
+        stats['disk']['namespaces'] = dict(Counter(namespace(key) for key in self.keys()))
+        if self.config.statistics:
+            stats['disk']['hits'], stats['disk']['misses'] = self._cache.stats()
+        sizes = self._series.sizes()
+        stats['series'] = {
+            'entries': len(sizes),
+            'bytes': sum(sizes.values()),
+            'namespaces': dict(Counter(namespace(key) for key in sizes)),
+        }
+        return stats
+
+    def keys(self, prefix: str = '') -> Iterator[str]:
+        """Iterates over the keys of the disk tier that start with the prefix"""
+        return (key for key in self._cache if isinstance(key, str) and key.startswith(prefix))
+
+    def expire(self) -> int:
+        """Removes the expired entries of the disk tier, returns how many were removed"""
+        return self._cache.expire()
+
+    def insert_series(self, data: dict, s: Optional[float] = None) -> None:
+        """Inserts time series in the columnar store, with optional expiration time"""
+        with self.metrics.span('cache_write'):
+            for k, v in data.items():
+                self._series.write(k, v, expire=s)
+
+    def get_series(self, key: str) -> Optional[pd.Series]:
+        """Retrieves a time series memory-mapped from the columnar store"""
+        with self.metrics.span('cache_read'):
+            return self._series.read(key)
+
+    def delete_series(self, key: Union[str, List[str]]) -> None:
+        """Delete one or more time series from the columnar store"""
+        keys = key if isinstance(key, list) else [key]
+        for k in keys:
+            self._series.delete(k)
+
     def delete(self, key: Union[str, List[str]]) -> None:
         """Delete one or more keys from the cache"""
         if isinstance(key, list):
@@ -44,8 +215,8 @@ class CacheHandler:
             keys = [key]
 
         for k in keys:
-            if k in self._cache:
-                self._cache.delete(k)
+            self._memory.delete(k)
+            self._cache.delete(k, retry=True)
 
     def memoize(self, expire: float) -> None:
         """Function memoize (cache) with expiration"""
@@ -54,6 +225,8 @@ class CacheHandler:
     def clear(self) -> None:
         """Clears the cache completely"""
         self._cache.clear()
+        self._memory.clear()
+        self._series.clear()
 
     def close(self) -> None:
         """Closes the cache correctly"""
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .forecast_result import DEFAULT_LEVELS, ForecastResult
+from .state_space import system_matrices
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.arima.model import ARIMAResultsWrapper
+
+
+class CompactARIMA:
+    """
+    A fitted ARIMA model reduced to what a forecast needs: the parameters, their covariance, the system
+    matrices and the state predicted after the last observation. The filtered and smoothed states,
+    residuals and fitted values of the whole history are dropped, so it holds a few kilobytes whatever the
+    length of the data and thousands of them fit in one process.
+    """
+    __slots__ = ('order', 'params', 'param_names', 'cov', 'matrices', 'state', 'state_cov', 'nobs', 'last_date', 'freq')
+
+    def __init__(self, order: tuple[int, int, int], params: np.ndarray, param_names: Sequence[str], cov: np.ndarray, matrices: dict, state: np.ndarray, state_cov: np.ndarray, nobs: int, last_date: Optional[pd.Timestamp] = None, freq: Optional[str] = None) -> None:
+        """
+        Args:
+            order: The (p, d, q) order
+            params: The estimated parameters
+            param_names: The names of the parameters, as in statsmodels
+            cov: Covariance of the parameters
+            matrices: The dict returned by state_space.system_matrices
+            state: (m,) state predicted for the period after the last observation
+            state_cov: (m, m) covariance of the state
+            nobs: Number of observations of the data
+            last_date(optional): Last date of the data, None if the data is not dated with a frequency
+            freq(optional): Frequency of the dates, e.g. 'B'
+        """
+
+        self.order = tuple(order)
+        self.params = params
+        self.param_names = list(param_names)
+        self.cov = cov
+        self.matrices = matrices
+        self.state = state
+        self.state_cov = state_cov
+        self.nobs = nobs
+        self.last_date = last_date
+        self.freq = freq
+
+    @classmethod
+    def from_results(cls, model: ARIMAResultsWrapper) -> 'CompactARIMA':
+        """Keeps only the terminal state of a fitted (or filtered) statsmodels ARIMA model"""
+        filter_results = model.filter_results
+        index = model.model._index
+        dated = isinstance(index, pd.DatetimeIndex) and index.freq is not None
+        return cls(
+            order=model.model.order,
+            params=np.asarray(model.params, dtype=np.float64),
+            param_names=model.param_names,
+            cov=np.asarray(model.cov_params(), dtype=np.float64),
+            matrices=system_matrices(filter_results),
+            state=np.array(filter_results.predicted_state[:, -1]),
+            state_cov=np.array(filter_results.predicted_state_cov[:, :, -1]),
+            nobs=int(model.model.nobs),
+            last_date=index[-1] if dated else None,
+            freq=index.freqstr if dated else None,
+        )
+
+    def forecast(self, steps: int = 1) -> pd.Series:
+        """The point forecast, the same Series as the forecast of the statsmodels model"""
+        return self.get_forecast(steps, levels=()).point
+
+    def get_forecast(self, steps: int, levels: Sequence[float] = DEFAULT_LEVELS, n_paths: int = 0, seed: Optional[int] = None) -> ForecastResult:
+        """
+        Forecasts with intervals and, optionally, simulated paths
+
+        Args:
+            steps: Number of periods forecasted
+            levels(optional) default (0.80, 0.95): Coverage of each interval
+            n_paths(optional) default 0: Number of simulated paths, 0 to not simulate
+            seed(optional): Seed of the simulation
+
+        Returns:
+            The ForecastResult.
+        """
+
+        return ForecastResult.from_state(self.matrices, self.state, self.state_cov, self.forecast_index(steps), levels, n_paths, seed)
+
+    def forecast_index(self, steps: int) -> pd.Index:
+        """Dates of the next periods, or positions after the data when it has no frequency"""
+        if self.last_date is None:
+            return pd.RangeIndex(self.nobs, self.nobs + steps)
+        return pd.date_range(self.last_date, periods=steps + 1, freq=self.freq)[1:]
+
+    def cov_params(self) -> pd.DataFrame:
+        return pd.DataFrame(self.cov, index=self.param_names, columns=self.param_names)
+
+    def expand(self, data: pd.Series) -> ARIMAResultsWrapper:
+        """
+        Rebuilds the full statsmodels results, e.g. for in-sample predictions, running only the Kalman filter
+
+        Args:
+            data: The Pandas Series the model was fitted on, or that data with new bars
+
+        Returns:
+            A statsmodels ARIMA results object with the parameters of this model.
+        """
+
+        from statsmodels.tsa.arima.model import ARIMA
+
+        return ARIMA(data, order=self.order).filter(self.params)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays of the model"""
+        arrays = [self.params, self.cov, self.state, self.state_cov]
+        arrays += [value for value in self.matrices.values() if isinstance(value, np.ndarray)]
+        return sum(array.nbytes for array in arrays)
+
+    def __repr__(self) -> str:
+        return f'CompactARIMA(order={self.order}, nobs={self.nobs}, last_date={self.last_date})'
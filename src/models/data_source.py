@@ -0,0 +1,72 @@
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import pandas as pd
+
+
+class DataSource(ABC):
+    """ Base class of the sources of stock price data """
+    @abstractmethod
+    def download(self, symbol: str, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Downloads the price data of an action
+
+        Args:
+            symbol: The symbol of the action
+            start(optional): The first date to download, None for the full history
+
+        Returns:
+            A Pandas DataFrame indexed by date with at least a 'Close' column.
+            An empty DataFrame if there is no data.
+        """
+
+    def __call__(self, symbol: str, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        return self.download(symbol, start=start)
+
+
+class YahooDataSource(DataSource):
+    """ Downloads the data from Yahoo Finance """
+    def download(self, symbol: str, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        import yfinance as yf  # Imported on first use, it is slow to import
+
+        return yf.download(symbol, start=start, progress=False)
+
+
+class CSVDataSource(DataSource):
+    """ Reads the data from a directory with one '{symbol}.csv' file per action, useful without network """
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    def download(self, symbol: str, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        path = os.path.join(self._directory, f'{symbol}.csv')
+        if not os.path.exists(path):
+            return pd.DataFrame()
+
+        data = pd.read_csv(path, index_col=0, parse_dates=True)
+        if start is not None:
+            data = data[data.index >= start]
+        return data
+
+
+class RateLimiter:
+    """ A class to limit how many calls per second are made, shared between threads """
+    def __init__(self, calls_per_second: Optional[float] = None) -> None:
+        self._interval = 1 / calls_per_second if calls_per_second else 0
+        self._next_call = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Blocks until the next call is allowed"""
+        if not self._interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_call - now
+            self._next_call = max(now, self._next_call) + self._interval
+
+        if wait_time > 0:
+            time.sleep(wait_time)
@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Optional
+
+from .data_source import DataSource
+from .predictor import Predictor
+
+STAGES = ('download', 'order_search', 'fit', 'forecast')
+
+_worker_predictor: Optional[Predictor] = None
+
+
+def _init_worker(data_source: Optional[DataSource]) -> None:
+    """Creates the Predictor used by every task of a worker process"""
+    global _worker_predictor
+    warnings.simplefilter('ignore')
+    _worker_predictor = Predictor(data_source=data_source)
+
+
+def _forecast_symbol(symbol: str, steps: int, order: Optional[tuple[int, int, int]]) -> dict:
+    """Runs the whole pipeline for one symbol in a worker process, the errors are returned as records"""
+    predictor = _worker_predictor
+    timings = {}
+    stage = 'download'
+    try:
+        start = time.perf_counter()
+        data = predictor.load_closing_data(symbol)
+        if data is None:
+            raise ValueError(f"No data found for symbol: {symbol}")
+        timings['download'] = time.perf_counter() - start
+
+        stage = 'order_search'
+        start = time.perf_counter()
+        pdq_order = order if order is not None else predictor.autofit_ARIMA(data, symbol=symbol, trace=False)
+        timings['order_search'] = time.perf_counter() - start
+
+        stage = 'fit'
+        start = time.perf_counter()
+        model = predictor.create_ARIMA_model(data=data, pdq_order=pdq_order, symbol=symbol)
+        timings['fit'] = time.perf_counter() - start
+
+        stage = 'forecast'
+        start = time.perf_counter()
+        forecast = model.forecast(steps=steps)
+        timings['forecast'] = time.perf_counter() - start
+
+        return {
+            'symbol': symbol,
+            'order': list(pdq_order),
+            'last_date': data.index[-1].isoformat(),
+            'forecast': {date.isoformat(): float(value) for date, value in forecast.items()},
+            'timings': timings,
+        }
+
+    except Exception as error:
+        return {'symbol': symbol, 'error': str(error), 'stage': stage, 'timings': timings}
+
+
+class FleetReport:
+    """ Summary of a fleet run: successes, failures and time spent on each stage """
+    def __init__(self) -> None:
+        self.succeeded = 0
+        self.failed: Dict[str, str] = {}
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+        self.stage_count = {stage: 0 for stage in STAGES}
+        self.elapsed = 0.0
+
+    def add(self, record: dict) -> None:
+        """Accounts a record returned by a worker"""
+        if 'error' in record:
+            self.failed[record['symbol']] = f"{record['stage']}: {record['error']}"
+        else:
+            self.succeeded += 1
+        for stage, seconds in record['timings'].items():
+            self.stage_seconds[stage] += seconds
+            self.stage_count[stage] += 1
+
+    def throughput(self) -> Dict[str, float]:
+        """Symbols per second of worker time on each stage"""
+        return {
+            stage: self.stage_count[stage] / seconds if seconds else 0.0
+            for stage, seconds in self.stage_seconds.items()
+        }
+
+    def to_dict(self) -> dict:
+        total = self.succeeded + len(self.failed)
+        return {
+            'symbols': total,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'elapsed_seconds': self.elapsed,
+            'symbols_per_second': total / self.elapsed if self.elapsed else 0.0,
+            'stage_seconds': self.stage_seconds,
+            'stage_throughput': self.throughput(),
+        }
+
+    def summary(self) -> str:
+        report = self.to_dict()
+        lines = [
+            f"{report['symbols']} symbols in {report['elapsed_seconds']:.1f}s "
+            f"({report['symbols_per_second']:.2f} symbols/s), {report['succeeded']} succeeded, {len(self.failed)} failed"
+        ]
+        for stage, rate in report['stage_throughput'].items():
+            lines.append(f"  {stage}: {self.stage_seconds[stage]:.1f}s of worker time, {rate:.2f} symbols/s")
+        for symbol, error in self.failed.items():
+            lines.append(f"  {symbol} failed on {error}")
+        return '\n'.join(lines)
+
+
+class FleetForecaster:
+    """ A class to download, fit and forecast many symbols in parallel processes, without the GUI. """
+    def __init__(self, data_source: Optional[DataSource] = None, max_workers: Optional[int] = None, steps: int = 24, order: Optional[tuple[int, int, int]] = None) -> None:
+        """
+        Args:
+            data_source(optional): Where the data is downloaded from, default is Yahoo Finance.
+            max_workers(optional): Number of processes, default is the number of cores.
+            steps(optional) default 24: Number of periods forecasted for each symbol.
+            order(optional): A fixed (p, d, q) order for every symbol, None to search the order of each one.
+        """
+
+        self._data_source = data_source
+        self._max_workers = max_workers
+        self._steps = steps
+        self._order = order
+
+    def run(self, symbols: Iterable[str], output_path: str) -> FleetReport:
+        """
+        Forecasts every symbol and writes one JSON line per symbol as soon as it is done.
+        A symbol that fails is written with its error and does not stop the run.
+
+        Args:
+            symbols: The symbols of the actions.
+            output_path: Path of the JSON Lines file with the results.
+
+        Returns:
+            A FleetReport with the throughput of each stage.
+        """
+
+        report = FleetReport()
+        start = time.perf_counter()
+        pending_symbols = iter(dict.fromkeys(symbols))
+        max_workers = self._max_workers or os.cpu_count() or 1
+        max_in_flight = 2 * max_workers  # Only a few results are held in memory at a time
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self._data_source,)) as executor, \
+                open(output_path, 'w') as output:
+            in_flight = {}
+
+            while True:
+                for symbol in pending_symbols:
+                    in_flight[executor.submit(_forecast_symbol, symbol, self._steps, self._order)] = symbol
+                    if len(in_flight) >= max_in_flight:
+                        break
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol = in_flight.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as error:  # The worker process died
+                        record = {'symbol': symbol, 'error': str(error), 'stage': 'worker', 'timings': {}}
+                    output.write(json.dumps(record) + '\n')
+                    output.flush()
+                    report.add(record)
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def run_batch(self, symbols: Iterable[str], output_path: str, chunk_size: int = 500) -> FleetReport:
+        """
+        Forecasts every symbol with the fixed order, estimating each chunk of symbols together with
+        BatchARIMA instead of one process task per symbol. Writes the same JSON lines as run().
+
+        Args:
+            symbols: The symbols of the actions.
+            output_path: Path of the JSON Lines file with the results.
+            chunk_size(optional) default 500: Number of symbols downloaded and estimated together.
+
+        Returns:
+            A FleetReport with the throughput of each stage.
+        """
+
+        if self._order is None:
+            raise ValueError("The batch mode needs a fixed order")
+
+        report = FleetReport()
+        start = time.perf_counter()
+        unique_symbols = list(dict.fromkeys(symbols))
+        predictor = Predictor(data_source=self._data_source)
+
+        with open(output_path, 'w') as output:
+            for i in range(0, len(unique_symbols), chunk_size):
+                chunk = unique_symbols[i:i + chunk_size]
+                timings = {}
+
+                stage_start = time.perf_counter()
+                panel = predictor.download_panel(chunk, max_workers=self._max_workers or 8)
+                data = panel.to_frame(fill=True)
+                timings['download'] = time.perf_counter() - stage_start
+
+                stage_start = time.perf_counter()
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    results = predictor.create_batch_ARIMA_models(data, self._order)
+                timings['fit'] = time.perf_counter() - stage_start
+
+                stage_start = time.perf_counter()
+                forecasts = results.forecast(self._steps)
+                timings['forecast'] = time.perf_counter() - stage_start
+
+                # Each record carries its share of the time of the chunk
+                timings = {stage: seconds / len(chunk) for stage, seconds in timings.items()}
+                for symbol in chunk:
+                    if symbol not in data:
+                        record = {'symbol': symbol, 'error': f"No data found for symbol: {symbol}", 'stage': 'download', 'timings': {}}
+                    elif symbol not in forecasts:
+                        record = {'symbol': symbol, 'error': 'The model could not be fitted', 'stage': 'fit', 'timings': {}}
+                    else:
+                        forecast = forecasts[symbol].dropna()
+                        record = {
+                            'symbol': symbol,
+                            'order': list(self._order),
+                            'last_date': data[symbol].last_valid_index().isoformat(),
+                            'forecast': {date.isoformat(): float(value) for date, value in forecast.items()},
+                            'timings': timings,
+                        }
+                    output.write(json.dumps(record) + '\n')
+                    report.add(record)
+                output.flush()
+
+        report.elapsed = time.perf_counter() - start
+        return report
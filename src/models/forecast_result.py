@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .state_space import project, simulate, system_matrices
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.arima.model import ARIMAResultsWrapper
+
+DEFAULT_LEVELS = (0.80, 0.95)
+
+
+class ForecastResult:
+    """
+    The forecast of a model as arrays: the point forecast, its variance, the intervals of every level and,
+    optionally, simulated future paths. Small enough to be cached next to the model and pickled to workers.
+    """
+    __slots__ = ('index', 'mean', 'variance', 'levels', 'lower', 'upper', 'paths')
+
+    def __init__(self, index: pd.Index, mean: np.ndarray, variance: np.ndarray, levels: Sequence[float], paths: Optional[np.ndarray] = None) -> None:
+        """
+        Args:
+            index: Dates (or positions) of the forecasted periods
+            mean: (steps,) point forecast
+            variance: (steps,) variance of the point forecast
+            levels: Coverage of each interval, e.g. (0.80, 0.95)
+            paths(optional): (n_paths, steps) simulated observations
+        """
+
+        for level in levels:
+            if not 0 < level < 1:
+                raise ValueError(f"Interval levels must be between 0 and 1, got {level}")
+
+        self.index = index
+        self.mean = mean
+        self.variance = variance
+        self.levels = tuple(float(level) for level in levels)
+        z = np.array([NormalDist().inv_cdf(0.5 + level / 2) for level in self.levels])[:, None]
+        deviation = np.sqrt(variance)
+        self.lower = mean - z * deviation  # (n_levels, steps)
+        self.upper = mean + z * deviation
+        self.paths = paths
+
+    @classmethod
+    def from_model(cls, model: ARIMAResultsWrapper, steps: int, levels: Sequence[float] = DEFAULT_LEVELS, n_paths: int = 0, seed: Optional[int] = None) -> 'ForecastResult':
+        """
+        Forecasts from the last filtered state of a fitted model, without refitting it: the means and the
+        variances of every step come from one projection, and the paths are simulated together.
+
+        Args:
+            model: A fitted (or filtered) ARIMA model
+            steps: Number of periods forecasted
+            levels(optional) default (0.80, 0.95): Coverage of each interval
+            n_paths(optional) default 0: Number of simulated paths, 0 to not simulate
+            seed(optional): Seed of the simulation, for reproducible paths
+
+        Returns:
+            The ForecastResult.
+        """
+
+        filter_results = model.filter_results
+        nobs = model.model.nobs
+        return cls.from_state(
+            matrices=system_matrices(filter_results),
+            state=np.asarray(filter_results.predicted_state[:, -1]),
+            cov=np.asarray(filter_results.predicted_state_cov[:, :, -1]),
+            index=model.model._get_prediction_index(nobs, nobs + steps - 1)[3],
+            levels=levels,
+            n_paths=n_paths,
+            seed=seed,
+        )
+
+    @classmethod
+    def from_state(cls, matrices: dict, state: np.ndarray, cov: np.ndarray, index: pd.Index, levels: Sequence[float] = DEFAULT_LEVELS, n_paths: int = 0, seed: Optional[int] = None) -> 'ForecastResult':
+        """
+        Forecasts len(index) steps from a predicted state
+
+        Args:
+            matrices: The dict returned by state_space.system_matrices
+            state: (m,) state predicted for the first forecasted period
+            cov: (m, m) covariance of the state
+            index: Dates (or positions) of the forecasted periods
+            levels(optional) default (0.80, 0.95): Coverage of each interval
+            n_paths(optional) default 0: Number of simulated paths, 0 to not simulate
+            seed(optional): Seed of the simulation
+
+        Returns:
+            The ForecastResult.
+        """
+
+        steps = len(index)
+        means, variances = project(matrices, state[None], cov[None], steps)
+        paths = simulate(matrices, state, cov, steps, n_paths, np.random.default_rng(seed)) if n_paths else None
+        return cls(index, means[0], variances[0], levels, paths)
+
+    @property
+    def point(self) -> pd.Series:
+        """The point forecast, the same Series as model.forecast(steps)"""
+        return pd.Series(self.mean, index=self.index, name='predicted_mean')
+
+    def interval(self, level: float) -> pd.DataFrame:
+        """The 'lower' and 'upper' bounds of one of the levels"""
+        if level not in self.levels:
+            raise KeyError(f"No interval at level {level}, the levels are {self.levels}")
+        i = self.levels.index(level)
+        return pd.DataFrame({'lower': self.lower[i], 'upper': self.upper[i]}, index=self.index)
+
+    def quantiles(self, q: Sequence[float]) -> pd.DataFrame:
+        """Empirical quantiles of the simulated paths, one column per quantile"""
+        if self.paths is None:
+            raise ValueError("The forecast has no simulated paths")
+        return pd.DataFrame(np.quantile(self.paths, q, axis=0).T, index=self.index, columns=list(q))
+
+    def to_frame(self) -> pd.DataFrame:
+        """The point forecast and the bounds of every level, e.g. the columns mean, lower_95 and upper_95"""
+        columns = {'mean': self.mean}
+        for i, level in enumerate(self.levels):
+            name = f'{level * 100:g}'
+            columns[f'lower_{name}'] = self.lower[i]
+            columns[f'upper_{name}'] = self.upper[i]
+        return pd.DataFrame(columns, index=self.index)
+
+    def __len__(self) -> int:
+        return len(self.mean)
+
+    def __repr__(self) -> str:
+        paths = 0 if self.paths is None else len(self.paths)
+        return f'ForecastResult(steps={len(self)}, levels={self.levels}, paths={paths})'
@@ -0,0 +1,97 @@
+import time
+from typing import Optional
+
+import pandas as pd
+
+from .cache_handler import CacheHandler
+from .prediction_request import PredictionRequest
+
+
+class ForecastStore:
+    """
+    A class to keep the forecasts precomputed in the background, so they are answered without waiting
+    for the download, the order search and the fit. Each record says when it was computed and up to
+    which date the data went, so the readers decide if it is still fresh enough.
+    """
+    def __init__(self, cache: CacheHandler, max_age: Optional[float] = 24 * 3600, ttl: Optional[float] = 7 * 24 * 3600) -> None:
+        """
+        Args:
+            cache: The CacheHandler where the records are kept
+            max_age(optional) default 24h: Seconds after which a record is stale, None to never be stale
+            ttl(optional) default 7 days: Seconds a record is kept, stale or not, None to keep it until it is evicted
+        """
+
+        self._cache = cache
+        self.max_age = max_age
+        self._ttl = ttl
+
+    @staticmethod
+    def key(symbol: str) -> str:
+        return f'precomputed_{symbol}'
+
+    def save(self, request: PredictionRequest) -> dict:
+        """
+        Stores the results of a finished PredictionRequest
+
+        Returns:
+            The stored record.
+        """
+
+        record = {
+            'symbol': request.symbol,
+            'order': tuple(request.pdq_order),
+            'years': request.years,
+            'computed_at': time.time(),
+            'last_date': request.data.index[-1],
+            'close_prices': request.data,
+            'forecast': request.forecast,
+            'performance_prediction': request.performance_prediction,
+            'forecast_result': request.forecast_result,
+        }
+        self._cache.insert_tmp({self.key(request.symbol): record}, self._ttl)
+        return record
+
+    def load(self, symbol: str, fresh: bool = False) -> Optional[dict]:
+        """
+        Loads the precomputed record of a symbol
+
+        Args:
+            symbol: The symbol of the action
+            fresh(optional) default False: Returns None instead of a stale record
+
+        Returns:
+            The record, with its 'age' in seconds and whether it is 'stale', or None.
+        """
+
+        record = self._cache.get(self.key(symbol))
+        if record is None:
+            return None
+        record = {**record, 'age': self.age(record), 'stale': self.is_stale(record)}
+        if fresh and record['stale']:
+            return None
+        return record
+
+    def age(self, record: dict) -> float:
+        return time.time() - record['computed_at']
+
+    def is_stale(self, record: Optional[dict]) -> bool:
+        """A missing record is stale, and so is one older than max_age"""
+        if record is None:
+            return True
+        return self.max_age is not None and self.age(record) >= self.max_age
+
+    def metadata(self, symbol: str) -> Optional[dict]:
+        """When the record of a symbol was computed, up to which date and whether it is stale"""
+        record = self.load(symbol)
+        if record is None:
+            return None
+        return {
+            'symbol': symbol,
+            'computed_at': record['computed_at'],
+            'last_date': pd.Timestamp(record['last_date']).isoformat(),
+            'age': record['age'],
+            'stale': record['stale'],
+        }
+
+    def delete(self, symbol: str) -> None:
+        self._cache.delete(self.key(symbol))
@@ -0,0 +1,121 @@
+import time
+from typing import Callable, Optional
+
+import pandas as pd
+
+from .cache_handler import CacheHandler
+
+
+class HistoryStore:
+    """ A class to keep the closing history of each symbol and download only the new bars """
+    def __init__(self, cache: CacheHandler, downloader: Callable[..., pd.DataFrame], refresh_interval: Optional[float] = 3600, tolerance: float = 1e-4) -> None:
+        """
+        Args:
+            cache: The CacheHandler where the histories are kept
+            downloader: Function download(symbol, start=None) that returns a DataFrame with a 'Close' column
+            refresh_interval(optional) default 3600: Seconds after which a stored history is refreshed, None to never expire
+            tolerance(optional) default 1e-4: Relative difference of a downloaded bar from the stored one that reveals
+                a new price adjustment (split or dividend), after which the full history is downloaded again
+        """
+
+        self._cache = cache
+        self._downloader = downloader
+        self._refresh_interval = refresh_interval
+        self._tolerance = tolerance
+
+    def load(self, symbol: str) -> Optional[pd.DataFrame]:
+        """
+        Loads the stored closing history of a symbol
+
+        Args:
+            symbol: The symbol of action according to Yahoo Finance.
+
+        Returns:
+            A Pandas DataFrame with a 'Close' column, or None if nothing is stored.
+        """
+        close = self._cache.get_series(f'history_{symbol}')
+        if close is None:
+            return None
+        return close.to_frame('Close')
+
+    def refresh(self, symbol: str) -> Optional[pd.DataFrame]:
+        """
+        Brings the stored history of a symbol up to date.
+        Only the bars after the last stored date are requested. The last two stored bars are requested
+        again: the last one may have been an incomplete session and is replaced, the one before must
+        not have changed. If it did, the closes were adjusted for a split or a dividend since they were
+        stored, so the stored history is discarded and downloaded again in full.
+
+        Args:
+            symbol: The symbol of action according to Yahoo Finance.
+
+        Returns:
+            A Pandas DataFrame with the full 'Close' history, or None if there is no data.
+        """
+
+        stored = self.load(symbol)
+        if stored is not None and not self.is_stale(symbol):
+            return stored
+
+        # With less than two stored bars there is nothing to check the new bars against, the full history is requested
+        start = stored.index[-2] if stored is not None and len(stored) > 1 else None
+        new_bars = self._extract_close(self._downloader(symbol, start=start))
+        if start is not None and new_bars is not None and self._adjusted(stored, new_bars):
+            start = None
+            new_bars = self._extract_close(self._downloader(symbol, start=None))
+
+        if new_bars is None:
+            if stored is not None:
+                self._mark_refreshed(symbol)
+            return stored
+
+        history = new_bars if start is None else self._merge(stored, new_bars)
+        self._cache.insert_series({f'history_{symbol}': history['Close']})
+        self._mark_refreshed(symbol)
+        return history
+
+    def is_stale(self, symbol: str) -> bool:
+        """Checks if the stored history of a symbol must be refreshed"""
+        refreshed_at = self._cache.get(f'history_{symbol}_refreshed_at')
+        if refreshed_at is None:
+            return True
+        return self._refresh_interval is not None and time.time() - refreshed_at >= self._refresh_interval
+
+    def delete(self, symbol: str) -> None:
+        """Deletes the stored history of a symbol"""
+        self._cache.delete_series(f'history_{symbol}')
+        self._cache.delete(f'history_{symbol}_refreshed_at')
+
+    def _mark_refreshed(self, symbol: str) -> None:
+        self._cache.insert({f'history_{symbol}_refreshed_at': time.time()})
+
+    @staticmethod
+    def _extract_close(data: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Keeps only the 'Close' column of a download, as a single column DataFrame"""
+        if data is None or data.empty or 'Close' not in data.columns:
+            return None
+
+        close = data['Close']
+        if isinstance(close, pd.DataFrame):  # Multi-level columns (Price, Ticker)
+            close = close.iloc[:, 0]
+        close = close.dropna()
+        if close.empty:
+            return None
+
+        close.index = pd.to_datetime(close.index)
+        return close.to_frame('Close')
+
+    def _adjusted(self, stored: pd.DataFrame, new_bars: pd.DataFrame) -> bool:
+        """Checks if the last complete stored bar was downloaded again with another value"""
+        date = stored.index[-2]
+        if date not in new_bars.index:
+            return False
+        old, new = stored['Close'].iloc[-2], new_bars['Close'].loc[date]
+        return abs(new - old) > self._tolerance * abs(old)
+
+    @staticmethod
+    def _merge(stored: pd.DataFrame, new_bars: pd.DataFrame) -> pd.DataFrame:
+        """Appends the new bars, the downloaded values replace the stored ones on the same date"""
+        history = pd.concat([stored, new_bars])
+        history = history[~history.index.duplicated(keep='last')]
+        return history.sort_index()
@@ -0,0 +1,64 @@
+from typing import Optional
+
+import pandas as pd
+
+# Frequency -> (Pandas rule of the resampled index, periods per year)
+FREQUENCIES = {
+    'D': ('B', 252),
+    'W': ('W-FRI', 52),
+    'M': ('ME', 12),
+}
+
+
+class Horizon:
+    """
+    How far ahead and at which frequency a forecast is made.
+    The daily closing values are resampled to the frequency (the last close of each period) and only the
+    most recent periods are kept for the fit: a monthly model of a few hundred points instead of a
+    daily one of the whole history, for forecasts that look years ahead anyway.
+    """
+    def __init__(self, years: float = 2, frequency: str = 'M', lookback: int = 5, min_periods: int = 60) -> None:
+        """
+        Args:
+            years(optional) default 2: The horizon, in years
+            frequency(optional) default 'M': 'D' for business days, 'W' for weeks or 'M' for months
+            lookback(optional) default 5: The fit uses the last lookback times the number of forecasted periods
+            min_periods(optional) default 60: Minimum number of periods of the fit, when the data has them
+        """
+
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency: {frequency}, use one of {', '.join(FREQUENCIES)}")
+        if years <= 0:
+            raise ValueError("The horizon must be positive")
+
+        self.years = years
+        self.frequency = frequency
+        self.rule, self.periods_per_year = FREQUENCIES[frequency]
+        self.steps = max(int(round(years * self.periods_per_year)), 1)
+        self.window = max(lookback * self.steps, min_periods)
+
+    def prepare(self, data: pd.Series) -> pd.Series:
+        """
+        Resamples the closing values to the frequency and keeps the last periods of the window
+
+        Args:
+            data: A Pandas Series with date index and closing values, e.g. daily closes
+
+        Returns:
+            A Pandas Series with a regular index of the frequency, so the forecasts are dated correctly.
+        """
+
+        data = data.dropna()
+        if self.frequency == 'D':
+            resampled = data.asfreq(self.rule).ffill()
+        else:
+            # An unfinished last period is kept: its last close is the most recent value
+            resampled = data.resample(self.rule).last().ffill()
+        return resampled.iloc[-self.window:]
+
+    def cache_symbol(self, symbol: Optional[str]) -> Optional[str]:
+        """The symbol under which the orders and models of this frequency are cached, apart from the daily ones"""
+        return f'{symbol}@{self.frequency}' if symbol else symbol
+
+    def __repr__(self) -> str:
+        return f'Horizon(years={self.years}, frequency={self.frequency!r}, steps={self.steps}, window={self.window})'
@@ -0,0 +1,159 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MISSING = object()
+
+
+def sizeof(value: Any, max_depth: int = 6) -> int:
+    """
+    Estimates the bytes a value holds in memory without serializing it: NumPy and Pandas objects by their
+    buffers, containers and objects by walking their items and attributes, each object counted once.
+    Objects deeper than max_depth are counted by their shallow size.
+    """
+
+    seen = set()
+
+    def walk(value: Any, depth: int) -> int:
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+
+        if isinstance(value, np.ndarray):
+            return value.nbytes if value.base is None else walk(value.base, depth)  # Views share the buffer of their base
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(deep=False))
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(deep=False).sum())
+        if isinstance(value, pd.Index):
+            return int(value.memory_usage(deep=False))
+
+        size = sys.getsizeof(value, 64)
+        if depth >= max_depth or isinstance(value, (str, bytes, bytearray, int, float, bool, type(None))):
+            return size
+        if isinstance(value, dict):
+            return size + sum(walk(k, depth + 1) + walk(v, depth + 1) for k, v in value.items())
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return size + sum(walk(item, depth + 1) for item in value)
+
+        attributes = getattr(value, '__dict__', None)
+        if isinstance(attributes, dict):
+            size += walk(attributes, depth + 1)
+        for name in getattr(type(value), '__slots__', ()):
+            size += walk(getattr(value, name, None), depth + 1)
+        return size
+
+    return walk(value, 0)
+
+
+class LRUCache:
+    """
+    A thread-safe in-memory cache bounded by bytes, which evicts the least recently used entries first.
+    The entries expire at an absolute time.time(), the same clock as diskcache, so both tiers agree.
+    The values are shared, not copied: they must not be modified after they are stored.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, sizeof: Callable[[Any], int] = sizeof) -> None:
+        """
+        Args:
+            max_bytes(optional) default 64 MiB: Memory the entries may hold; larger values are not kept
+            sizeof(optional): Function that estimates the bytes of a value
+        """
+
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int, Optional[float]]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.lookup(key)
+        return default if value is MISSING else value
+
+    def lookup(self, key: Hashable) -> Any:
+        """Returns the value, or MISSING, so that a stored None is a hit"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return MISSING
+
+            value, size, expire_at = entry
+            if expire_at is not None and expire_at <= time.time():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, expire_at: Optional[float] = None) -> bool:
+        """
+        Args:
+            key: The key
+            value: The value
+            expire_at(optional): time.time() at which the entry expires, None to never expire
+
+        Returns:
+            True if the value is kept, False if it is larger than the whole cache.
+        """
+
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return False
+
+            self._entries[key] = (value, size, expire_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hits, misses, evictions, expirations, number of entries and bytes in use"""
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > time.time())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,130 @@
+import io
+import json
+import time
+import pstats
+import logging
+import cProfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger('stockpredictor.metrics')
+
+
+class Profile:
+    """ The result of a profiled block, the report is in text after the block ends """
+    def __init__(self, profiler: str) -> None:
+        self.profiler = profiler
+        self.text = ''
+
+
+class Metrics:
+    """ A class to collect the time spent on each stage and the counters of the Predictor """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spans: Dict[str, List[float]] = {}  # name -> [count, total seconds, max seconds]
+        self._counters: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Times a block of code under a stage name; each span is also logged at DEBUG level"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                span = self._spans.setdefault(name, [0, 0.0, 0.0])
+                span[0] += 1
+                span[1] += seconds
+                span[2] = max(span[2], seconds)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(json.dumps({'span': name, 'seconds': seconds}))
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increments a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        """Returns a copy of the spans and counters"""
+        with self._lock:
+            return {
+                'spans': {
+                    name: {'count': int(count), 'total_seconds': total, 'max_seconds': maximum}
+                    for name, (count, total, maximum) in self._spans.items()
+                },
+                'counters': dict(self._counters),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    def log(self, level: int = logging.INFO) -> None:
+        """Logs one JSON record per span and counter"""
+        snapshot = self.snapshot()
+        for name, span in snapshot['spans'].items():
+            logger.log(level, json.dumps({'span': name, **span}))
+        for name, value in snapshot['counters'].items():
+            logger.log(level, json.dumps({'counter': name, 'value': value}))
+
+    def to_prometheus(self, prefix: str = 'stockpredictor') -> str:
+        """Formats the metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            f'# TYPE {prefix}_stage_seconds summary',
+        ]
+        for name, span in sorted(snapshot['spans'].items()):
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {span["count"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {span["total_seconds"]:.6f}')
+        lines.append(f'# TYPE {prefix}_stage_seconds_max gauge')
+        for name, span in sorted(snapshot['spans'].items()):
+            lines.append(f'{prefix}_stage_seconds_max{{stage="{name}"}} {span["max_seconds"]:.6f}')
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    @contextmanager
+    def profile(self, enabled: bool = True, profiler: str = 'cprofile', limit: int = 30) -> Iterator[Profile]:
+        """
+        Profiles a block of code, e.g. one request
+
+        Args:
+            enabled(optional) default True: Switches the profiling on or off without changing the code
+            profiler(optional) default 'cprofile': 'cprofile' or 'pyinstrument' (if installed)
+            limit(optional) default 30: Number of functions in the cProfile report
+
+        Returns:
+            A Profile, whose text is filled when the block ends.
+        """
+
+        result = Profile(profiler)
+        if not enabled:
+            yield result
+            return
+
+        if profiler == 'pyinstrument':
+            from pyinstrument import Profiler  # Optional dependency
+
+            instrument = Profiler()
+            instrument.start()
+            try:
+                yield result
+            finally:
+                instrument.stop()
+                result.text = instrument.output_text()
+            return
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield result
+        finally:
+            profile.disable()
+            output = io.StringIO()
+            pstats.Stats(profile, stream=output).sort_stats('cumulative').print_stats(limit)
+            result.text = output.getvalue()
+
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cache_handler import CacheHandler, fingerprint
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.arima.model import ARIMAResultsWrapper
+
+
+class ModelStore:
+    """ A class to persist the fitted ARIMA models, so unchanged data is never fitted twice """
+    def __init__(self, cache: CacheHandler, n_last_observations: int = 10, ttl: Optional[float] = None) -> None:
+        self._cache = cache
+        self._n_last_observations = n_last_observations
+        self._ttl = ttl
+
+    @staticmethod
+    def key(symbol: str, pdq_order: tuple[int, int, int], data_fingerprint: str) -> str:
+        p, d, q = pdq_order
+        return f'arima_{symbol}_{p}_{d}_{q}_{data_fingerprint}'
+
+    def save(self, symbol: str, data: pd.Series, model: ARIMAResultsWrapper, fitted_nobs: Optional[int] = None, order_nobs: Optional[int] = None) -> dict:
+        """
+        Persists the state of a fitted model
+
+        Args:
+            symbol: The symbol of the data
+            data: The Pandas Series the model was fitted on
+            model: The fitted ARIMA model
+            fitted_nobs(optional): Number of observations of the last parameter estimation, default is all of them
+            order_nobs(optional): Number of observations when the order was selected, default is kept from
+                the latest record of the same order, or all of them
+
+        Returns:
+            The persisted record.
+        """
+
+        pdq_order = tuple(model.model.order)
+        if order_nobs is None:
+            latest = self.load_latest(symbol)
+            order_nobs = latest['order_nobs'] if latest is not None and latest['order'] == pdq_order else len(data)
+        last_observations = data.iloc[-self._n_last_observations:]
+        record = {
+            'symbol': symbol,
+            'order': pdq_order,
+            'params': np.asarray(model.params, dtype=np.float64),
+            'param_names': list(model.param_names),
+            'cov_params': np.asarray(model.cov_params(), dtype=np.float64),
+            'last_observations': last_observations.to_numpy(dtype=np.float64),
+            'last_dates': last_observations.index.to_numpy(),
+            'nobs': len(data),
+            'fitted_nobs': fitted_nobs if fitted_nobs is not None else len(data),
+            'order_nobs': order_nobs,
+            'fingerprint': fingerprint(data),
+            'fitted_at': time.time(),
+        }
+        self._cache.insert_tmp({
+            self.key(symbol, pdq_order, record['fingerprint']): record,
+            f'arima_{symbol}_latest': record,
+        }, self._ttl)
+        return record
+
+    def load(self, symbol: str, pdq_order: tuple[int, int, int], data: pd.Series) -> Optional[dict]:
+        """Loads the record of a model fitted with this order on exactly this data"""
+        return self._cache.get(self.key(symbol, tuple(pdq_order), fingerprint(data)))
+
+    def load_latest(self, symbol: str) -> Optional[dict]:
+        """Loads the record of the last model fitted for a symbol, whatever the data"""
+        return self._cache.get(f'arima_{symbol}_latest')
+
+    def set_latest(self, record: dict) -> None:
+        """Marks a record as the last model of its symbol"""
+        self._cache.insert_tmp({f'arima_{record["symbol"]}_latest': record}, self._ttl)
+
+    @staticmethod
+    def is_prefix(data: pd.Series, record: dict) -> bool:
+        """Checks if the data the record was fitted on is the beginning of the given data"""
+        nobs = record['nobs']
+        if len(data) < nobs:
+            return False
+        stored = data.iloc[nobs - len(record['last_observations']):nobs]
+        return (
+            np.array_equal(stored.index.to_numpy(), record['last_dates'])
+            and np.allclose(stored.to_numpy(dtype=np.float64), record['last_observations'], equal_nan=True)
+        )
+
+    @staticmethod
+    def restore(data: pd.Series, record: dict) -> ARIMAResultsWrapper:
+        """
+        Rebuilds a fitted model from a record, running only the Kalman filter with the persisted parameters
+
+        Args:
+            data: The Pandas Series the model is applied on
+            record: A record returned by save or load
+
+        Returns:
+            An ARIMA model ready to forecast, without a new maximum likelihood estimation.
+        """
+
+        from statsmodels.tsa.arima.model import ARIMA
+
+        return ARIMA(data, order=record['order']).filter(record['params'])
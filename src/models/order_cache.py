@@ -0,0 +1,195 @@
+import math
+import threading
+import warnings
+from statistics import NormalDist
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .batch_arima import BatchARIMA, _lags, _ma_filter
+from .cache_handler import CacheHandler, fingerprint
+from .metrics import Metrics
+from .order_search import OrderSearch
+
+
+class OrderCache:
+    """
+    A class to keep the selected ARIMA orders, so the order search runs only when the data changes.
+    With the last order of a symbol a cheap estimate of its parameters is kept. When new bars arrive,
+    their standardized one-step errors under that estimate tell if the data drifted: if not, the order
+    is reused; if so, the neighbouring orders are checked again.
+    """
+    def __init__(self, cache: CacheHandler, ttl: Optional[float] = 24 * 3600, window: Optional[int] = 500, revalidation_search: Optional[OrderSearch] = None, metrics: Optional[Metrics] = None, drift_level: Optional[float] = 0.99) -> None:
+        """
+        Args:
+            cache: The CacheHandler where the orders are kept
+            ttl(optional) default 24h: Seconds an order is kept, None to keep it until it is evicted; the last
+                order of a symbol is kept again each time it is reused
+            window(optional) default 500: Number of last observations used in the fingerprint and in the drift
+                check, None for the whole series
+            revalidation_search(optional): The search whose options are used to check the neighbouring orders,
+                default is auto_arima restricted to the neighbouring orders
+            metrics(optional): Where the hits, misses, reuses and revalidations are also counted
+            drift_level(optional) default 0.99: The new bars drifted when the sum of their squared standardized
+                one-step errors exceeds this quantile of the chi-square distribution; None to check the
+                neighbouring orders on every change of the data
+        """
+
+        self._cache = cache
+        self._ttl = ttl
+        self._window = window
+        self._revalidation_search = revalidation_search
+        self._metrics = metrics if metrics is not None else Metrics()
+        self._drift_level = drift_level
+        self.hits = 0
+        self.misses = 0
+        self.reuses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()  # The counters are updated by the threads of the service and of the GUI
+
+    def key(self, symbol: str, data: pd.Series) -> str:
+        window = data if self._window is None else data.iloc[-self._window:]
+        return f'pdq_{symbol}_{fingerprint(window)}'
+
+    def get_or_search(self, symbol: Optional[str], data: pd.Series, search: Callable[[pd.Series], tuple[int, int, int]]) -> tuple[int, int, int]:
+        """
+        Gets the order of a symbol for this data.
+        If only the data changed since the last selection, the last order is reused while the new bars
+        do not drift from it, and otherwise just its neighbouring orders are checked; the full search
+        runs when there is no previous order.
+
+        Args:
+            symbol: The symbol of the data, None to always search
+            data: A normalized Pandas Series with date index and closing values.
+            search: The full order search
+
+        Returns:
+            A tuple with the (p, d, q) order.
+        """
+
+        if symbol is None:
+            self._count('misses')
+            return search(data)
+
+        key = self.key(symbol, data)
+        pdq_order = self._cache.get(key)
+        if pdq_order is not None:
+            self._count('hits')
+            return pdq_order
+
+        latest = self._cache.get(f'pdq_{symbol}_latest')
+        if isinstance(latest, tuple):  # Kept before the estimates were stored with the order
+            latest = {'order': latest, 'baseline': None}
+
+        if latest is not None and not self._drifted(data, latest):
+            self._count('reuses')
+            pdq_order = latest['order']
+            self._cache.insert_tmp({key: pdq_order, f'pdq_{symbol}_latest': latest}, self._ttl)
+            return pdq_order
+
+        if latest is not None:
+            self._count('revalidations')
+            pdq_order = self._revalidate(data, latest['order'])
+        else:
+            self._count('misses')
+            pdq_order = tuple(search(data))
+
+        latest = {'order': pdq_order, 'baseline': self._baseline(data, pdq_order) if self._drift_level is not None else None}
+        self._cache.insert_tmp({key: pdq_order, f'pdq_{symbol}_latest': latest}, self._ttl)
+        return pdq_order
+
+    def invalidate(self, symbol: str) -> None:
+        """Forgets the last order of a symbol, so the next selection runs the full search"""
+        self._cache.delete(f'pdq_{symbol}_latest')
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses, reuses, revalidations = self.hits, self.misses, self.reuses, self.revalidations
+        requests = hits + misses + reuses + revalidations
+        return {
+            'hits': hits,
+            'misses': misses,
+            'reuses': reuses,
+            'revalidations': revalidations,
+            'hit_rate': hits / requests if requests else 0.0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        self._metrics.incr(f'order_cache_{name}')
+
+    def _baseline(self, data: pd.Series, pdq_order: tuple[int, int, int]) -> Optional[dict]:
+        """The conditional sum of squares estimate of the order (BatchARIMA), the drift of the next bars is measured against it"""
+        window = data if self._window is None else data.iloc[-self._window:]
+        p, d, q = pdq_order
+        try:
+            params = BatchARIMA(pdq_order).fit(window.to_frame('series')).params.iloc[0]
+        except Exception:
+            return None
+        if not np.all(np.isfinite(params.to_numpy(dtype=np.float64))) or params['sigma2'] <= 0:
+            return None
+        return {
+            'mean': float(params['const']) if d == 0 else 0.0,
+            'ar': params[[f'ar.L{i}' for i in range(1, p + 1)]].to_numpy(dtype=np.float64),
+            'ma': params[[f'ma.L{j}' for j in range(1, q + 1)]].to_numpy(dtype=np.float64),
+            'sigma2': float(params['sigma2']),
+            'last_date': data.index[-1],
+        }
+
+    def _drifted(self, data: pd.Series, latest: dict) -> bool:
+        """Checks if the bars after the last selection are not explained by the estimate kept with the order"""
+        baseline = latest['baseline']
+        if self._drift_level is None or baseline is None:
+            return True
+
+        new_bars = int((data.index > baseline['last_date']).sum())
+        if not new_bars:  # The same dates with other values: the history was revised
+            return True
+
+        p, d, q = latest['order']
+        window = data if self._window is None else data.iloc[-self._window:]
+        W = np.diff(window.to_numpy(dtype=np.float64), n=d)[:, None] - baseline['mean']
+        if len(W) <= p + new_bars:
+            return True
+        errors = W[p:] - np.einsum('nki,ki->nk', _lags(W, p, p), baseline['ar'][None])
+        if q:
+            errors = _ma_filter(errors[:, :, None], baseline['ma'][None])[:, :, 0]
+
+        statistic = float(np.sum(errors[-new_bars:, 0] ** 2) / baseline['sigma2'])
+        return not statistic <= self._chi2_quantile(new_bars)
+
+    def _chi2_quantile(self, k: int) -> float:
+        """Quantile drift_level of the chi-square distribution with k degrees of freedom (Wilson-Hilferty)"""
+        z = NormalDist().inv_cdf(self._drift_level)
+        return k * (1 - 2 / (9 * k) + z * math.sqrt(2 / (9 * k))) ** 3
+
+    def _revalidate(self, data: pd.Series, previous_order: tuple[int, int, int]) -> tuple[int, int, int]:
+        """Searches only the orders around the previous one, keeping d, with the configured search or auto_arima"""
+        if self._revalidation_search is None:
+            return self._revalidate_auto_arima(data, previous_order)
+
+        result = self._revalidation_search.around(previous_order).run(data)
+        self._metrics.incr('candidate_orders', len(result.results))
+        return result.order
+
+    def _revalidate_auto_arima(self, data: pd.Series, previous_order: tuple[int, int, int]) -> tuple[int, int, int]:
+        """Fits the neighbouring orders one by one in this process, with the models and the intercept rule of auto_arima"""
+        import pmdarima as pm
+
+        p, d, q = previous_order
+        candidates = [(i, d, j) for i in range(max(p - 1, 0), p + 2) for j in range(max(q - 1, 0), q + 2)]
+        aics = {}
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for order in candidates:
+                try:
+                    aic = pm.ARIMA(order=order, with_intercept=d <= 1, suppress_warnings=True).fit(data).aic()
+                except Exception:
+                    continue
+                if math.isfinite(aic):
+                    aics[order] = aic
+
+        self._metrics.incr('candidate_orders', len(aics))
+        return min(aics, key=aics.get) if aics else tuple(previous_order)
@@ -0,0 +1,248 @@
+import math
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .batch_arima import BatchARIMA, _inside_unit_circle, _lags, _ols
+from .order_search import FitPool, SearchResult
+
+
+def _fit_auto_arima_aic(data: np.ndarray, order: tuple[int, int, int]) -> float:
+    """Fits a candidate as auto_arima does, with an intercept when d <= 1, and returns its AIC"""
+    import pmdarima as pm
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return pm.ARIMA(order=order, with_intercept=order[1] <= 1, suppress_warnings=True).fit(data).aic()
+
+
+class PrescreenOrderSearch:
+    """
+    A class to search the (p, d, q) order of an ARIMA model in two phases.
+    The differencing order is fixed once with a KPSS unit root test. Then every (p, q) of the grid is scored
+    with an approximate AIC from the Hannan-Rissanen regressions on the differenced series (least squares
+    on NumPy arrays, a fraction of a millisecond per candidate). Only the finalists are fitted by exact
+    maximum likelihood, as auto_arima fits them: the top_k candidates and the direct neighbours of the best
+    one whose approximate AIC is within margin of it. It has the interface of OrderSearch.
+    """
+    def __init__(
+        self,
+        p_values: Iterable[int] = range(0, 6),
+        q_values: Iterable[int] = range(0, 6),
+        d_values: Optional[Iterable[int]] = None,
+        top_k: int = 3,
+        margin: float = 2.0,
+        max_d: int = 2,
+        max_workers: int = 1,
+        fit_timeout: Optional[float] = 60,
+        trace: bool = False,
+    ) -> None:
+        """
+        Args:
+            p_values(optional): The candidate AR orders.
+            q_values(optional): The candidate MA orders.
+            d_values(optional): The candidate differencing orders, None to choose d with a KPSS test.
+            top_k(optional) default 3: Number of best approximate candidates fitted by exact maximum likelihood.
+            margin(optional) default 2.0: The neighbours (p +- 1, q +- 1) of the best approximate candidate are also fitted
+                if their approximate AIC is at most this much higher, the differences the approximation cannot resolve.
+            max_d(optional) default 2: Largest d chosen by the test.
+            max_workers(optional) default 1: Number of processes of the exact fits, 1 fits them in this process.
+            fit_timeout(optional) default 60: Seconds an exact fit may take in a process, None to wait until it ends.
+            trace(optional) default False: Prints the approximate and the exact AIC of the candidates.
+        """
+
+        if top_k < 1:
+            raise ValueError("At least one candidate must be fitted")
+
+        self._p_values = sorted(set(p_values))
+        self._q_values = sorted(set(q_values))
+        self._d_values = sorted(set(d_values)) if d_values is not None else None
+        self._top_k = top_k
+        self._margin = margin
+        self._max_d = max_d
+        self._max_workers = max_workers
+        self._fit_timeout = fit_timeout
+        self._trace = trace
+        self._pool = FitPool(max_workers) if max_workers > 1 else None
+
+    def around(self, pdq_order: tuple[int, int, int]) -> 'PrescreenOrderSearch':
+        """Returns a search with the same options and processes over the neighbouring orders of (p, d, q), keeping d"""
+        p, d, q = pdq_order
+        search = PrescreenOrderSearch(
+            p_values=range(max(p - 1, 0), p + 2),
+            q_values=range(max(q - 1, 0), q + 2),
+            d_values=[d],
+            top_k=self._top_k,
+            margin=self._margin,
+            max_d=self._max_d,
+            max_workers=self._max_workers,
+            fit_timeout=self._fit_timeout,
+            trace=self._trace,
+        )
+        search._pool = self._pool
+        return search
+
+    def search(self, data: pd.Series) -> tuple[int, int, int]:
+        """
+        Searches the order with the lowest exact AIC among the finalists
+
+        Args:
+            data: A normalized Pandas Series with date index and closing values.
+
+        Returns:
+            A tuple with the (p, d, q) order of the best model.
+        """
+
+        return self.run(data).order
+
+    def run(self, data: pd.Series) -> SearchResult:
+        """
+        Screens the grid and fits the finalists
+
+        Args:
+            data: A normalized Pandas Series with date index and closing values.
+
+        Returns:
+            The SearchResult with the order of the best model, the exact AIC of the finalists and the approximate
+            AIC of every candidate screened. The grid is never fitted in full, so no fits_avoided is counted:
+            the benchmark compares the exact fits with the ones auto_arima makes.
+        """
+
+        values = np.asarray(data, dtype=np.float64)
+        if self._d_values is not None:
+            d_values = self._d_values
+        else:
+            import pmdarima as pm
+
+            d_values = [pm.arima.ndiffs(values, test='kpss', max_d=self._max_d)]
+
+        approximate: Dict[tuple[int, int, int], float] = {}
+        finalists: List[tuple[int, int, int]] = []
+        for d in d_values:
+            scores = self._screen(np.diff(values, n=d), d)
+            approximate.update(scores)
+            finalists += [order for order in self._finalists(scores) if order not in finalists]
+
+        results = {order: aic for order, aic in zip(finalists, self._fit_exact(values, finalists)) if math.isfinite(aic)}
+        if not results:
+            raise ValueError("No ARIMA candidate could be fitted")
+        return SearchResult(min(results, key=results.get), results, approximate)
+
+    def close(self) -> None:
+        """Stops the worker processes, also those of the searches made by around()"""
+        if self._pool is not None:
+            self._pool.close()
+
+    def _grid(self, T: int) -> tuple[List[int], List[int], int, int]:
+        """
+        The AR and MA orders that the length of the differenced series supports, as auto_arima caps them at a third
+        of the length, shrunk until the Hannan-Rissanen regressions have enough observations
+
+        Returns:
+            The AR orders, the MA orders, the order of the long autoregression and the first t of the regressions.
+        """
+
+        p_values = [p for p in self._p_values if p <= T // 3] or self._p_values[:1]
+        q_values = [q for q in self._q_values if q <= T // 3] or self._q_values[:1]
+        while True:
+            P, Q = p_values[-1], q_values[-1]
+            m = BatchARIMA((0, 0, Q))._long_ar_order(T)  # 0 when no candidate has an MA term
+            start = m + max(P, Q)
+            if T - start >= 2 * (P + Q + 1) + 10 or len(p_values) == len(q_values) == 1:
+                return p_values, q_values, m, start
+            if (Q >= P and len(q_values) > 1) or len(p_values) == 1:
+                q_values.pop()
+            else:
+                p_values.pop()
+
+    def _screen(self, W: np.ndarray, d: int) -> Dict[tuple[int, int, int], float]:
+        """
+        Scores the (p, q) grid of one differencing order with the AIC of the Hannan-Rissanen regressions.
+        The long autoregression that estimates the innovations runs once, and every regression uses the
+        same sample, so the approximate AICs compare.
+        """
+
+        has_const = d == 0
+        T = len(W)
+        X = W[:, None]
+        ones = np.ones((T, 1, int(has_const)))
+        p_values, q_values, m, start = self._grid(T)
+        scores = {}
+
+        with warnings.catch_warnings(), np.errstate(all='ignore'):
+            warnings.simplefilter('ignore')
+            innovations = np.zeros_like(X)
+            if m and T - m > m:
+                long_ar = np.concatenate([ones[m:], _lags(X, m, m)], axis=2)
+                innovations[m:] = X[m:] - np.einsum('nkr,kr->nk', long_ar, _ols(long_ar, X[m:]))
+
+            for p in p_values:
+                for q in q_values:
+                    try:
+                        aic = self._approximate_aic(X, innovations, ones, (p, d, q), start)
+                    except (np.linalg.LinAlgError, ValueError):
+                        aic = math.inf
+                    scores[(p, d, q)] = aic
+                    if self._trace:
+                        print(f' ARIMA({p},{d},{q}) : approximate AIC={aic:.3f}')
+        return scores
+
+    def _approximate_aic(self, X: np.ndarray, innovations: np.ndarray, ones: np.ndarray, pdq_order: tuple[int, int, int], start: int) -> float:
+        """AIC of the Gaussian likelihood of the regression of w_t on its p lags and q lagged innovations, from t = start"""
+        p, d, q = pdq_order
+        if len(X) - start <= p + q + ones.shape[2]:
+            return math.inf
+        regressors = np.concatenate([ones[start:], _lags(X, p, start), _lags(innovations, q, start)], axis=2)
+        if regressors.shape[2]:
+            coefficients = _ols(regressors, X[start:])
+            c = ones.shape[2]
+            if not (_inside_unit_circle(coefficients[:, c:c + p])[0] and _inside_unit_circle(-coefficients[:, c + p:])[0]):
+                return math.inf  # Exact MLE would not accept it either
+            residuals = X[start:, 0] - np.einsum('nkr,kr->nk', regressors, coefficients)[:, 0]
+        else:
+            residuals = X[start:, 0]
+
+        n = len(residuals)
+        sigma2 = np.mean(residuals ** 2)
+        if not np.isfinite(sigma2) or sigma2 <= 0:
+            return math.inf
+
+        n_params = p + q + ones.shape[2] + 1
+        return float(n * np.log(2 * np.pi * sigma2) + n + 2 * n_params)
+
+    def _finalists(self, scores: Dict[tuple[int, int, int], float]) -> List[tuple[int, int, int]]:
+        """The top_k approximate candidates and the direct neighbours of the best one within margin of its approximate AIC"""
+        ranked = sorted((order for order, aic in scores.items() if math.isfinite(aic)), key=scores.get)
+        if not ranked:
+            return list(scores)[:1]
+
+        p, d, q = ranked[0]
+        neighbours = [
+            order for order in ((p - 1, d, q), (p + 1, d, q), (p, d, q - 1), (p, d, q + 1))
+            if scores.get(order, math.inf) <= scores[ranked[0]] + self._margin
+        ]
+        return list(dict.fromkeys(ranked[:self._top_k] + neighbours))
+
+    def _fit_exact(self, values: np.ndarray, orders: list) -> list:
+        """Exact maximum likelihood AIC of each order, inf if the fit fails or takes longer than fit_timeout"""
+        def fit(order):
+            try:
+                if self._pool is None:
+                    return _fit_auto_arima_aic(values, order)
+                return self._pool.fit(values, order, timeout=self._fit_timeout, fit=_fit_auto_arima_aic)
+            except Exception:
+                return math.inf
+
+        if self._pool is not None and len(orders) > 1:
+            with ThreadPoolExecutor(max_workers=min(self._max_workers, len(orders)), thread_name_prefix='order-prescreen') as threads:
+                aics = list(threads.map(fit, orders))
+        else:
+            aics = [fit(order) for order in orders]
+
+        if self._trace:
+            for order, aic in zip(orders, aics):
+                print(f' ARIMA{order} : AIC={aic:.3f}')
+        return aics
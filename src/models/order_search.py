@@ -0,0 +1,293 @@
+import os
+import math
+import threading
+import warnings
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _fit_aic(data: np.ndarray, order: tuple[int, int, int]) -> float:
+    """Fits an ARIMA model in a worker process and returns its AIC"""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return ARIMA(data, order=order).fit().aic
+
+
+def _serve_fits(connection) -> None:
+    """Loop of a worker process: runs each fit(values, order) received and sends back (True, AIC) or (False, error)"""
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fit, values, order = task
+        try:
+            connection.send((True, fit(values, order)))
+        except Exception as error:
+            connection.send((False, f"{type(error).__name__}: {error}"))
+
+
+class SearchResult:
+    """ The order chosen by one search and the AIC of the candidates it fitted """
+    __slots__ = ('order', 'results', 'approximate', 'fits_avoided')
+
+    def __init__(self, order: tuple[int, int, int], results: Dict[tuple[int, int, int], float], approximate: Optional[Dict[tuple[int, int, int], float]] = None, fits_avoided: int = 0) -> None:
+        """
+        Args:
+            order: The (p, d, q) order with the lowest AIC
+            results: The exact AIC of every candidate fitted
+            approximate(optional): The approximate AIC of the candidates screened, if the search screens them
+            fits_avoided(optional) default 0: Number of candidates not fitted by exact maximum likelihood
+        """
+
+        self.order = tuple(order)
+        self.results = results
+        self.approximate = approximate if approximate is not None else {}
+        self.fits_avoided = fits_avoided
+
+    def __repr__(self) -> str:
+        return f'SearchResult(order={self.order}, fitted={len(self.results)}, fits_avoided={self.fits_avoided})'
+
+
+class FitPool:
+    """
+    Worker processes that fit ARIMA candidates, started on first use and reused by every search that
+    shares the pool, so a search does not pay the start of the processes and the import of statsmodels.
+    A fit that exceeds its time limit has its worker killed and replaced, so it never holds a worker.
+    """
+    def __init__(self, max_workers: int) -> None:
+        """
+        Args:
+            max_workers: Number of processes, and of fits running at the same time
+        """
+
+        self.max_workers = max_workers
+        self._context = multiprocessing.get_context('spawn')  # Forking a process with running threads is unsafe
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.Lock()
+        self._idle: List[tuple] = []
+        self._workers: List[tuple] = []
+        self.killed = 0
+
+    def fit(self, values: np.ndarray, order: tuple[int, int, int], timeout: Optional[float] = None, fit: Callable[[np.ndarray, tuple[int, int, int]], float] = _fit_aic) -> float:
+        """
+        Fits one candidate on a worker
+
+        Args:
+            values: The series
+            order: The (p, d, q) order
+            timeout(optional): Seconds the fit may take from its start, None to wait until it ends
+            fit(optional) default _fit_aic: Module-level function that fits the candidate and returns its AIC
+
+        Returns:
+            The AIC.
+
+        Raises:
+            TimeoutError: The fit took longer than the timeout, its worker was killed.
+            RuntimeError: The fit failed.
+        """
+
+        with self._slots:
+            worker = self._acquire()
+            connection = worker[1]
+            try:
+                connection.send((fit, values, order))
+                finished = connection.poll(timeout)
+                if finished:
+                    succeeded, value = connection.recv()
+            except (EOFError, OSError):
+                self._kill(worker)
+                raise RuntimeError(f"The worker fitting ARIMA{order} stopped")
+
+            if not finished:
+                self._kill(worker)
+                raise TimeoutError(f"ARIMA{order} took more than {timeout} seconds")
+            with self._lock:
+                self._idle.append(worker)
+
+        if not succeeded:
+            raise RuntimeError(value)
+        return value
+
+    def close(self) -> None:
+        """Stops every worker"""
+        with self._lock:
+            workers, self._workers, self._idle = self._workers, [], []
+        for process, connection in workers:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            process.join(1)
+            if process.is_alive():
+                process.kill()
+            connection.close()
+
+    def __len__(self) -> int:
+        return len(self._workers)
+
+    def _acquire(self) -> tuple:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=_serve_fits, args=(child,), name='arima-fit', daemon=True)
+        process.start()
+        child.close()
+        worker = (process, parent)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _kill(self, worker: tuple) -> None:
+        process, connection = worker
+        process.kill()
+        process.join()
+        connection.close()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self.killed += 1
+
+
+class OrderSearch:
+    """
+    A class to search the (p, d, q) order of an ARIMA model fitting the candidates in parallel processes.
+    The processes are kept for the life of the search and shared with the searches made by around(), and
+    one instance can serve many threads at once: the results of each search are returned, not stored.
+    """
+    def __init__(
+        self,
+        p_values: Iterable[int] = range(0, 6),
+        q_values: Iterable[int] = range(0, 6),
+        d_values: Optional[Iterable[int]] = None,
+        max_workers: Optional[int] = None,
+        fit_timeout: float = 60,
+        abandon_delta: float = 10.0,
+        trace: bool = False,
+    ) -> None:
+        """
+        Args:
+            p_values(optional): The candidate AR orders.
+            q_values(optional): The candidate MA orders.
+            d_values(optional): The candidate differencing orders, None to choose d with a KPSS test.
+            max_workers(optional): Number of processes, default is the number of cores.
+            fit_timeout(optional) default 60: Seconds a single fit may take from its start before its worker is killed.
+            abandon_delta(optional) default 10.0: Candidates whose simpler neighbours are worse than the best AIC
+                by more than this value are not fitted.
+            trace(optional) default False: Prints the AIC of each fitted candidate.
+        """
+
+        self._p_values = sorted(set(p_values))
+        self._q_values = sorted(set(q_values))
+        self._d_values = sorted(set(d_values)) if d_values is not None else None
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._fit_timeout = fit_timeout
+        self._abandon_delta = abandon_delta
+        self._trace = trace
+        self._pool = FitPool(self._max_workers)
+
+    def around(self, pdq_order: tuple[int, int, int]) -> 'OrderSearch':
+        """Returns a search with the same options and processes over the neighbouring orders of (p, d, q), keeping d"""
+        p, d, q = pdq_order
+        search = OrderSearch(
+            p_values=range(max(p - 1, 0), p + 2),
+            q_values=range(max(q - 1, 0), q + 2),
+            d_values=[d],
+            max_workers=self._max_workers,
+            fit_timeout=self._fit_timeout,
+            abandon_delta=self._abandon_delta,
+            trace=self._trace,
+        )
+        search._pool = self._pool
+        return search
+
+    def search(self, data: pd.Series) -> tuple[int, int, int]:
+        """
+        Searches the order with the lowest AIC
+
+        Args:
+            data: A normalized Pandas Series with date index and closing values.
+
+        Returns:
+            A tuple with the (p, d, q) order of the best model.
+        """
+
+        return self.run(data).order
+
+    def run(self, data: pd.Series) -> SearchResult:
+        """
+        Searches the order with the lowest AIC.
+        The candidates are fitted in waves of growing complexity (p + q); a candidate is only fitted
+        if one of its simpler neighbours was close to the best AIC found so far.
+
+        Args:
+            data: A normalized Pandas Series with date index and closing values.
+
+        Returns:
+            The SearchResult with the order of the best model and the AIC of every candidate fitted.
+        """
+
+        import pmdarima as pm
+
+        values = np.asarray(data, dtype=np.float64)
+        d_values = self._d_values if self._d_values is not None else [pm.arima.ndiffs(values, test='kpss', max_d=2)]
+        results: Dict[tuple[int, int, int], float] = {}
+
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='order-search') as threads:
+            for d in d_values:
+                self._search_d(threads, values, d, results)
+
+        if not results:
+            raise ValueError("No ARIMA candidate could be fitted")
+        return SearchResult(min(results, key=results.get), results)
+
+    def close(self) -> None:
+        """Stops the worker processes, also those of the searches made by around()"""
+        self._pool.close()
+
+    def _search_d(self, threads: ThreadPoolExecutor, values: np.ndarray, d: int, results: Dict[tuple[int, int, int], float]) -> None:
+        """Fits the (p, q) grid for a differencing order, wave by wave"""
+        scores: Dict[tuple[int, int], float] = {}  # AIC by position (i, j) of (p, q) in the grid
+        n_p, n_q = len(self._p_values), len(self._q_values)
+
+        for complexity in range(n_p + n_q - 1):
+            wave = [
+                (i, complexity - i) for i in range(n_p)
+                if 0 <= complexity - i < n_q and self._is_promising(i, complexity - i, scores)
+            ]
+            if not wave:
+                break
+
+            orders = [(self._p_values[i], d, self._q_values[j]) for i, j in wave]
+            for (i, j), order, aic in zip(wave, orders, threads.map(self._fit, [values] * len(orders), orders)):
+                scores[(i, j)] = aic
+                if math.isfinite(aic):
+                    results[order] = aic
+                if self._trace:
+                    print(f' ARIMA{order} : AIC={aic:.3f}')
+
+    def _fit(self, values: np.ndarray, order: tuple[int, int, int]) -> float:
+        """The AIC of one candidate, inf if the fit fails or takes longer than fit_timeout"""
+        try:
+            return self._pool.fit(values, order, timeout=self._fit_timeout)
+        except (TimeoutError, RuntimeError) as error:
+            if self._trace:
+                print(f' ARIMA{order} : {error}')
+            return math.inf
+
+    def _is_promising(self, i: int, j: int, scores: Dict[tuple[int, int], float]) -> bool:
+        """Checks if a candidate has a simpler neighbour in the grid close to the best AIC"""
+        if not scores:
+            return True  # The simplest candidate is always fitted
+        parents = [parent for parent in ((i - 1, j), (i, j - 1)) if parent in scores]
+        best = min(scores.values())
+        return any(scores[parent] <= best + self._abandon_delta for parent in parents)
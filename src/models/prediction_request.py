@@ -0,0 +1,52 @@
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+import pandas as pd
+
+from .compact_arima import CompactARIMA
+from .forecast_result import DEFAULT_LEVELS, ForecastResult
+from .horizon import Horizon
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.arima.model import ARIMAResultsWrapper
+
+
+class PredictionRequest:
+    """
+    The state of one prediction, carried through the stages of the pipeline: the symbol, its data, the order,
+    the model and the results. Each request owns its state, so many requests can run at the same time.
+    """
+    def __init__(self, symbol: str, years: int = 2, pdq_order: Optional[tuple[int, int, int]] = None, trace: bool = False, levels: Sequence[float] = DEFAULT_LEVELS, n_paths: int = 0, seed: Optional[int] = None, frequency: Optional[str] = None, low_memory: bool = False, profile: bool = False) -> None:
+        """
+        Args:
+            symbol: The symbol of the action according to the data source.
+            years(optional) default 2: Number of years forecasted.
+            pdq_order(optional): A fixed (p, d, q) order, None to select it automatically.
+            trace(optional) default False: Shows the models evaluated by the order search.
+            levels(optional) default (0.80, 0.95): Coverage of each forecast interval.
+            n_paths(optional) default 0: Number of simulated future paths, 0 to not simulate.
+            seed(optional): Seed of the simulated paths.
+            frequency(optional): 'D', 'W' or 'M' to fit a Horizon model resampled to that frequency and forecast
+                the years at it; None fits the whole daily series and forecasts 12 periods per year.
+            low_memory(optional) default False: Keeps the model as a CompactARIMA.
+            profile(optional) default False: Profiles the pipeline with cProfile, the report is kept in profile_report.
+        """
+
+        self.symbol = symbol
+        self.years = years
+        self.pdq_order = pdq_order
+        self.trace = trace
+        self.levels = tuple(levels)
+        self.n_paths = n_paths
+        self.seed = seed
+        self.horizon = Horizon(years, frequency) if frequency is not None else None
+        self.low_memory = low_memory
+        self.profile = profile
+        self.data: Optional[pd.Series] = None
+        self.model: Optional[Union['ARIMAResultsWrapper', CompactARIMA]] = None
+        self.forecast: Optional[pd.Series] = None
+        self.forecast_result: Optional[ForecastResult] = None
+        self.performance_prediction: Optional[pd.Series] = None
+        self.profile_report: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f'PredictionRequest({self.symbol!r}, order={self.pdq_order})'
@@ -1,26 +1,60 @@
-from typing import Optional
-from statsmodels.tsa.arima.model import ARIMAResultsWrapper
+from __future__ import annotations
 
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
 import pandas as pd
-import yfinance as yf
-import pmdarima as pm
-from statsmodels.tsa.arima.model import ARIMA
 
+from .backtest import Backtester, BacktestResult
+from .batch_arima import BatchARIMA, BatchARIMAResults
 from .cache_handler import CacheHandler
+from .compact_arima import CompactARIMA
+from .data_source import DataSource, RateLimiter, YahooDataSource
+from .forecast_result import DEFAULT_LEVELS, ForecastResult
+from .forecast_store import ForecastStore
+from .history_store import HistoryStore
+from .horizon import Horizon
+from .metrics import Metrics
+from .model_store import ModelStore
+from .order_cache import OrderCache
+from .order_search import OrderSearch
+from .prediction_request import PredictionRequest
+from .price_panel import PricePanel, build_panel
+from .refit_policy import EXTEND, REFIT, RESELECT, RefitPolicy
+from .watchlist import Watchlist
+
+# pmdarima and statsmodels take seconds to import, so they are imported where they are first used
+if TYPE_CHECKING:
+    from statsmodels.tsa.arima.model import ARIMAResultsWrapper
 
 
 class Predictor:
     """ A class to predict future closure values ​​of an action with ARIMA. """
-    def __init__(self) -> None:
-        self._cache = CacheHandler()
-        self._data_on_process = None
-        self._arima_model = None
+    def __init__(self, data_source: Optional[DataSource] = None, order_search: Optional[OrderSearch] = None) -> None:
+        """
+        Args:
+            data_source(optional): Where the data is downloaded from, default is Yahoo Finance.
+            order_search(optional): Searches the ARIMA order, e.g. an OrderSearch or a PrescreenOrderSearch, default is pmdarima's auto_arima.
+        """
 
-        self.download_stock_closing_data = self._cache.memoize(expire=3600)(self.download_stock_closing_data)
+        self.metrics = Metrics()
+        self._cache = CacheHandler(metrics=self.metrics)
+        self._on_process = threading.local()  # The symbol, data and model of the calls of each thread
+        self._order_search = order_search
+        self._data_source = data_source if data_source is not None else YahooDataSource()
+        self._history = HistoryStore(cache=self._cache, downloader=self._data_source.download, refresh_interval=self._cache.ttl('history'))
+        self._models = ModelStore(cache=self._cache, ttl=self._cache.ttl('models'))
+        self._orders = OrderCache(cache=self._cache, ttl=self._cache.ttl('orders'), revalidation_search=order_search, metrics=self.metrics)
+        self.watchlist = Watchlist(cache=self._cache)
+        self.precomputed = ForecastStore(cache=self._cache, ttl=self._cache.ttl('precomputed'))
 
     def download_stock_closing_data(self, symbol) -> Optional[pd.Series]:
         """
-        Downloads and preprocess the data of an action
+        Downloads and preprocess the data of an action.
+        The history already downloaded is kept, so only the new bars are requested.
 
         Args:
             symbol: The symbol of action according to Yahoo Finance for download.
@@ -30,17 +64,106 @@ class Predictor:
             If an error occurs, returns none
         """
 
+        self._on_process.symbol = symbol
+        self._on_process.data = self._load_closing_data(symbol)
+        return self._on_process.data
+
+    def load_closing_data(self, symbol: str) -> Optional[pd.Series]:
+        """
+        Loads the preprocessed closing data of an action from the cache, downloading only the new bars.
+        Unlike download_stock_closing_data, it does not set the symbol in process, so any thread or worker can call it.
+
+        Args:
+            symbol: The symbol of the action according to the data source.
+
+        Returns:
+            A preprocessed Pandas Series, or None if an error occurs.
+        """
+
+        return self._load_closing_data(symbol)
+
+    def download_many(self, symbols: List[str], max_workers: int = 4, batch_size: int = 50, calls_per_second: Optional[float] = None, as_frame: bool = False) -> Union[Dict[str, pd.Series], pd.DataFrame]:
+        """
+        Downloads and preprocess the data of several actions concurrently.
+        Repeated symbols are downloaded once, and symbols with fresh data in the cache are not downloaded.
+
+        Args:
+            symbols: The symbols of the actions according to the data source.
+            max_workers(optional) default 4: Number of downloads running at the same time.
+            batch_size(optional) default 50: Number of symbols submitted to the workers at a time.
+            calls_per_second(optional): Maximum downloads started per second, None for no limit.
+            as_frame(optional) default False: Returns a wide DataFrame (dates x symbols) instead of a dict.
+
+        Returns:
+            A dict of preprocessed Pandas Series by symbol, or a Pandas DataFrame if as_frame is True.
+            Symbols that fail are left out.
+        """
+
+        rate_limiter = RateLimiter(calls_per_second)
+
+        def load(symbol: str) -> Optional[pd.Series]:
+            return self._load_closing_data(symbol, before_download=rate_limiter.wait)
+
+        close_prices = self._load_many(symbols, load, max_workers, batch_size)
+        if as_frame:
+            return pd.DataFrame(close_prices)
+        return close_prices
+
+    def download_panel(self, symbols: List[str], max_workers: int = 4, batch_size: int = 50, calls_per_second: Optional[float] = None, calendar: Union[str, pd.DatetimeIndex] = 'observed') -> PricePanel:
+        """
+        Downloads the history of several actions concurrently and aligns it in a PricePanel.
+        Unlike download_many, the exchange holidays are not padded as business days and the
+        missing values are not forward filled: they are NaN and marked in the mask of the panel.
+
+        Args:
+            symbols: The symbols of the actions according to the data source.
+            max_workers(optional) default 4: Number of downloads running at the same time.
+            batch_size(optional) default 50: Number of symbols submitted to the workers at a time.
+            calls_per_second(optional): Maximum downloads started per second, None for no limit.
+            calendar(optional) default 'observed': The dates of the panel, see build_panel.
+
+        Returns:
+            A PricePanel (dates x symbols). Symbols that fail are left out.
+        """
+
+        rate_limiter = RateLimiter(calls_per_second)
+
+        def load(symbol: str) -> Optional[pd.DataFrame]:
+            return self._load_history(symbol, before_download=rate_limiter.wait)
+
+        histories = self._load_many(symbols, load, max_workers, batch_size)
+        with self.metrics.span('preprocess'):
+            return build_panel(histories, calendar=calendar)
+
+    def _load_many(self, symbols: List[str], load: Callable[[str], object], max_workers: int, batch_size: int) -> dict:
+        """Loads each symbol once on a pool of threads, leaving out the ones that return None"""
+        unique_symbols = list(dict.fromkeys(symbols))
+        loaded = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i in range(0, len(unique_symbols), batch_size):
+                batch = unique_symbols[i:i + batch_size]
+                for symbol, data in zip(batch, executor.map(load, batch)):
+                    if data is not None:
+                        loaded[symbol] = data
+        return loaded
+
+    def _load_history(self, symbol: str, before_download: Optional[Callable[[], None]] = None) -> Optional[pd.DataFrame]:
+        """Loads the raw closing history of an action, downloading only if it is not fresh; None if an error occurs"""
         try:
-            cache = self._cache
-            cache.insert_tmp({'symbol_on_process': symbol}, 3600)
-            
-            data = yf.download(symbol)
-            if data.empty:
+            if not self._history.is_stale(symbol):
+                history = self._history.load(symbol)
+                if history is not None:
+                    self.metrics.incr('data_cache_hits')
+                    return history
+            self.metrics.incr('data_cache_misses')
+
+            if before_download is not None:
+                before_download()
+            with self.metrics.span('download'):
+                history = self._history.refresh(symbol)
+            if history is None or history.empty:
                 raise ValueError(f"No data found for symbol: {symbol}")
-            
-            close_prices = self._preprocess_data(data)
-            cache.insert_tmp({f'{symbol}_close_prices': close_prices}, 3600)
-            return close_prices  
+            return history
 
         except ValueError as ve:
             print(f"Validation error: {ve}")
@@ -50,18 +173,51 @@ class Predictor:
             print(f"Error fetching data for {symbol}: {error}")
             return None
 
-    def _preprocess_data(self, data: pd.Series) -> pd.Series:
+    def _load_closing_data(self, symbol: str, before_download: Optional[Callable[[], None]] = None) -> Optional[pd.Series]:
+        """
+        Loads the preprocessed closing data of an action, downloading it only if the cache is not fresh.
+
+        Args:
+            symbol: The symbol of action according to the data source.
+            before_download(optional): Called before a download is made, used to limit the rate.
+
+        Returns:
+            A preprocessed Pandas Series, or None if an error occurs.
+        """
+
+        cache = self._cache
+        if not self._history.is_stale(symbol):
+            close_prices = cache.get_series(f'{symbol}_close_prices')
+            if close_prices is not None:
+                self.metrics.incr('data_cache_hits')
+                return close_prices
+
+        data = self._load_history(symbol, before_download=before_download)
+        if data is None:
+            return None
+
+        try:
+            with self.metrics.span('preprocess'):
+                close_prices = self._preprocess_data(data, symbol=symbol)
+        except ValueError as ve:
+            print(f"Validation error: {ve}")
+            return None
+        cache.insert_series({f'{symbol}_close_prices': close_prices}, cache.ttl('close_prices'))
+        return close_prices
+
+    def _preprocess_data(self, data: pd.Series, symbol: Optional[str] = None) -> pd.Series:
         """
         Preprocess the data obtained in the download.
         
         Args:
             data: A Pandas Series with all data action data
+            symbol(optional): The symbol of the data, default is the symbol on process
 
         Returns:
             A preprocessed Pandas Series with stock closing dates.
         """
 
-        symbol_on_process = self._cache.get(keys='symbol_on_process')
+        symbol_on_process = symbol if symbol is not None else self.get_symbol_on_process()
         
         if 'Close' not in data.columns:
             raise ValueError(f"No 'Close' column found in data for {symbol_on_process}")
@@ -73,36 +229,46 @@ class Predictor:
         
         return close_prices
 
-    def autofit_ARIMA(self, data: pd.Series) -> tuple[int, int, int]:
+    def autofit_ARIMA(self, data: pd.Series, symbol: Optional[str] = None, trace: bool = True) -> tuple[int, int, int]:
         """
         Auto configura os parâmetros (p, q, d) do modelo ARIMA com força bruta.
 
         Args:
             data: Um Pandas Series normelizado com index de datas e valores de fechamento.
+            symbol(opcional): O símbolo dos dados, o padrão é o símbolo em processamento.
+            trace(opcional) padrão True: Mostra os modelos avaliados pelo auto_arima e o modelo selecionado.
 
         Returns:
             Uma tupla contendo três valores inteiros, são os parâmentros (p, q, d).
         """
 
-        pdq_key_in_cache = self._cache.get(f'pdq_{self.get_symbol_on_process()}')
-        
-        if not pdq_key_in_cache:
-            auto_model = pm.auto_arima(  
-                data, 
-                start_p=1, 
-                start_d=1, 
-                start_q=1, 
-                trace=True
-            )
-            p, d, q = auto_model.order
-            pqd_order = (p, d, q)
-            self._cache.insert_tmp({pdq_key_in_cache: pqd_order}, 3600) 
-            return pqd_order
-
-        pdq_order = pdq_key_in_cache
-        print(f'\nARIMA model selected: ARIMA{pdq_order}')
+        symbol = symbol if symbol is not None else self.get_symbol_on_process()
+        with self.metrics.span('order_search'):
+            pdq_order = self._orders.get_or_search(symbol, data, search=lambda data: self._search_order(data, trace=trace))
+        if trace:
+            print(f'\nARIMA model selected: ARIMA{pdq_order}')
         return pdq_order
 
+    def _search_order(self, data: pd.Series, trace: bool = True) -> tuple[int, int, int]:
+        """Runs the full order search, with the OrderSearch if there is one or with auto_arima"""
+        if self._order_search is not None:
+            result = self._order_search.run(data)
+            self.metrics.incr('candidate_orders', len(result.results))
+            self.metrics.incr('fits_avoided', result.fits_avoided)
+            return result.order
+
+        import pmdarima as pm
+
+        auto_model = pm.auto_arima(  
+            data, 
+            start_p=1, 
+            start_d=1, 
+            start_q=1, 
+            trace=trace
+        )
+        p, d, q = auto_model.order
+        return (p, d, q)
+
     def autocreate_ARIMA_model(self, data: pd.Series) -> ARIMAResultsWrapper:
         """
         Automatically creates and configures an ARIMA model based on the provided data.
@@ -115,24 +281,120 @@ class Predictor:
         """
 
         pdq_order = self.autofit_ARIMA(data=data)
-        self._arima_model = self.create_ARIMA_model(data=data, pdq_order=pdq_order)
-        return self._arima_model
+        return self.create_ARIMA_model(data=data, pdq_order=pdq_order)
 
-    def create_ARIMA_model(self, data: pd.Series, pdq_order: tuple[int, int, int]):
+    def create_ARIMA_model(self, data: pd.Series, pdq_order: tuple[int, int, int], symbol: Optional[str] = None, low_memory: bool = False):
         """
         Creates an ARIMA model with the parameters (p, q, d) set manually.
+        The fitted model is persisted in the cache; if the same symbol, order and data were
+        already fitted, the persisted parameters are reused without a new estimation.
 
         Args:
             data: A normalized Pandas Series with date index and closing values.
             pqd_order: A tuple composed of three integer values, corresponding to (p, q, d).
+            symbol(optional): The symbol of the data, default is the symbol on process.
+            low_memory(optional) default False: Returns a CompactARIMA, which keeps only what the forecasts need.
 
         Returns:
             A manually configured ARIMA model for the given data.
                 """
 
-        self._arima_model = ARIMA(data, order=pdq_order)
-        self._arima_model = self._arima_model.fit()
-        return self._arima_model
+        symbol = symbol if symbol is not None else self.get_symbol_on_process()
+        record = self._models.load(symbol, pdq_order, data) if symbol else None
+
+        if record is not None:
+            with self.metrics.span('restore'):
+                model = self._models.restore(data, record)
+            self.metrics.incr('model_cache_hits')
+            self._models.set_latest(record)
+            return self._keep_model(model, low_memory)
+
+        from statsmodels.tsa.arima.model import ARIMA
+
+        with self.metrics.span('fit'):
+            model = ARIMA(data, order=pdq_order).fit()
+        self.metrics.incr('fits')
+        if symbol:
+            self._models.save(symbol, data, model)
+        return self._keep_model(model, low_memory)
+
+    def create_batch_ARIMA_models(self, data: Union[pd.DataFrame, PricePanel], pdq_order: tuple[int, int, int]) -> BatchARIMAResults:
+        """
+        Creates the ARIMA models of many symbols with the same order at once, much faster than one by one.
+        Aligned series are estimated together by conditional sum of squares; the others are fitted one by one.
+
+        Args:
+            data: A Pandas DataFrame with date index and one column of closing values per symbol,
+                e.g. download_many(symbols, as_frame=True), or a PricePanel from download_panel.
+            pdq_order: A tuple composed of three integer values, corresponding to (p, d, q).
+
+        Returns:
+            A BatchARIMAResults with the parameters of every symbol, ready to forecast.
+        """
+
+        with self.metrics.span('batch_fit'):
+            results = BatchARIMA(pdq_order).fit(data)
+        self.metrics.incr('batch_fits', len(results.symbols) - len(results.fallback))
+        self.metrics.incr('fits', len(results.fallback))
+        return results
+
+    def update_ARIMA_model(self, data: pd.Series, symbol: Optional[str] = None, policy: Optional[RefitPolicy] = None, low_memory: bool = False) -> Union[ARIMAResultsWrapper, CompactARIMA]:
+        """
+        Updates the last model of a symbol with the new bars of the data instead of fitting it from scratch.
+        The previous parameters are applied on the new bars; the policy decides when they must be
+        estimated again (starting from the previous ones) or when a new order must be selected.
+
+        Args:
+            data: A normalized Pandas Series with date index and closing values, including the new bars.
+            symbol(optional): The symbol of the data, default is the symbol on process.
+            policy(optional): The RefitPolicy, default is RefitPolicy().
+            low_memory(optional) default False: Returns a CompactARIMA, which keeps only what the forecasts need.
+
+        Returns:
+            An ARIMA model updated for the given data.
+        """
+
+        from statsmodels.tsa.arima.model import ARIMA
+
+        symbol = symbol if symbol is not None else self.get_symbol_on_process()
+        policy = policy if policy is not None else RefitPolicy()
+        record = self._models.load_latest(symbol)
+
+        if record is None:
+            pdq_order = self.autofit_ARIMA(data=data, symbol=symbol)
+            return self.create_ARIMA_model(data=data, pdq_order=pdq_order, symbol=symbol, low_memory=low_memory)
+
+        if not self._models.is_prefix(data, record):  # The history was revised, the parameters are estimated again
+            return self.create_ARIMA_model(data=data, pdq_order=record['order'], symbol=symbol, low_memory=low_memory)
+
+        n_new = len(data) - record['nobs']
+        with self.metrics.span('restore'):
+            extended_model = self._models.restore(data, record)
+        decision = policy.decide(record, extended_model, n_new) if n_new else EXTEND
+
+        if decision == RESELECT:
+            self._orders.invalidate(symbol)
+            pdq_order = self.autofit_ARIMA(data=data, symbol=symbol)
+            with self.metrics.span('fit'):
+                model = ARIMA(data, order=pdq_order).fit()
+            self.metrics.incr('fits')
+            self._models.save(symbol, data, model, order_nobs=len(data))
+        elif decision == REFIT:
+            with self.metrics.span('fit'):
+                model = ARIMA(data, order=record['order']).fit(start_params=record['params'])
+            self.metrics.incr('fits')
+            self._models.save(symbol, data, model)
+        else:
+            model = extended_model
+            self._models.save(symbol, data, model, fitted_nobs=record['fitted_nobs'])
+        return self._keep_model(model, low_memory)
+
+    def _keep_model(self, model: ARIMAResultsWrapper, low_memory: bool) -> Union[ARIMAResultsWrapper, CompactARIMA]:
+        """The model returned and kept as the last one of the calling thread"""
+        if low_memory:
+            model = CompactARIMA.from_results(model)
+        self._on_process.model = model
+        return model
 
     def automake_forecast(self, data: pd.Series, years = 2) -> pd.Series:
         """
@@ -148,7 +410,8 @@ class Predictor:
 
         model = self.autocreate_ARIMA_model(data)  
         forecast_months = 12 * years  
-        forecast = model.forecast(steps=forecast_months)  
+        with self.metrics.span('forecast'):
+            forecast = model.forecast(steps=forecast_months)  
         print(f"\nPrevisões para os próximos {forecast_months} períodos:")
         print(forecast)
         return forecast
@@ -163,44 +426,208 @@ class Predictor:
 
         Returns:
             A Pandas Series containing all closing values ​​predicted by the ARIMA model.
+            The 12 * years steps are periods of the data, business days for daily data:
+            make_horizon_forecast forecasts a horizon in years at a chosen frequency.
         """
 
         forecast_months = 12 * years  
-        forecast = model.forecast(steps=forecast_months)  
+        with self.metrics.span('forecast'):
+            forecast = model.forecast(steps=forecast_months)  
         print(f"\nPrevisões para os próximos {forecast_months} períodos:")
         print(forecast)
         return forecast
 
-    def make_performance_prediction(self, model: ARIMAResultsWrapper, data: pd.Series) -> pd.Series:
+    def make_horizon_forecast(self, data: pd.Series, years: float = 2, frequency: str = 'M', symbol: Optional[str] = None, pdq_order: Optional[tuple[int, int, int]] = None) -> pd.Series:
+        """
+        Performs a forecast of a horizon in years at a daily, weekly or monthly frequency.
+        The data is resampled to the frequency and only its recent periods are fitted, so a forecast
+        years ahead fits a few hundred monthly points instead of the whole daily history.
+
+        Args:
+            data: A normalized Pandas Series with indexed dates and daily closing values.
+            years(optional) default 2: The horizon, in years.
+            frequency(optional) default 'M': 'D' for business days, 'W' for weeks or 'M' for months.
+            symbol(optional): The symbol of the data, default is the symbol on process.
+            pdq_order(optional): The (p, d, q) order, default is selected automatically for the resampled data.
+
+        Returns:
+            A Pandas Series with the closing values predicted for every period of the horizon, dated at the frequency.
+        """
+
+        horizon = Horizon(years, frequency)
+        symbol = horizon.cache_symbol(symbol if symbol is not None else self.get_symbol_on_process())
+        resampled = horizon.prepare(data)
+        if pdq_order is None:
+            pdq_order = self.autofit_ARIMA(data=resampled, symbol=symbol)
+        model = self.create_ARIMA_model(data=resampled, pdq_order=pdq_order, symbol=symbol)
+
+        with self.metrics.span('forecast'):
+            forecast = model.forecast(steps=horizon.steps)
+        print(f"\nPrevisões para os próximos {horizon.steps} períodos ({frequency}):")
+        print(forecast)
+        return forecast
+
+    def make_forecast_distribution(self, model: Union[ARIMAResultsWrapper, CompactARIMA], years: int = 2, levels: Sequence[float] = DEFAULT_LEVELS, n_paths: int = 0, seed: Optional[int] = None, symbol: Optional[str] = None, steps: Optional[int] = None) -> ForecastResult:
+        """
+        Performs a forecast with intervals at many levels and, optionally, simulated future paths.
+        Everything comes from the last state of the model in one pass, without refitting, and the
+        result is cached: the same model, data and options return it without projecting or simulating again.
+
+        Args:
+            model: An ARIMA model preconfigured for the data, or a CompactARIMA.
+            years(optional) default 2: An integer indicating the number of years in the future.
+            levels(optional) default (0.80, 0.95): Coverage of each interval.
+            n_paths(optional) default 0: Number of simulated paths, 0 to not simulate.
+            seed(optional): Seed of the simulation, for reproducible paths.
+            symbol(optional): The symbol of the data, default is the symbol on process; without one nothing is cached.
+            steps(optional): Number of periods forecasted, default is 12 per year.
+
+        Returns:
+            A ForecastResult with the point forecast, the intervals and the paths.
+        """
+
+        steps = steps if steps is not None else 12 * years
+        symbol = symbol if symbol is not None else self.get_symbol_on_process()
+        compact = model if isinstance(model, CompactARIMA) else CompactARIMA.from_results(model)
+        key = self._forecast_key(symbol, compact, steps, levels, n_paths, seed) if symbol else None
+        if key is not None:
+            result = self._cache.get(key)
+            if result is not None:
+                self.metrics.incr('forecast_cache_hits')
+                return result
+
+        with self.metrics.span('forecast'):
+            result = compact.get_forecast(steps, levels=levels, n_paths=n_paths, seed=seed)
+        if key is not None:
+            self._cache.insert_tmp({key: result}, self._cache.ttl('forecasts'))
+        return result
+
+    @staticmethod
+    def _forecast_key(symbol: str, model: CompactARIMA, steps: int, levels: Sequence[float], n_paths: int, seed: Optional[int]) -> str:
+        """The forecast depends only on the parameters and the last state of the model, and on the options"""
+        digest = hashlib.blake2b(digest_size=8)
+        for array in (model.params, model.state, model.state_cov):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        digest.update(repr((model.order, model.nobs, str(model.last_date), steps, tuple(levels), n_paths, seed)).encode())
+        return f'forecast_{symbol}_{digest.hexdigest()}'
+
+    def make_performance_prediction(self, model: Union[ARIMAResultsWrapper, CompactARIMA], data: pd.Series) -> pd.Series:
         """
         Performs a prediction for all index dates in the data, returning values ​​predicted by the model.
         Helps to evaluate the quality of the model.
 
         Args:
-            model: An ARIMA model preconfigured for the data you want to evaluate
+            model: An ARIMA model preconfigured for the data you want to evaluate; a CompactARIMA is filtered again on the data
             data: A normalized Pandas Series with index dates and closing values.
 
         Returns:
             Returns a Pandas Series containing all closing values ​​predicted by the model, with real date indexes.
         """
 
+        if isinstance(model, CompactARIMA):
+            model = model.expand(data)
         prediction_steps = len(data)
-        performance_prediction = model.predict(start=0, end=prediction_steps - 1)
+        with self.metrics.span('prediction'):
+            performance_prediction = model.predict(start=0, end=prediction_steps - 1)
         return performance_prediction
     
+    def make_backtest(self, data: pd.Series, pdq_order: Optional[tuple[int, int, int]] = None, n_origins: int = 100, symbol: Optional[str] = None, **options) -> BacktestResult:
+        """
+        Evaluates the out-of-sample accuracy of the model with walk-forward forecasts from many cut-off dates.
+
+        Args:
+            data: A normalized Pandas Series with index dates and closing values.
+            pdq_order(optional): The (p, d, q) order, default is the automatically selected order.
+            n_origins(optional) default 100: Number of cut-off dates.
+            symbol(optional): The symbol of the data, default is the symbol on process.
+            options: Other Backtester options (horizon, window, window_size, refit_every, alpha, max_workers).
+
+        Returns:
+            A BacktestResult with the forecasts and the MAE, RMSE, MAPE and interval coverage of each origin.
+        """
+
+        if pdq_order is None:
+            pdq_order = self.autofit_ARIMA(data=data, symbol=symbol)
+        with self.metrics.span('backtest'):
+            return Backtester(pdq_order, **options).run(data, n_origins=n_origins)
+
+    def predict(self, request: Union[str, PredictionRequest], report: Optional[Callable[[str], None]] = None) -> PredictionRequest:
+        """
+        Runs the whole pipeline for one symbol: download, order selection, fit, forecast and in-sample prediction.
+        The state of every stage is kept in the request, never in the Predictor or in the cache,
+        so many symbols can be predicted at the same time by threads or processes.
+
+        Args:
+            request: A PredictionRequest, or the symbol of the action.
+            report(optional): Called with the name of each stage before it starts
+                ('download', 'order', 'fit', 'forecast' and 'prediction').
+
+        Returns:
+            The request with its data (resampled when it has a horizon), order, model, forecast (with its intervals and paths in forecast_result)
+            and performance prediction, and with the profile of the pipeline in profile_report if the request is profiled.
+        """
+
+        request = request if isinstance(request, PredictionRequest) else PredictionRequest(request)
+        report = report if report is not None else (lambda stage: None)
+
+        profile = None
+        try:
+            with self.metrics.profile(enabled=request.profile) as profile:
+                return self._run_pipeline(request, report)
+        finally:  # The report is written when the profiled block ends, also when a stage fails
+            if request.profile and profile is not None:
+                request.profile_report = profile.text
+
+    def _run_pipeline(self, request: PredictionRequest, report: Callable[[str], None]) -> PredictionRequest:
+        """The stages of predict(), run in the calling thread"""
+        report('download')
+        request.data = self._load_closing_data(request.symbol)
+        if request.data is None:
+            raise ValueError(f"No data found for symbol: {request.symbol}")
+
+        symbol, steps = request.symbol, None
+        if request.horizon is not None:
+            request.data = request.horizon.prepare(request.data)
+            symbol, steps = request.horizon.cache_symbol(symbol), request.horizon.steps
+
+        report('order')
+        if request.pdq_order is None:
+            request.pdq_order = self.autofit_ARIMA(data=request.data, symbol=symbol, trace=request.trace)
+        report('fit')
+        request.model = self.create_ARIMA_model(data=request.data, pdq_order=request.pdq_order, symbol=symbol, low_memory=request.low_memory)
+        report('forecast')
+        request.forecast_result = self.make_forecast_distribution(
+            model=request.model,
+            years=request.years,
+            levels=request.levels,
+            n_paths=request.n_paths,
+            seed=request.seed,
+            symbol=symbol,
+            steps=steps,
+        )
+        request.forecast = request.forecast_result.point
+        report('prediction')
+        request.performance_prediction = self.make_performance_prediction(model=request.model, data=request.data)
+        return request
+
     def clear_cache(self) -> None:
         return self._cache.clear()
     
     # GETs:
-    def get_symbol_on_process(self) -> str:
-        return self._cache.get('symbol_on_process')
+    def get_symbol_on_process(self) -> Optional[str]:
+        """The last symbol downloaded by download_stock_closing_data in the calling thread"""
+        return getattr(self._on_process, 'symbol', None)
     
-    def get_arima_model(self) -> ARIMAResultsWrapper:
-        return self._arima_model
+    def get_order_cache_stats(self) -> dict:
+        return self._orders.stats()
+
+    def get_cache_stats(self) -> dict:
+        return self._cache.stats()
+
+    def get_arima_model(self) -> Optional[ARIMAResultsWrapper]:
+        """The last model created in the calling thread"""
+        return getattr(self._on_process, 'model', None)
     
     def get_data_on_process(self) -> Optional[pd.Series]:
-        symbol = self.get_symbol_on_process()
-        if symbol:
-            return self._cache.get(f'{self.get_symbol_on_process()}_close_prices')
-        return None
+        return getattr(self._on_process, 'data', None)
 
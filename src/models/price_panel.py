@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """
+    The closing values of many symbols aligned on one calendar, as a (dates x symbols) float64 array.
+    The array is in Fortran order, so the column of a symbol is contiguous, and the dates a symbol was not
+    observed are NaN with a False in the mask, never filled silently.
+    """
+    def __init__(self, dates: pd.DatetimeIndex, symbols: Sequence[str], values: np.ndarray, mask: Optional[np.ndarray] = None) -> None:
+        """
+        Args:
+            dates: The calendar, sorted
+            symbols: The symbol of each column
+            values: (dates, symbols) closing values
+            mask(optional): (dates, symbols) True where the value was observed, default is where it is not NaN
+        """
+
+        self.dates = dates
+        self.symbols = list(symbols)
+        self.values = np.asfortranarray(values, dtype=np.float64)
+        self.mask = np.asfortranarray(mask) if mask is not None else ~np.isnan(self.values)
+        self._columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    def column(self, symbol: str) -> np.ndarray:
+        """The values of a symbol on every date of the calendar, a view without a copy"""
+        return self.values[:, self._columns[symbol]]
+
+    def span(self, symbol: str) -> Optional[tuple[int, int]]:
+        """Positions of the first and the last observed dates of a symbol, None if it has none"""
+        observed = np.flatnonzero(self.mask[:, self._columns[symbol]])
+        if not len(observed):
+            return None
+        return int(observed[0]), int(observed[-1])
+
+    def series(self, symbol: str) -> pd.Series:
+        """The observed values of a symbol, without the dates it was not observed"""
+        i = self._columns[symbol]
+        observed = self.mask[:, i]
+        return pd.Series(self.values[observed, i], index=self.dates[observed], name=symbol)
+
+    def filled(self) -> np.ndarray:
+        """
+        The values with each gap forward filled from the last observation, all the columns at once.
+        Before the first and after the last observation of a symbol the values stay NaN.
+        """
+
+        rows = np.arange(len(self.dates))[:, None]
+        last_observed = np.maximum.accumulate(np.where(self.mask, rows, -1), axis=0)
+        filled = np.take_along_axis(self.values, np.maximum(last_observed, 0), axis=0)
+        after_last = np.flip(np.logical_or.accumulate(np.flip(self.mask, axis=0), axis=0), axis=0)
+        filled[(last_observed < 0) | ~after_last] = np.nan
+        return np.asfortranarray(filled)
+
+    def to_frame(self, fill: bool = False) -> pd.DataFrame:
+        """
+        Args:
+            fill(optional) default False: Forward fills the gaps inside the span of each symbol
+
+        Returns:
+            A Pandas DataFrame with the dates as index and one column per symbol.
+        """
+
+        return pd.DataFrame(self.filled() if fill else self.values, index=self.dates, columns=self.symbols, copy=False)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._columns
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __repr__(self) -> str:
+        return f'PricePanel(dates={len(self.dates)}, symbols={len(self.symbols)}, observed={self.mask.mean():.1%})'
+
+
+def build_panel(histories: Dict[str, Union[pd.DataFrame, pd.Series]], calendar: Union[str, pd.DatetimeIndex] = 'observed', column: str = 'Close') -> PricePanel:
+    """
+    Aligns the downloaded histories of many symbols in one pass over all their values together.
+
+    Args:
+        histories: The history of each symbol, a DataFrame with the column or a Series of closing values
+        calendar(optional) default 'observed': The dates of the panel. 'observed' uses every date on which at
+            least one symbol traded, so the exchange holidays are left out instead of padded as business
+            days; a Pandas frequency such as 'B' uses a regular range, and a DatetimeIndex is used as is.
+        column(optional) default 'Close': The column taken from the DataFrames
+
+    Returns:
+        The PricePanel. Symbols without values are left out; on a duplicated date the last value is kept.
+    """
+
+    symbols: List[str] = []
+    dates, values = [], []
+    for symbol, history in histories.items():
+        if history is None or len(history) == 0:
+            continue
+        close = history[column] if isinstance(history, pd.DataFrame) else history
+        symbols.append(symbol)
+        dates.append(_nanoseconds(close.index))
+        values.append(close.to_numpy(dtype=np.float64))
+
+    if not symbols or not np.any(~np.isnan(np.concatenate(values))):
+        return PricePanel(pd.DatetimeIndex([]), [], np.empty((0, 0)))  # Nothing observed, whatever the calendar
+
+    lengths = [len(d) for d in dates]
+    dates = np.concatenate(dates)
+    values = np.concatenate(values)
+    symbol_codes = np.repeat(np.arange(len(symbols)), lengths)
+
+    observed = ~np.isnan(values)
+    dates, values, symbol_codes = dates[observed], values[observed], symbol_codes[observed]
+
+    if isinstance(calendar, str) and calendar == 'observed':
+        calendar_dates, date_codes = np.unique(dates, return_inverse=True)
+    else:
+        if isinstance(calendar, str):
+            calendar = pd.date_range(pd.Timestamp(dates.min()), pd.Timestamp(dates.max()), freq=calendar)
+        calendar_dates = _nanoseconds(calendar)
+        date_codes = np.searchsorted(calendar_dates, dates)
+        on_calendar = (date_codes < len(calendar_dates)) & (calendar_dates[np.minimum(date_codes, len(calendar_dates) - 1)] == dates)
+        date_codes, values, symbol_codes = date_codes[on_calendar], values[on_calendar], symbol_codes[on_calendar]
+
+    # The last occurrence of each (symbol, date) wins
+    cells = symbol_codes * len(calendar_dates) + date_codes
+    _, last = np.unique(cells[::-1], return_index=True)
+    keep = len(cells) - 1 - last
+
+    panel = np.full((len(calendar_dates), len(symbols)), np.nan, order='F')
+    panel[date_codes[keep], symbol_codes[keep]] = values[keep]
+    return PricePanel(pd.DatetimeIndex(calendar_dates.astype('datetime64[ns]')), symbols, panel)
+
+
+def _nanoseconds(index: pd.Index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ns').asi8
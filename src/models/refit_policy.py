@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.arima.model import ARIMAResultsWrapper
+
+EXTEND = 'extend'
+REFIT = 'refit'
+RESELECT = 'reselect'
+
+
+class RefitPolicy:
+    """ Decides what a model needs when new bars arrive: only extend its state, estimate again or select a new order """
+    def __init__(self, refit_every: int = 20, reselect_every: int = 250, error_threshold: float = 2.0) -> None:
+        """
+        Args:
+            refit_every(optional) default 20: New bars since the last estimation that require a new estimation.
+            reselect_every(optional) default 250: New bars since the order selection that require a new selection.
+            error_threshold(optional) default 2.0: Mean absolute standardized one-step error of the new bars
+                above which the parameters are estimated again.
+        """
+
+        self.refit_every = refit_every
+        self.reselect_every = reselect_every
+        self.error_threshold = error_threshold
+
+    def decide(self, record: dict, extended_model: ARIMAResultsWrapper, n_new: int) -> str:
+        """
+        Args:
+            record: The persisted record of the previous model
+            extended_model: The previous model applied on the data with the new bars
+            n_new: Number of new bars
+
+        Returns:
+            EXTEND, REFIT or RESELECT.
+        """
+
+        nobs = record['nobs'] + n_new
+        if nobs - record['order_nobs'] >= self.reselect_every:
+            return RESELECT
+        if nobs - record['fitted_nobs'] >= self.refit_every:
+            return REFIT
+
+        errors = extended_model.standardized_forecasts_error[0, -n_new:]
+        if np.nanmean(np.abs(errors)) > self.error_threshold:
+            return REFIT
+        return EXTEND
@@ -0,0 +1,145 @@
+import os
+import re
+import json
+import time
+import struct
+import hashlib
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+HEADER = struct.Struct('<Q')  # Bytes of the JSON metadata that follows
+ALIGNMENT = 64  # The values start at a multiple of this offset, so the memory map is aligned
+SUFFIX = '.series'
+
+
+class SeriesStore:
+    """
+    A class to store time series on disk in a columnar layout that can be memory-mapped.
+    Each series is one file: the length of the metadata, the metadata as JSON and the values, so a
+    write replaces both at once.
+    """
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+        os.makedirs(self._directory, exist_ok=True)  # Create directory if it does not exist
+
+    def write(self, key: str, series: pd.Series, expire: Optional[float] = None) -> None:
+        """
+        Writes a series with a date index.
+        After the metadata, the file holds a (2, n) int64 array: the timestamps in nanoseconds and the float64 values bits.
+
+        Args:
+            key: The name of the series
+            series: A Pandas Series with a DatetimeIndex
+            expire(optional): Seconds until the series expires, None to never expire
+        """
+
+        index = pd.DatetimeIndex(series.index)
+        meta = {
+            'key': key,
+            'length': len(series),
+            'name': series.name,
+            'freq': index.freqstr,
+            'unit': index.unit,
+            'tz': str(index.tz) if index.tz is not None else None,
+            'expire_at': time.time() + expire if expire is not None else None,
+        }
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+
+        columns = np.empty((2, len(series)), dtype=np.int64)
+        columns[0] = index.as_unit('ns').asi8
+        columns[1] = series.to_numpy(dtype=np.float64).view(np.int64)
+
+        header = json.dumps(meta).encode()
+        offset = -(-(HEADER.size + len(header)) // ALIGNMENT) * ALIGNMENT
+        header = header.ljust(offset - HEADER.size)
+
+        def write(f):
+            f.write(HEADER.pack(len(header)))
+            f.write(header)
+            f.write(columns.tobytes())
+
+        self._replace(self._path(key), write)
+
+    def read(self, key: str) -> Optional[pd.Series]:
+        """
+        Reads a series memory-mapped, without copying the values.
+
+        Args:
+            key: The name of the series
+
+        Returns:
+            A read-only Pandas Series, or None if the series does not exist or has expired.
+        """
+
+        path = self._path(key)
+        try:
+            meta, offset = self._read_meta(path)
+            if meta['key'] != key:
+                return None
+            if meta['expire_at'] is not None and meta['expire_at'] <= time.time():
+                self.delete(key)
+                return None
+
+            columns = np.memmap(path, dtype=np.int64, mode='r', offset=offset, shape=(2, meta['length'])) if meta['length'] else np.empty((2, 0), dtype=np.int64)
+            index = pd.DatetimeIndex(columns[0].view('M8[ns]')).as_unit(meta['unit'])
+            if meta['tz'] is not None:
+                index = index.tz_localize('UTC').tz_convert(meta['tz'])
+            if meta['freq'] is not None:
+                index = pd.DatetimeIndex(index, freq=meta['freq'])
+        except (FileNotFoundError, ValueError, KeyError, TypeError, struct.error):
+            return None  # Missing, partial or unreadable files are a miss
+
+        return pd.Series(columns[1].view(np.float64), index=index, name=meta['name'], copy=False)
+
+    def delete(self, key: str) -> None:
+        """Deletes a series"""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Deletes every series of the store"""
+        for file in os.listdir(self._directory):
+            if file.endswith((SUFFIX, '.npy', '.json')):  # .npy and .json are the files of older versions
+                os.remove(os.path.join(self._directory, file))
+
+    def sizes(self) -> dict:
+        """The bytes on disk of every stored series, by key"""
+        sizes = {}
+        for file in os.listdir(self._directory):
+            if file.endswith(SUFFIX):
+                path = os.path.join(self._directory, file)
+                try:
+                    meta, _ = self._read_meta(path)
+                    sizes[meta['key']] = os.path.getsize(path)
+                except (FileNotFoundError, ValueError, KeyError, struct.error):
+                    continue
+        return sizes
+
+    def _path(self, key: str) -> str:
+        """A readable prefix of the key and its hash, so two keys never share a file"""
+        name = re.sub(r'[^\w.^=-]', '_', key)[:100]
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return os.path.join(self._directory, f'{name}-{digest}{SUFFIX}')
+
+    @staticmethod
+    def _read_meta(path: str) -> tuple[dict, int]:
+        """The metadata of a file and the offset of its values"""
+        with open(path, 'rb') as f:
+            size, = HEADER.unpack(f.read(HEADER.size))
+            meta = json.loads(f.read(size))
+        return meta, HEADER.size + size
+
+    @staticmethod
+    def _replace(path: str, write) -> None:
+        """Writes to a temporary file and renames it, so readers never see a partial file"""
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
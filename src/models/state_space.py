@@ -0,0 +1,89 @@
+import numpy as np
+
+
+def system_matrices(filter_results) -> dict:
+    """
+    Extracts the time-invariant state space matrices of a filtered ARIMA model
+
+    Args:
+        filter_results: The filter_results of a statsmodels ARIMA results object
+
+    Returns:
+        A dict with the transition, design, state_intercept, obs_intercept, state noise (RQR') and obs_cov arrays.
+    """
+
+    selection = filter_results.selection[:, :, 0]
+    return {
+        'transition': np.array(filter_results.transition[:, :, 0]),
+        'design': np.array(filter_results.design[:, :, 0]),
+        'state_intercept': np.array(filter_results.state_intercept[:, 0]),
+        'obs_intercept': float(filter_results.obs_intercept[0, 0]),
+        'state_noise': selection @ filter_results.state_cov[:, :, 0] @ selection.T,
+        'obs_cov': float(filter_results.obs_cov[0, 0, 0]),
+    }
+
+
+def project(matrices: dict, states: np.ndarray, covs: np.ndarray, steps: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Projects predicted states forward, for many origins at once
+
+    Args:
+        matrices: The dict returned by system_matrices
+        states: (n_origins, m) one-step-ahead predicted states of each origin
+        covs: (n_origins, m, m) covariances of the predicted states
+        steps: Number of steps forecasted from each origin
+
+    Returns:
+        Two (n_origins, steps) arrays: the forecasted means and their variances.
+    """
+
+    transition = matrices['transition']
+    design = matrices['design'][0]
+    means = np.empty((len(states), steps))
+    variances = np.empty((len(states), steps))
+
+    for step in range(steps):
+        means[:, step] = states @ design + matrices['obs_intercept']
+        variances[:, step] = np.einsum('i,nij,j->n', design, covs, design) + matrices['obs_cov']
+        states = states @ transition.T + matrices['state_intercept']
+        covs = transition @ covs @ transition.T + matrices['state_noise']
+
+    return means, variances
+
+
+def _factor(cov: np.ndarray) -> np.ndarray:
+    """A matrix L with L @ L.T == cov, also for the singular covariances of the ARIMA states"""
+    values, vectors = np.linalg.eigh(cov)
+    return vectors * np.sqrt(np.clip(values, 0, None))
+
+
+def simulate(matrices: dict, state: np.ndarray, cov: np.ndarray, steps: int, n_paths: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Simulates future paths from one predicted state, all the paths at once
+
+    Args:
+        matrices: The dict returned by system_matrices
+        state: (m,) one-step-ahead predicted state
+        cov: (m, m) covariance of the predicted state
+        steps: Number of steps of each path
+        n_paths: Number of paths
+        rng: The NumPy random generator
+
+    Returns:
+        A (n_paths, steps) array of simulated observations.
+    """
+
+    transition = matrices['transition']
+    design = matrices['design'][0]
+    noise_factor = _factor(matrices['state_noise'])
+    obs_deviation = np.sqrt(max(matrices['obs_cov'], 0.0))
+    paths = np.empty((n_paths, steps))
+
+    states = state + rng.standard_normal((n_paths, len(state))) @ _factor(cov).T
+    for step in range(steps):
+        paths[:, step] = states @ design + matrices['obs_intercept']
+        if obs_deviation:
+            paths[:, step] += obs_deviation * rng.standard_normal(n_paths)
+        states = states @ transition.T + matrices['state_intercept'] + rng.standard_normal((n_paths, len(state))) @ noise_factor.T
+
+    return paths
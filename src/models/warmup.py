@@ -0,0 +1,35 @@
+import importlib
+import threading
+from typing import Iterable
+
+# The libraries the pipeline imports on first use, slowest first
+HEAVY_MODULES = (
+    'statsmodels.tsa.arima.model',
+    'pmdarima',
+    'yfinance',
+)
+
+
+def _import_all(modules: Iterable[str]) -> None:
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f"Erro ao pré-carregar {module}: {e}")
+
+
+def prewarm(modules: Iterable[str] = HEAVY_MODULES) -> threading.Thread:
+    """
+    Imports the heavy libraries on a daemon thread, so they are ready before the first prediction
+    without delaying the startup
+
+    Args:
+        modules(optional) default HEAVY_MODULES: Names of the modules to import
+
+    Returns:
+        The started thread.
+    """
+
+    thread = threading.Thread(target=_import_all, args=(tuple(modules),), name='prewarm', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from .cache_handler import CacheHandler
+
+
+class Watchlist:
+    """
+    The symbols whose forecasts are precomputed, and how often each symbol is requested.
+    The most requested symbols are refreshed first. The list is kept in the cache, so it is shared by
+    the GUI and the service and survives restarts: every change is merged with the stored list in one
+    transaction, and the request counts are flushed in batches instead of on every request.
+    """
+    KEY = 'watchlist'
+
+    def __init__(self, cache: CacheHandler, flush_every: int = 20, flush_interval: float = 60, max_tracked: int = 1000) -> None:
+        """
+        Args:
+            cache: The CacheHandler where the list is kept
+            flush_every(optional) default 20: Number of requests counted in memory before they are saved
+            flush_interval(optional) default 60: Seconds after which the requests counted in memory are saved
+            max_tracked(optional) default 1000: Number of unwatched symbols whose requests are kept, the most requested
+        """
+
+        self._cache = cache
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._max_tracked = max_tracked
+        self._lock = threading.Lock()
+        self._pending: Counter = Counter()  # Requests not saved yet
+        self._flushed_at = time.monotonic()
+
+    def add(self, symbol: str) -> None:
+        self._update(lambda symbols, requests: symbols if symbol in symbols else symbols + [symbol])
+
+    def remove(self, symbol: str) -> None:
+        self._update(lambda symbols, requests: [watched for watched in symbols if watched != symbol])
+
+    def record_request(self, symbol: str) -> None:
+        """Counts a request of a symbol that exists, watched or not, so it gains priority"""
+        with self._lock:
+            self._pending[symbol] += 1
+            due = sum(self._pending.values()) >= self._flush_every or time.monotonic() - self._flushed_at >= self._flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Saves the requests counted in memory"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._flushed_at = time.monotonic()
+        if pending:
+            self._update(lambda symbols, requests: symbols, pending)
+
+    def symbols(self) -> List[str]:
+        """The watched symbols, in the order they were added"""
+        return self._load()[0]
+
+    def by_priority(self) -> List[str]:
+        """The watched symbols, the most requested first"""
+        symbols, requests = self._load()
+        return sorted(symbols, key=lambda symbol: -requests[symbol])
+
+    def requests(self) -> Dict[str, int]:
+        """The requests of each symbol, saved or not"""
+        return dict(self._load()[1])
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._load()[0]
+
+    def __len__(self) -> int:
+        return len(self._load()[0])
+
+    def _load(self) -> tuple[List[str], Counter]:
+        stored = self._cache.get(self.KEY) or {}
+        requests = Counter(stored.get('requests', {}))
+        with self._lock:
+            requests.update(self._pending)
+        return list(stored.get('symbols', [])), requests
+
+    def _update(self, change: Callable[[List[str], Counter], List[str]], pending: Optional[Counter] = None) -> None:
+        """Applies change(symbols, requests) -> symbols and adds the pending requests to the stored list"""
+        def merge(stored):
+            stored = stored or {}
+            requests = Counter(stored.get('requests', {}))
+            requests.update(pending or {})
+            symbols = change(list(stored.get('symbols', [])), requests)
+            unwatched = [symbol for symbol, _ in requests.most_common() if symbol not in symbols]
+            for symbol in unwatched[self._max_tracked:]:
+                del requests[symbol]
+            return {'symbols': symbols, 'requests': dict(requests)}
+
+        self._cache.update(self.KEY, merge)
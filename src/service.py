@@ -0,0 +1,45 @@
+import argparse
+
+from src.controllers.forecast_scheduler import ForecastScheduler
+from src.controllers.forecast_service import ForecastService, create_forecast_server
+from src.models.data_source import CSVDataSource
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Serves the forecasts over HTTP/JSON, keeping the models in memory.')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
+    parser.add_argument('--workers', type=int, default=4, help='Number of fits running at the same time')
+    parser.add_argument('--max-pending', type=int, default=64, help='Number of pending tasks before answering 503')
+    parser.add_argument('--watch', default='', help='Comma separated symbols added to the watchlist, whose forecasts are precomputed')
+    parser.add_argument('--refresh-interval', type=float, help='Seconds between the precomputations, default is once a weekday after the market closes')
+    parser.add_argument('--csv-dir', help='Reads the data from a directory of {symbol}.csv files instead of Yahoo Finance')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    data_source = CSVDataSource(args.csv_dir) if args.csv_dir else None
+    service = ForecastService(data_source=data_source, max_workers=args.workers, max_pending=args.max_pending)
+    predictor = service.predictor
+    for symbol in filter(None, (symbol.strip() for symbol in args.watch.split(','))):
+        predictor.watchlist.add(symbol)
+    scheduler = ForecastScheduler(predictor, predictor.watchlist, predictor.precomputed, interval=args.refresh_interval)
+    scheduler.start()
+
+    server = create_forecast_server(service, host=args.host, port=args.port)
+    print(f"> Serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop(timeout=1)
+        server.server_close()
+        service.shutdown()
+        print("\n> Processo finalizado!")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,68 @@
-import matplotlib.pyplot as plt
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
 import pandas as pd
 
+
+def decimate(x: np.ndarray, y: np.ndarray, buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a line to the minimum and the maximum of each bucket of points, in their original order.
+    With one bucket per pixel the line is drawn the same as with all the points.
+
+    Args:
+        x: The x values, sorted
+        y: The y values
+        buckets: Number of buckets, usually the width of the axes in pixels
+
+    Returns:
+        The x and y values of at most 2 * buckets points.
+    """
+
+    n = len(x)
+    if n <= 2 * buckets:
+        return x, y
+
+    size = -(-n // buckets)  # Points per bucket, rounded up
+    padded = np.full(size * buckets, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+
+    offsets = np.arange(buckets) * size
+    lowest = offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    highest = offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    keep = np.unique(np.concatenate([lowest, highest, [0, n - 1]]))
+    keep = keep[keep < n]
+    return x[keep], y[keep]
+
+
 class DataChart:
-    def __init__(self) -> None:
-        self.fig, self.ax = plt.subplots()
+    def __init__(self, headless: bool = False) -> None:
+        """
+        Args:
+            headless(optional) default False: Draws without pyplot and without a display, only to export files
+        """
+
+        if headless:
+            from matplotlib.figure import Figure  # Renders with Agg when saved, never opens a window
+
+            self.fig = Figure()
+            self.ax = self.fig.subplots()
+        else:
+            import matplotlib.pyplot as plt  # Imported with the first chart, not at the application startup
+
+            self.fig, self.ax = plt.subplots()
+
+        self.ax.xaxis_date()
+        self._lines: Dict[str, tuple] = {}  # label -> (artist, all the x values, all the y values)
+        self._rendering = False
+        self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
 
     def create_plot(self, dates, data, label, color, line_style='solid', line_width=2) -> None:
         """
-        Creates a plot on the chart
+        Creates a plot on the chart.
+        Only the minimum and maximum of each pixel are drawn, so long histories stay fast; zooming in draws
+        the visible range again with more detail. Plotting a label again reuses its line with the new data.
 
         Args:
             dates: Dates index
@@ -17,18 +72,64 @@ class DataChart:
             line_style(optional): Line tipe
             line_width(optional): Line width
         """
-        plt.plot(
-            dates, 
-            data,
-            label=label,
-            color=color,
-            linestyle=line_style,
-            linewidth=line_width 
+        from matplotlib.dates import date2num
+
+        x = date2num(np.asarray(pd.DatetimeIndex(dates).tz_localize(None), dtype='datetime64[ns]'))
+        y = np.asarray(data, dtype=np.float64)
+
+        if label in self._lines:
+            line = self._lines[label][0]
+            line.set(color=color, linestyle=line_style, linewidth=line_width)
+        else:
+            line, = self.ax.plot(
+                [],
+                [],
+                label=label,
+                color=color,
+                linestyle=line_style,
+                linewidth=line_width
+            )
+        self._lines[label] = (line, x, y)
+
+        self._render(line, x, y, None)
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+    def plot_prediction(self, close_prices: pd.Series, forecast_prices: pd.Series, performance_prediction: pd.Series) -> None:
+        """
+        Plots the real values, the in-sample prediction and the forecast of a symbol
+
+        Args:
+            close_prices: The real closing values
+            forecast_prices: The forecasted values, plotted on the business days after the last real value
+            performance_prediction: The values predicted by the model for the real dates
+        """
+        forecast_dates = self.generate_dates(close_prices.index[-1], len(forecast_prices))
+
+        self.create_plot(
+            dates=close_prices.index,
+            data=close_prices,
+            label='Valores Reais',
+            color='#4CAF50',
+        )
+        self.create_plot(
+            dates=performance_prediction.index,
+            data=performance_prediction,
+            label='Performance do Modelo',
+            color='#2196F3',
+            line_style='--'
+        )
+        self.create_plot(
+            dates=forecast_dates,
+            data=forecast_prices,
+            label='Previsão',
+            color='#FF5722',
+            line_style='--'
         )
 
     def generate_dates(self, start: str, periods: int) -> pd.DatetimeIndex:
         """
-        Generate business dates 
+        Generate business dates
 
         Args:
             start: In date format, the start date
@@ -45,9 +146,31 @@ class DataChart:
         """
         Show chart
 
-        Args: 
+        Args:
             symbol: The symbol of the stock
         """
+        import matplotlib.pyplot as plt
+
+        self._style(symbol)
+        plt.show()
+
+    def export(self, path: str, symbol: str, dpi: int = 100) -> str:
+        """
+        Saves the chart to a file, without a display
+
+        Args:
+            path: The file; the format comes from the extension, e.g. '.png' or '.svg'
+            symbol: The symbol of the stock
+            dpi(optional) default 100: Resolution of raster formats
+
+        Returns:
+            The path of the file.
+        """
+        self._style(symbol)
+        self.fig.savefig(path, dpi=dpi)
+        return path
+
+    def _style(self, symbol: str) -> None:
         self.fig.set_size_inches(7, 4)  # Sets the size of the figure.
         self.ax.set_title(  # Chart title
             f'Previsão de Preços de Ações ({symbol}) com ARIMA',
@@ -56,18 +179,18 @@ class DataChart:
             pad=20,
         )
         self.ax.set_xlabel(  # X-axis label
-            'Data', 
+            'Data',
             fontsize=12,
             color='#555555'
-        )         
+        )
         self.ax.set_ylabel(  # Y-axis label
-            'Preço de Fechamento (R$)', 
-            fontsize=12, 
+            'Preço de Fechamento (R$)',
+            fontsize=12,
             color='#555555'
         )
         self.ax.legend(  # Remove the box around the caption
-            loc='upper left', 
-            fontsize=10, 
+            loc='upper left',
+            fontsize=10,
             frameon=False
         )
         self.ax.grid(True)  # Activate the grid
@@ -82,6 +205,58 @@ class DataChart:
         self.ax.spines['left'].set_color('#DDDDDD')
         self.ax.spines['bottom'].set_color('#DDDDDD')
 
-        # Adjust the layout and display the chart
-        plt.tight_layout()
-        plt.show()
+        # Adjust the layout
+        self.fig.tight_layout()
+        self._buckets_changed()
+
+    def _pixels(self) -> int:
+        return max(int(self.ax.get_window_extent().width), 1)
+
+    def _render(self, line, x: np.ndarray, y: np.ndarray, xlim: Optional[tuple]) -> None:
+        """Sets the decimated points of the visible range (and one point beyond each side) on a line"""
+        if xlim is not None:
+            start = max(np.searchsorted(x, xlim[0]) - 1, 0)
+            end = np.searchsorted(x, xlim[1], side='right') + 1
+            x, y = x[start:end], y[start:end]
+        line.set_data(*decimate(x, y, self._pixels()))
+
+    def _on_xlim_changed(self, ax) -> None:
+        """Draws the visible range again with one bucket per pixel, reusing the lines"""
+        if self._rendering:
+            return
+        self._rendering = True
+        try:
+            xlim = tuple(sorted(ax.get_xlim()))
+            for line, x, y in self._lines.values():
+                self._render(line, x, y, xlim)
+        finally:
+            self._rendering = False
+        self.fig.canvas.draw_idle()
+
+    def _buckets_changed(self) -> None:
+        """The size of the axes changed, so the number of pixels per bucket did too"""
+        self._on_xlim_changed(self.ax)
+
+
+def export_many(predictions: Dict[str, dict], directory: str, format: str = 'png', dpi: int = 100) -> List[str]:
+    """
+    Renders the charts of many symbols to files without a display.
+    One headless chart is reused: the lines of each symbol replace the data of the previous one.
+
+    Args:
+        predictions: By symbol, a dict with the 'close_prices', 'forecast_prices' and 'performance_prediction' series
+        directory: Where the files are written, as '{symbol}.{format}'
+        format(optional) default 'png': 'png', 'svg', 'pdf' or other Matplotlib format
+        dpi(optional) default 100: Resolution of raster formats
+
+    Returns:
+        The paths of the files.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    chart = DataChart(headless=True)
+    paths = []
+    for symbol, prediction in predictions.items():
+        chart.plot_prediction(**prediction)
+        paths.append(chart.export(os.path.join(directory, f'{symbol}.{format}'), symbol, dpi=dpi))
+    return paths
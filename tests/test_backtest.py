@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from src.models.backtest import Backtester
+from src.models.predictor import Predictor
+
+class TestBacktester(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        dates = pd.date_range('2018-01-01', periods=600, freq='B')
+        self.data = pd.Series(100 + np.cumsum(rng.normal(size=600)), index=dates)
+
+    def test_matches_dynamic_prediction(self):
+        result = Backtester((1, 1, 1), horizon=4).run(self.data, n_origins=50)
+
+        origin = len(self.data) - 4 - 1
+        train = self.data.to_numpy()[:origin - 49 + 1]
+        params = ARIMA(train, order=(1, 1, 1)).fit().params
+        expected = ARIMA(self.data.to_numpy(), order=(1, 1, 1)).filter(params)
+        prediction = expected.get_prediction(start=origin + 1, end=origin + 4, dynamic=True)
+
+        np.testing.assert_allclose(result.forecasts[-1], prediction.predicted_mean, rtol=1e-6)
+        np.testing.assert_allclose(result.actuals[-1], self.data.to_numpy()[origin + 1:origin + 5])
+        self.assertEqual(result.origins[-1], self.data.index[origin])
+
+    def test_metrics(self):
+        result = Backtester((1, 1, 0), horizon=5).run(self.data, n_origins=100)
+        self.assertEqual(result.forecasts.shape, (100, 5))
+        for metric in (result.mae, result.rmse, result.mape, result.coverage):
+            self.assertEqual(metric.shape, (100,))
+        self.assertTrue(np.all(result.rmse >= result.mae))
+        self.assertGreater(result.summary()['coverage'], 0.7)
+
+    def test_rolling_refits_in_parallel(self):
+        result = Backtester((1, 1, 0), horizon=3, window='rolling', window_size=200, refit_every=40, max_workers=2).run(self.data, n_origins=120)
+        self.assertEqual(len(result.origins), 120)
+        self.assertTrue(np.all(np.isfinite(result.forecasts)))
+
+    def test_predictor_make_backtest(self):
+        result = Predictor().make_backtest(self.data, pdq_order=(1, 1, 0), n_origins=20, horizon=2)
+        self.assertEqual(result.forecasts.shape, (20, 2))
+
+    def test_not_enough_data(self):
+        with self.assertRaises(ValueError):
+            Backtester((1, 1, 0)).run(self.data, n_origins=600)
+
+
+if __name__ == '__main__':
+    unittest.main()
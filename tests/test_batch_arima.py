@@ -0,0 +1,64 @@
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.arima_process import arma_generate_sample
+from src.models.batch_arima import BatchARIMA
+from src.models.predictor import Predictor
+
+class TestBatchARIMA(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(warnings.catch_warnings())  # The filter is restored after each test
+        warnings.simplefilter('ignore')
+        dates = pd.date_range('2016-01-01', periods=600, freq='B')
+        self.data = pd.DataFrame({
+            f'S{seed}': 100 + np.cumsum(arma_generate_sample([1, -0.5], [1, 0.3], 600, distrvs=np.random.default_rng(seed).standard_normal))
+            for seed in range(6)
+        }, index=dates)
+
+    def assert_close_to_statsmodels(self, data, order, symbols):
+        forecasts = BatchARIMA(order).fit(data).forecast(10)
+        for symbol in symbols:
+            expected = ARIMA(data[symbol].dropna(), order=order).fit().get_forecast(10)
+            self.assertTrue(forecasts[symbol].dropna().index.equals(expected.predicted_mean.index))
+            error = np.abs(forecasts[symbol].dropna().to_numpy() - expected.predicted_mean.to_numpy()) / np.sqrt(expected.var_pred_mean.to_numpy())
+            self.assertLess(error.max(), 0.05)
+
+    def test_matches_statsmodels(self):
+        self.assert_close_to_statsmodels(self.data, (1, 1, 1), ['S0', 'S1'])
+        self.assert_close_to_statsmodels(self.data, (2, 1, 0), ['S2'])
+        self.assert_close_to_statsmodels(self.data, (1, 2, 0), ['S3'])
+
+    def test_intervals(self):
+        results = BatchARIMA((1, 1, 1)).fit(self.data)
+        mean, lower, upper = results.forecast_intervals(10, alpha=0.05)
+        expected = ARIMA(self.data['S4'], order=(1, 1, 1)).fit().get_forecast(10).conf_int(alpha=0.05)
+        np.testing.assert_allclose((upper - lower)['S4'], expected.iloc[:, 1] - expected.iloc[:, 0], rtol=0.02)
+        self.assertTrue(((lower < mean) & (mean < upper)).all().all())
+
+        params = results.params
+        self.assertEqual(list(params.columns), ['ar.L1', 'ma.L1', 'sigma2'])
+        self.assertAlmostEqual(params['ar.L1'].mean(), 0.5, delta=0.15)
+
+    def test_misaligned_series(self):
+        data = self.data.copy()
+        data.iloc[:50, 0] = np.nan   # Starts later: estimated in its own block
+        data.iloc[300, 1] = np.nan   # A gap: fitted by statsmodels
+        data['EMPTY'] = np.nan
+
+        results = BatchARIMA((1, 1, 0)).fit(data)
+        self.assertEqual(list(results.fallback), ['S1'])
+        self.assertEqual(set(results.symbols), set(self.data.columns))
+        self.assertEqual(results.forecast(3).shape, (3, 6))
+        self.assert_close_to_statsmodels(data, (1, 1, 0), ['S0'])
+
+    def test_predictor_create_batch_ARIMA_models(self):
+        predictor = Predictor()
+        results = predictor.create_batch_ARIMA_models(self.data, (1, 1, 0))
+        self.assertEqual(results.forecast(4).shape, (4, 6))
+        self.assertEqual(predictor.metrics.snapshot()['counters']['batch_fits'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,19 @@
+import unittest
+from benchmarks.bench_pipeline import STAGES, compare, generate_series, run_benchmark
+
+class TestBenchPipeline(unittest.TestCase):
+    def test_generate_series(self):
+        data = generate_series(200, order=(2, 1, 0), seed=3)
+        self.assertEqual(len(data), 200)
+        self.assertTrue((data['Close'] > 0).all())
+        self.assertTrue(data.equals(generate_series(200, order=(2, 1, 0), seed=3)))
+
+    def test_run_benchmark(self):
+        results = run_benchmark(length=150, count=2, memory=False)
+        self.assertEqual(set(results['stages']), set(STAGES))
+        self.assertEqual(results['stages']['create_ARIMA_model']['n'], 2)
+        self.assertIn('ratio', compare(results, results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from src.cache_cli import main
+from src.models.cache_config import CacheConfig, default_directory
+from src.models.cache_handler import CacheHandler
+
+def _write(directory, worker):
+    cache = CacheHandler(config=CacheConfig(directory=directory, shards=4))
+    for i in range(50):
+        cache.insert({f'pdq_W{worker}_{i}': (worker, i)})
+    cache.close()
+
+
+class TestCacheConfig(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_defaults(self):
+        config = CacheConfig.load(environ={})
+        self.assertEqual(config.directory, default_directory())
+        self.assertEqual(config.ttls['orders'], 24 * 3600)
+        self.assertIsNone(config.ttls['models'])
+        self.assertEqual(config.memory_ttl, 5.0)
+
+    def test_file_and_environment(self):
+        path = os.path.join(self.directory, 'cache.json')
+        with open(path, 'w') as f:
+            json.dump({'directory': self.directory, 'shards': 2, 'ttls': {'orders': 60}}, f)
+
+        config = CacheConfig.load(environ={
+            'STOCKPREDICTOR_CACHE_CONFIG': path,
+            'STOCKPREDICTOR_CACHE_SHARDS': '4',
+            'STOCKPREDICTOR_CACHE_EVICTION_POLICY': 'least-recently-used',
+            'STOCKPREDICTOR_CACHE_TTL_MODELS': '3600',
+            'STOCKPREDICTOR_CACHE_TTL_CLOSE_PRICES': 'none',
+            'STOCKPREDICTOR_CACHE_MEMORY_TTL': 'none',
+        })
+        self.assertIsNone(config.memory_ttl)
+        self.assertEqual(config.directory, self.directory)
+        self.assertEqual(config.shards, 4)
+        self.assertEqual(config.eviction_policy, 'least-recently-used')
+        self.assertEqual(config.ttls, {'close_prices': None, 'history': 3600, 'orders': 60, 'models': 3600, 'forecasts': 86400, 'precomputed': 604800})
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            CacheConfig(eviction_policy='random')
+        with self.assertRaises(ValueError):
+            CacheConfig(ttls={'unknown': 1})
+
+    def test_handler_uses_config(self):
+        cache = CacheHandler(config=CacheConfig(directory=self.directory, ttls={'orders': 5}))
+        self.assertEqual(cache.ttl('orders'), 5)
+        cache.insert({'pdq_CFG_abc': (1, 1, 1), 'arima_CFG_latest': {}})
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'series')))
+        self.assertEqual(cache.inspect()['disk']['namespaces'], {'orders': 1, 'models': 1})
+
+    def test_concurrent_processes(self):
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            list(executor.map(_write, [self.directory] * 3, range(3)))
+
+        cache = CacheHandler(config=CacheConfig(directory=self.directory, shards=4))
+        self.assertEqual(len(list(cache.keys('pdq_'))), 150)
+        self.assertEqual(cache.get('pdq_W2_49'), (2, 49))
+
+    def test_cli(self):
+        path = os.path.join(self.directory, 'cache.json')
+        with open(path, 'w') as f:
+            json.dump({'directory': self.directory}, f)
+        CacheHandler(config=CacheConfig.load(path=path, environ={})).insert({'pdq_CLI_1': (0, 1, 1)})
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(['--config', path, 'keys', '--prefix', 'pdq_'])
+            main(['--config', path, 'stats'])
+        self.assertIn('pdq_CLI_1', output.getvalue())
+
+        main(['--config', path, 'delete', 'pdq_CLI_1'])
+        self.assertIsNone(CacheHandler(config=CacheConfig.load(path=path, environ={})).get('pdq_CLI_1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
+import threading
 import unittest
-from time import sleep
+from time import monotonic, sleep
 from src.models.cache_handler import CacheHandler  
 
 class TestCacheHandler(unittest.TestCase):
@@ -30,5 +31,88 @@ class TestCacheHandler(unittest.TestCase):
         result = self.cache.get('AAPL')
         self.assertIsNone(result)
 
+    def test_memory_tier(self):
+        self.cache.insert({'memory_tier': {'order': (1, 1, 1)}})
+        before = self.cache.stats()['memory']['hits']
+        self.assertEqual(self.cache.get('memory_tier'), {'order': (1, 1, 1)})
+        self.assertEqual(self.cache.stats()['memory']['hits'], before + 1)
+
+        # A new handler starts with an empty memory tier and fills it from the disk
+        other = CacheHandler()
+        self.assertEqual(other.get('memory_tier'), {'order': (1, 1, 1)})
+        self.assertEqual(other.stats()['memory']['entries'], 1)
+
+        self.cache.delete('memory_tier')
+        self.assertIsNone(self.cache.get('memory_tier'))
+
+    def test_memory_tier_expires_with_disk(self):
+        self.cache.insert_tmp({'memory_tmp': 1}, s=1)
+        other = CacheHandler()
+        self.assertEqual(other.get('memory_tmp'), 1)
+        sleep(1.5)
+        self.assertIsNone(self.cache.get('memory_tmp'))
+        self.assertIsNone(other.get('memory_tmp'))
+
+    def test_memory_tier_sees_other_processes(self):
+        other = CacheHandler(memory_bytes=1024 * 1024)
+        other.config.memory_ttl = 1
+        self.cache.insert({'memory_shared': 1})
+        self.assertEqual(other.get('memory_shared'), 1)
+        self.cache.insert({'memory_shared': 2})  # A write of another process, not seen by the memory tier of other
+        sleep(1.5)
+        self.assertEqual(other.get('memory_shared'), 2)
+        self.cache.delete('memory_shared')
+
+    def test_get_many(self):
+        self.cache.insert({'many_1': 1, 'many_2': 2})
+        self.cache.delete('many_3')
+        self.assertEqual(CacheHandler().get_many(['many_1', 'many_2', 'many_3']), {'many_1': 1, 'many_2': 2})
+        self.assertEqual(self.cache.get(['many_1', 'many_2']), [1, 2])
+
+    def test_get_many_does_not_wait_for_writers(self):
+        self.cache.insert({'many_1': 1})
+        other = CacheHandler()
+        locked, release = threading.Event(), threading.Event()
+
+        def write():
+            with self.cache._cache.transact():  # A long write of another process holds every shard
+                locked.set()
+                release.wait(5)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        locked.wait(5)
+        try:
+            start = monotonic()
+            self.assertEqual(other.get_many(['many_1']), {'many_1': 1})
+            self.assertLess(monotonic() - start, 2)
+        finally:
+            release.set()
+            writer.join()
+
+    def test_update_locks_only_its_shard(self):
+        other = CacheHandler()
+        busy = next(key for key in (f'update_busy_{i}' for i in range(100)) if self.cache._shard(key) is not self.cache._shard('update_count'))
+        self.cache.delete('update_count')
+        locked, release = threading.Event(), threading.Event()
+
+        def write():
+            with self.cache._shard(busy).transact(retry=True):
+                locked.set()
+                release.wait(5)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        locked.wait(5)
+        try:
+            start = monotonic()
+            other.update('update_count', lambda count: (count or 0) + 1)
+            self.assertEqual(other.update('update_count', lambda count: (count or 0) + 1), 2)
+            self.assertLess(monotonic() - start, 2)
+        finally:
+            release.set()
+            writer.join()
+            self.cache.delete('update_count')
+
 if __name__ == '__main__':
     unittest.main()
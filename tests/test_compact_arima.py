@@ -0,0 +1,80 @@
+import pickle
+import shutil
+import tempfile
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from src.models.compact_arima import CompactARIMA
+from src.models.data_source import CSVDataSource
+from src.models.prediction_request import PredictionRequest
+from src.models.predictor import Predictor
+
+
+def make_data(periods=3000, seed=8, freq='B'):
+    rng = np.random.default_rng(seed)
+    return pd.Series(50 + np.cumsum(rng.normal(size=periods)), index=pd.date_range('2010-01-01', periods=periods, freq=freq))
+
+
+class TestCompactARIMA(unittest.TestCase):
+    def setUp(self):
+        self.data = make_data()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.model = ARIMA(self.data, order=(2, 1, 1)).fit()
+        self.compact = CompactARIMA.from_results(self.model)
+
+    def test_forecast(self):
+        expected = self.model.get_forecast(30)
+        self.assertTrue(self.compact.forecast(30).index.equals(self.model.forecast(30).index))
+        np.testing.assert_allclose(self.compact.forecast(30).to_numpy(), expected.predicted_mean.to_numpy())
+
+        result = self.compact.get_forecast(30, levels=(0.9,))
+        np.testing.assert_allclose(result.interval(0.9).to_numpy(), expected.conf_int(alpha=0.1).to_numpy())
+
+    def test_undated(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model = ARIMA(self.data.to_numpy(), order=(1, 1, 0)).fit()
+        compact = CompactARIMA.from_results(model)
+        self.assertTrue(compact.forecast(5).index.equals(pd.RangeIndex(3000, 3005)))
+        np.testing.assert_allclose(compact.forecast(5).to_numpy(), model.forecast(5))
+
+    def test_size(self):
+        self.assertFalse(hasattr(self.compact, '__dict__'))
+        self.assertLess(self.compact.nbytes, 2000)
+        compact_bytes = len(pickle.dumps(self.compact))
+        self.assertLess(compact_bytes * 50, len(pickle.dumps(self.model)))
+        self.assertEqual(pickle.loads(pickle.dumps(self.compact)).order, (2, 1, 1))
+
+    def test_expand(self):
+        expanded = self.compact.expand(self.data)
+        np.testing.assert_allclose(expanded.predict(start=0, end=99), self.model.predict(start=0, end=99))
+        self.assertEqual(list(self.compact.cov_params().index), self.model.param_names)
+
+
+class TestLowMemoryPredictor(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        make_data(periods=300).to_frame('Close').to_csv(f'{self.directory}/LOWMEM.csv')
+        self.predictor = Predictor(data_source=CSVDataSource(self.directory))
+
+    def tearDown(self):
+        self.predictor.clear_cache()
+        shutil.rmtree(self.directory)
+
+    def test_predict_low_memory(self):
+        request = self.predictor.predict(PredictionRequest('LOWMEM', years=1, pdq_order=(1, 1, 0), low_memory=True))
+        self.assertIsInstance(request.model, CompactARIMA)
+        self.assertIs(self.predictor.get_arima_model(), request.model)
+        self.assertEqual(len(request.forecast), 12)
+        self.assertEqual(len(request.performance_prediction), 300)
+
+        updated = self.predictor.update_ARIMA_model(request.data, symbol='LOWMEM', low_memory=True)
+        self.assertIsInstance(updated, CompactARIMA)
+        np.testing.assert_allclose(updated.forecast(12).to_numpy(), request.forecast.to_numpy())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.views.data_chart import DataChart, decimate, export_many
+
+
+def make_series(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('1990-01-01', periods=periods, freq='B')
+    return pd.Series(100 + rng.normal(size=periods).cumsum(), index=index)
+
+
+class TestDecimate(unittest.TestCase):
+    def test_keeps_extremes_and_ends(self):
+        y = np.random.default_rng(1).normal(size=100_000)
+        x = np.arange(len(y), dtype=float)
+        dx, dy = decimate(x, y, 500)
+
+        self.assertLessEqual(len(dx), 2 * 500 + 2)
+        self.assertEqual(dy.min(), y.min())
+        self.assertEqual(dy.max(), y.max())
+        self.assertEqual(dx[0], x[0])
+        self.assertEqual(dx[-1], x[-1])
+        self.assertTrue(np.all(np.diff(dx) > 0))
+
+    def test_short_lines_are_untouched(self):
+        x = np.arange(10, dtype=float)
+        dx, dy = decimate(x, x * 2, 100)
+        self.assertIs(dx, x)
+        self.assertEqual(len(dy), 10)
+
+    def test_nan_values(self):
+        y = np.full(1000, np.nan)
+        y[500] = 3.0
+        dx, dy = decimate(np.arange(1000, dtype=float), y, 10)
+        self.assertIn(3.0, dy)
+
+
+class TestDataChart(unittest.TestCase):
+    def setUp(self):
+        self.chart = DataChart(headless=True)
+        self.series = make_series(20_000)
+
+    def test_long_history_is_decimated(self):
+        self.chart.create_plot(self.series.index, self.series, 'Valores Reais', '#4CAF50')
+        line = self.chart.ax.get_lines()[0]
+
+        self.assertLessEqual(len(line.get_xdata()), 2 * self.chart._pixels() + 2)
+        self.assertEqual(line.get_ydata().max(), self.series.max())
+        self.assertEqual(line.get_ydata().min(), self.series.min())
+
+    def test_plot_again_reuses_the_line(self):
+        self.chart.create_plot(self.series.index, self.series, 'Valores Reais', '#4CAF50')
+        line = self.chart.ax.get_lines()[0]
+        other = make_series(500, seed=3)
+        self.chart.create_plot(other.index, other, 'Valores Reais', '#4CAF50')
+
+        self.assertEqual(len(self.chart.ax.get_lines()), 1)
+        self.assertIs(self.chart.ax.get_lines()[0], line)
+        self.assertEqual(len(line.get_xdata()), 500)
+
+    def test_zoom_renders_the_visible_range(self):
+        from matplotlib.dates import date2num
+
+        self.chart.create_plot(self.series.index, self.series, 'Valores Reais', '#4CAF50')
+        line = self.chart.ax.get_lines()[0]
+        visible = self.series.iloc[10_000:10_200]
+        self.chart.ax.set_xlim(date2num(visible.index[0]), date2num(visible.index[-1]))
+
+        x = line.get_xdata()
+        self.assertLessEqual(len(x), len(visible) + 2)
+        self.assertGreaterEqual(len(x), len(visible))  # Every point of the range, one pixel per point or less
+        self.assertLessEqual(x[0], date2num(visible.index[0]))
+        self.assertGreaterEqual(x[-1], date2num(visible.index[-1]))
+
+    def test_export(self):
+        close_prices = make_series(3000)
+        with tempfile.TemporaryDirectory() as directory:
+            self.chart.plot_prediction(close_prices, close_prices.iloc[-24:].reset_index(drop=True), close_prices)
+            for format in ('png', 'svg'):
+                path = self.chart.export(os.path.join(directory, f'TEST.{format}'), 'TEST')
+                self.assertGreater(os.path.getsize(path), 0)
+
+    def test_export_many(self):
+        predictions = {}
+        for seed, symbol in enumerate(('AAA', 'BBB')):
+            close_prices = make_series(1000, seed=seed)
+            predictions[symbol] = {
+                'close_prices': close_prices,
+                'forecast_prices': close_prices.iloc[-10:].reset_index(drop=True),
+                'performance_prediction': close_prices,
+            }
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = export_many(predictions, directory, format='png')
+            self.assertEqual([os.path.basename(path) for path in paths], ['AAA.png', 'BBB.png'])
+            for path in paths:
+                self.assertTrue(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
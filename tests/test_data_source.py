@@ -0,0 +1,42 @@
+import shutil
+import tempfile
+import unittest
+from time import monotonic
+import numpy as np
+import pandas as pd
+from src.models.data_source import CSVDataSource, RateLimiter
+
+class TestCSVDataSource(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        dates = pd.date_range('2024-01-01', periods=10, freq='B')
+        self.data = pd.DataFrame({'Close': np.arange(10.0)}, index=dates)
+        self.data.to_csv(f'{self.directory}/FAKE.csv')
+        self.source = CSVDataSource(self.directory)
+
+    def test_download(self):
+        data = self.source.download('FAKE')
+        self.assertEqual(len(data), 10)
+        self.assertIsInstance(data.index, pd.DatetimeIndex)
+
+    def test_download_from_start(self):
+        data = self.source('FAKE', start=self.data.index[7])
+        self.assertEqual(data.index.tolist(), self.data.index[7:].tolist())
+
+    def test_missing_symbol(self):
+        self.assertTrue(self.source.download('MISSING').empty)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+class TestRateLimiter(unittest.TestCase):
+    def test_wait(self):
+        limiter = RateLimiter(calls_per_second=20)
+        start = monotonic()
+        for _ in range(5):
+            limiter.wait()
+        self.assertGreaterEqual(monotonic() - start, 0.19)
+
+
+if __name__ == '__main__':
+    unittest.main()
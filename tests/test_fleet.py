@@ -0,0 +1,56 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.models.data_source import CSVDataSource
+from src.models.fleet import FleetForecaster
+
+class TestFleetForecaster(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(1)
+        dates = pd.date_range('2022-01-03', periods=200, freq='B')
+        self.symbols = ['FLEET1', 'FLEET2', 'FLEET3']
+        for symbol in self.symbols:
+            close = 50 + np.cumsum(rng.normal(size=200))
+            pd.DataFrame({'Close': close}, index=dates).to_csv(os.path.join(self.directory, f'{symbol}.csv'))
+        self.output = os.path.join(self.directory, 'forecasts.jsonl')
+
+    def test_run(self):
+        fleet = FleetForecaster(data_source=CSVDataSource(self.directory), max_workers=2, steps=5, order=(1, 1, 0))
+        report = fleet.run(self.symbols + ['MISSING'], output_path=self.output)
+
+        with open(self.output) as f:
+            records = {record['symbol']: record for record in map(json.loads, f)}
+
+        self.assertEqual(set(records), set(self.symbols + ['MISSING']))
+        self.assertEqual(len(records['FLEET1']['forecast']), 5)
+        self.assertEqual(records['MISSING']['stage'], 'download')
+        self.assertEqual(report.succeeded, 3)
+        self.assertIn('MISSING', report.failed)
+        self.assertEqual(report.stage_count['fit'], 3)
+        self.assertGreater(report.throughput()['fit'], 0)
+
+    def test_run_batch(self):
+        fleet = FleetForecaster(data_source=CSVDataSource(self.directory), max_workers=2, steps=5, order=(1, 1, 1))
+        report = fleet.run_batch(self.symbols + ['MISSING'], output_path=self.output, chunk_size=2)
+
+        with open(self.output) as f:
+            records = {record['symbol']: record for record in map(json.loads, f)}
+
+        self.assertEqual(len(records['FLEET3']['forecast']), 5)
+        self.assertEqual(records['MISSING']['stage'], 'download')
+        self.assertEqual(report.succeeded, 3)
+
+        with self.assertRaises(ValueError):
+            FleetForecaster(data_source=CSVDataSource(self.directory)).run_batch(self.symbols, output_path=self.output)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
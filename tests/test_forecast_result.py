@@ -0,0 +1,94 @@
+import pickle
+import shutil
+import tempfile
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from src.models.data_source import CSVDataSource
+from src.models.forecast_result import ForecastResult
+from src.models.prediction_request import PredictionRequest
+from src.models.predictor import Predictor
+
+
+def make_model(order=(2, 1, 1), periods=300, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2020-01-01', periods=periods, freq='B')
+    data = pd.Series(100 + np.cumsum(rng.normal(size=periods)), index=dates)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return data, ARIMA(data, order=order).fit()
+
+
+class TestForecastResult(unittest.TestCase):
+    def setUp(self):
+        self.data, self.model = make_model()
+
+    def test_matches_statsmodels(self):
+        result = ForecastResult.from_model(self.model, 24, levels=(0.8, 0.95))
+        expected = self.model.get_forecast(24)
+
+        np.testing.assert_allclose(result.mean, expected.predicted_mean.to_numpy())
+        np.testing.assert_allclose(result.variance, expected.var_pred_mean.to_numpy())
+        self.assertTrue(result.point.index.equals(self.model.forecast(24).index))
+        for level in (0.8, 0.95):
+            interval = expected.conf_int(alpha=1 - level).to_numpy()
+            np.testing.assert_allclose(result.interval(level).to_numpy(), interval)
+
+    def test_simulated_paths(self):
+        result = ForecastResult.from_model(self.model, 10, n_paths=20_000, seed=1)
+        self.assertEqual(result.paths.shape, (20_000, 10))
+        np.testing.assert_allclose(result.paths.mean(axis=0), result.mean, atol=0.1)
+        np.testing.assert_allclose(result.paths.var(axis=0), result.variance, rtol=0.05)
+
+        quantiles = result.quantiles([0.025, 0.975])
+        inside = (result.paths >= quantiles[0.025].to_numpy()) & (result.paths <= quantiles[0.975].to_numpy())
+        self.assertAlmostEqual(inside.mean(), 0.95, places=2)
+
+        again = ForecastResult.from_model(self.model, 10, n_paths=20_000, seed=1)
+        np.testing.assert_array_equal(again.paths, result.paths)
+
+    def test_frame_and_pickle(self):
+        result = ForecastResult.from_model(self.model, 5, levels=(0.5, 0.99))
+        self.assertEqual(list(result.to_frame().columns), ['mean', 'lower_50', 'upper_50', 'lower_99', 'upper_99'])
+        self.assertFalse(hasattr(result, '__dict__'))
+
+        restored = pickle.loads(pickle.dumps(result))
+        np.testing.assert_array_equal(restored.upper, result.upper)
+        self.assertIsNone(restored.paths)
+
+        with self.assertRaises(ValueError):
+            result.quantiles([0.5])
+        with self.assertRaises(KeyError):
+            result.interval(0.9)
+        with self.assertRaises(ValueError):
+            ForecastResult(result.index, result.mean, result.variance, levels=(95,))
+
+
+class TestForecastDistribution(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        data, _ = make_model(periods=150, seed=3)
+        data.to_frame('Close').to_csv(f'{self.directory}/DIST.csv')
+        self.predictor = Predictor(data_source=CSVDataSource(self.directory))
+
+    def tearDown(self):
+        self.predictor.clear_cache()
+        shutil.rmtree(self.directory)
+
+    def test_cached(self):
+        request = self.predictor.predict(PredictionRequest('DIST', years=1, pdq_order=(1, 1, 0), n_paths=100, seed=2))
+        self.assertEqual(request.forecast_result.paths.shape, (100, 12))
+        self.assertTrue(request.forecast.equals(request.forecast_result.point))
+
+        result = self.predictor.make_forecast_distribution(request.model, years=1, n_paths=100, seed=2, symbol='DIST')
+        np.testing.assert_array_equal(result.paths, request.forecast_result.paths)
+        self.assertEqual(self.predictor.metrics.snapshot()['counters']['forecast_cache_hits'], 1)
+
+        other = self.predictor.make_forecast_distribution(request.model, years=1, n_paths=100, seed=3, symbol='DIST')
+        self.assertFalse(np.array_equal(other.paths, result.paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.controllers.forecast_scheduler import ForecastScheduler
+from src.controllers.forecast_service import ForecastService, SymbolNotFound
+from src.models.cache_handler import CacheHandler
+from src.models.data_source import CSVDataSource
+from src.models.prediction_request import PredictionRequest
+from src.models.predictor import Predictor
+from src.models.watchlist import Watchlist
+
+
+class TestForecastScheduler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(9)
+        dates = pd.date_range('2022-01-03', periods=150, freq='B')
+        self.symbols = ['WATCH1', 'WATCH2']
+        for symbol in self.symbols:
+            close = 30 + np.cumsum(rng.normal(size=150))
+            pd.DataFrame({'Close': close}, index=dates).to_csv(os.path.join(self.directory, f'{symbol}.csv'))
+
+        self.predictor = Predictor(data_source=CSVDataSource(self.directory))
+        for symbol in self.symbols + ['MISSING']:
+            self.predictor.watchlist.add(symbol)
+        self.scheduler = ForecastScheduler(
+            self.predictor,
+            self.predictor.watchlist,
+            self.predictor.precomputed,
+            request_factory=lambda symbol: PredictionRequest(symbol, pdq_order=(1, 1, 0)),
+        )
+
+    def tearDown(self):
+        self.scheduler.stop(timeout=5)
+        for symbol in self.symbols + ['MISSING']:
+            self.predictor.watchlist.remove(symbol)
+            self.predictor.precomputed.delete(symbol)
+        shutil.rmtree(self.directory)
+
+    def test_run_once(self):
+        requests = self.predictor.watchlist.requests()
+        for _ in range(requests.get('WATCH1', 0) + 1):
+            self.predictor.watchlist.record_request('WATCH2')
+        self.assertEqual(self.predictor.watchlist.by_priority()[0], 'WATCH2')
+
+        outcomes = self.scheduler.run_once()
+        self.assertEqual(list(outcomes)[0], 'WATCH2')
+        self.assertEqual(outcomes['WATCH1'], 'computed')
+        self.assertTrue(outcomes['MISSING'].startswith('ValueError'))
+
+        record = self.predictor.precomputed.load('WATCH1')
+        self.assertFalse(record['stale'])
+        self.assertEqual(len(record['forecast']), 24)
+        self.assertEqual(self.predictor.precomputed.metadata('WATCH1')['last_date'], '2022-07-29T00:00:00')
+
+        self.assertEqual(self.scheduler.run_once()['WATCH1'], 'fresh')
+        self.predictor.precomputed.max_age = 0
+        self.assertEqual(self.scheduler.run_once()['WATCH1'], 'computed')
+
+    def test_next_run(self):
+        friday_night = datetime(2024, 5, 3, 20, 0)
+        self.assertEqual(self.scheduler.next_run(friday_night), datetime(2024, 5, 6, 18, 30))
+        self.assertEqual(self.scheduler.next_run(datetime(2024, 5, 6, 9, 0)), datetime(2024, 5, 6, 18, 30))
+        self.scheduler.interval = 60
+        self.assertEqual(self.scheduler.next_run(friday_night), datetime(2024, 5, 3, 20, 1))
+
+    def test_start_and_stop(self):
+        done = threading.Event()
+        run_once = self.scheduler.run_once
+        self.scheduler.run_once = lambda force=False: (run_once(force), done.set())
+        self.scheduler.start()
+        self.assertTrue(done.wait(60))
+        self.scheduler.stop(timeout=5)
+        self.assertIsNotNone(self.predictor.precomputed.load('WATCH2'))
+
+    def test_service_answers_from_the_store(self):
+        self.scheduler.run_once()
+        requests = self.predictor.watchlist.requests().get('WATCH1', 0)
+        service = ForecastService(predictor=self.predictor, max_workers=1)
+        try:
+            answer = service.forecast('WATCH1', steps=5, levels=(0.95,))
+            self.assertTrue(answer['precomputed'])
+            self.assertEqual(len(answer['forecast']), 5)
+            self.assertEqual(len(answer['intervals']['0.95']['lower']), 5)
+            self.assertEqual(len(service._fitted), 0)  # Nothing was fitted
+
+            self.assertNotIn('precomputed', service.forecast('WATCH1', steps=30))
+            watched = {entry['symbol']: entry for entry in service.watchlist()['symbols']}
+            self.assertFalse(watched['WATCH1']['precomputed']['stale'])
+            self.assertEqual(watched['WATCH1']['requests'], requests + 2)
+
+            unknown = self.predictor.watchlist.requests().get('MISSING', 0)
+            with self.assertRaises(SymbolNotFound):
+                service.forecast('MISSING', steps=5)
+            self.assertEqual(self.predictor.watchlist.requests().get('MISSING', 0), unknown)  # Not counted
+        finally:
+            service.shutdown()
+
+
+class TestWatchlist(unittest.TestCase):
+    def setUp(self):
+        self.cache = CacheHandler()
+        self.gui = Watchlist(self.cache, flush_every=3)
+        self.service = Watchlist(CacheHandler(memory_bytes=0), flush_every=3)  # Another process, without the memory tier
+
+    def tearDown(self):
+        for symbol in ('SHARED1', 'SHARED2'):
+            self.gui.remove(symbol)
+
+    def test_adds_are_merged(self):
+        self.gui.add('SHARED1')
+        self.service.add('SHARED2')
+        self.assertTrue({'SHARED1', 'SHARED2'} <= set(self.service.symbols()))
+        self.gui.remove('SHARED1')
+        self.assertIn('SHARED2', self.service.symbols())
+        self.assertNotIn('SHARED1', self.service.symbols())
+
+    def test_requests_are_flushed_in_batches(self):
+        before = self.service.requests().get('SHARED1', 0)
+        self.gui.record_request('SHARED1')
+        self.gui.record_request('SHARED1')
+        self.assertEqual(self.gui.requests()['SHARED1'], before + 2)  # Counted in memory
+        self.assertEqual(self.service.requests().get('SHARED1', 0), before)  # Not saved yet
+
+        self.service.record_request('SHARED1')
+        self.gui.record_request('SHARED1')  # The third request of the GUI saves its batch
+        self.service.flush()
+        self.assertEqual(self.service.requests()['SHARED1'], before + 4)
+
+    def test_unwatched_requests_are_bounded(self):
+        watchlist = Watchlist(self.cache, flush_every=1, max_tracked=0)
+        watchlist.add('SHARED1')
+        watchlist.record_request('SHARED1')
+        watchlist.record_request('SHARED2')
+        self.assertIn('SHARED1', watchlist.requests())
+        self.assertNotIn('SHARED2', watchlist.requests())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import numpy as np
+import pandas as pd
+from src.controllers.forecast_service import ForecastService, ServiceBusy, create_forecast_server
+from src.models.data_source import CSVDataSource
+from src.models.order_search import OrderSearch
+from src.models.predictor import Predictor
+
+class TestForecastService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(2)
+        dates = pd.date_range('2022-01-03', periods=200, freq='B')
+        close = 80 + np.cumsum(rng.normal(size=200))
+        pd.DataFrame({'Close': close}, index=dates).to_csv(os.path.join(self.directory, 'SVC1.csv'))
+
+        order_search = OrderSearch(p_values=range(0, 2), q_values=range(0, 2), d_values=[1], max_workers=1)
+        predictor = Predictor(data_source=CSVDataSource(self.directory), order_search=order_search)
+        self.service = ForecastService(predictor=predictor, max_workers=2, max_pending=2)
+        self.server = create_forecast_server(self.service, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.shutdown()
+        shutil.rmtree(self.directory)
+
+    def get(self, path):
+        try:
+            with urlopen(self.url + path) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as error:
+            return error.code, json.loads(error.read())
+
+    def test_endpoints(self):
+        status, forecast = self.get('/forecast?symbol=SVC1&steps=5')
+        self.assertEqual(status, 200)
+        self.assertEqual(len(forecast['forecast']), 5)
+        self.assertEqual(forecast['last_date'], '2022-10-07T00:00:00')
+
+        status, prediction = self.get('/prediction?symbol=SVC1')
+        self.assertEqual(status, 200)
+        self.assertEqual(len(prediction['prediction']), 200)
+
+        status, order = self.get('/order?symbol=SVC1')
+        self.assertEqual(status, 200)
+        self.assertEqual(order['order'], forecast['order'])
+
+        self.assertEqual(self.service.metrics.snapshot()['counters'].get('service_model_hits'), 1)
+        self.assertEqual(self.get('/health'), (200, {'status': 'ok', 'in_flight': 0, 'models': 1}))
+
+    def test_errors(self):
+        self.assertEqual(self.get('/forecast')[0], 400)
+        self.assertEqual(self.get('/forecast?symbol=SVC1&steps=0')[0], 400)
+        self.assertEqual(self.get('/forecast?symbol=MISSING')[0], 404)
+        self.assertEqual(self.get('/unknown')[0], 404)
+        self.assertEqual(self.get('/forecast?symbol=SVC1&levels=1.5')[0], 400)
+
+    def test_forecast_intervals(self):
+        status, forecast = self.get('/forecast?symbol=SVC1&steps=5&levels=0.8,0.95')
+        self.assertEqual(status, 200)
+        self.assertEqual(set(forecast['intervals']), {'0.8', '0.95'})
+        for date, value in forecast['forecast'].items():
+            self.assertLess(forecast['intervals']['0.95']['lower'][date], forecast['intervals']['0.8']['lower'][date])
+            self.assertLess(forecast['intervals']['0.8']['lower'][date], value)
+            self.assertLess(value, forecast['intervals']['0.8']['upper'][date])
+
+    def test_requests_are_coalesced(self):
+        release = threading.Event()
+        first = self.service.submit(('model', 'SVC1'), lambda: release.wait(10))
+        second = self.service.submit(('model', 'SVC1'), lambda: self.fail('the task must not run twice'))
+        self.assertIs(first, second)
+
+        self.service.submit(('order', 'SVC1'), lambda: release.wait(10))
+        with self.assertRaises(ServiceBusy):
+            self.service.submit(('order', 'OTHER'), lambda: None)
+
+        release.set()
+        self.assertTrue(first.result(timeout=10))
+
+    def test_timeout_is_504(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.service._timeout = 0.2
+        self.service.submit(('model', 'SVC1'), lambda: release.wait(10))
+        status, body = self.get('/forecast?symbol=SVC1&steps=5')
+        self.assertEqual(status, 504)
+        self.assertIn('SVC1', body['error'])
+
+    def test_models_in_memory_are_bounded(self):
+        service = ForecastService(predictor=self.service.predictor, max_workers=1, model_bytes=1)
+        self.addCleanup(service.shutdown)
+        service.forecast('SVC1', steps=5)
+        self.assertEqual(service.health()['models'], 0)
+
+    def test_profile(self):
+        status, forecast = self.get('/forecast?symbol=SVC1&steps=5&profile=1')
+        self.assertEqual(status, 200)
+        self.assertIn('_load_model', forecast['profile'])
+        self.assertEqual(len(forecast['forecast']), 5)
+        self.assertNotIn('profile', self.get('/order?symbol=SVC1')[1])
+        self.assertEqual(self.service.metrics.snapshot()['counters']['service_profiled'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import pandas as pd
+from src.models.cache_handler import CacheHandler
+from src.models.history_store import HistoryStore
+
+class FakeDownloader:
+    def __init__(self, data):
+        self.data = data
+        self.starts = []
+
+    def __call__(self, symbol, start=None):
+        self.starts.append(start)
+        if start is None:
+            return self.data
+        return self.data[self.data.index >= start]
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.cache = CacheHandler()
+        dates = pd.date_range('2024-01-01', periods=10, freq='B')
+        self.data = pd.DataFrame({'Close': range(10), 'Open': range(10)}, index=dates, dtype=float)
+        self.downloader = FakeDownloader(self.data.iloc[:6])
+        self.store = HistoryStore(cache=self.cache, downloader=self.downloader, refresh_interval=0)
+        self.store.delete('FAKE')
+
+    def test_first_refresh_downloads_full_history(self):
+        history = self.store.refresh('FAKE')
+        self.assertEqual(self.downloader.starts, [None])
+        self.assertEqual(list(history.columns), ['Close'])
+        self.assertEqual(len(history), 6)
+
+    def test_refresh_only_requests_new_bars(self):
+        self.store.refresh('FAKE')
+        changed = self.data.copy()
+        changed.iloc[5, 0] = 50.0  # The last stored session was incomplete
+        self.downloader.data = changed
+
+        history = self.store.refresh('FAKE')
+        self.assertEqual(self.downloader.starts[-1], self.data.index[4])
+        self.assertEqual(len(history), 10)
+        self.assertEqual(history['Close'].iloc[5], 50.0)
+        self.assertTrue(history.index.is_monotonic_increasing)
+
+    def test_adjusted_history_is_downloaded_again(self):
+        self.store.refresh('FAKE')
+        adjusted = self.data.copy()
+        adjusted['Close'] /= 2  # A split changes every past close
+        self.downloader.data = adjusted
+
+        history = self.store.refresh('FAKE')
+        self.assertEqual(self.downloader.starts[-2:], [self.data.index[4], None])
+        self.assertEqual(history['Close'].tolist(), adjusted['Close'].tolist())
+        self.assertEqual(self.store.load('FAKE')['Close'].tolist(), adjusted['Close'].tolist())
+
+    def test_refresh_keeps_history_without_new_data(self):
+        self.store.refresh('FAKE')
+        self.downloader.data = self.data.iloc[:0]
+        history = self.store.refresh('FAKE')
+        self.assertEqual(len(history), 6)
+
+    def test_fresh_history_is_not_downloaded(self):
+        store = HistoryStore(cache=self.cache, downloader=self.downloader, refresh_interval=3600)
+        store.refresh('FAKE')
+        store.refresh('FAKE')
+        self.assertEqual(len(self.downloader.starts), 1)
+
+    def tearDown(self):
+        self.store.delete('FAKE')
+        self.cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
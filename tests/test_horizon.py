@@ -0,0 +1,82 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.models.data_source import CSVDataSource
+from src.models.horizon import Horizon
+from src.models.prediction_request import PredictionRequest
+from src.models.predictor import Predictor
+
+
+def make_daily(periods=2600, seed=6):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2014-01-01', periods=periods, freq='B')
+    return pd.Series(100 + np.cumsum(rng.normal(size=periods)), index=dates)
+
+
+class TestHorizon(unittest.TestCase):
+    def setUp(self):
+        self.data = make_daily()
+
+    def test_monthly(self):
+        horizon = Horizon(years=2, frequency='M')
+        resampled = horizon.prepare(self.data)
+
+        self.assertEqual(horizon.steps, 24)
+        self.assertEqual(len(resampled), 120)
+        self.assertEqual(resampled.index.freqstr, 'ME')
+        self.assertEqual(resampled.iloc[-1], self.data.iloc[-1])
+        self.assertEqual(resampled.loc['2020-06-30'], self.data.loc[:'2020-06-30'].iloc[-1])
+
+    def test_weekly_and_daily(self):
+        weekly = Horizon(years=1, frequency='W')
+        self.assertEqual(weekly.steps, 52)
+        self.assertEqual(weekly.prepare(self.data).index.freqstr, 'W-FRI')
+
+        daily = Horizon(years=0.5, frequency='D')
+        resampled = daily.prepare(self.data)
+        self.assertEqual(daily.steps, 126)
+        self.assertEqual(len(resampled), 630)
+        self.assertTrue(resampled.equals(self.data.iloc[-630:]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Horizon(frequency='Q')
+        with self.assertRaises(ValueError):
+            Horizon(years=0)
+        self.assertEqual(Horizon().cache_symbol('AAPL'), 'AAPL@M')
+
+
+class TestHorizonForecast(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        make_daily().to_frame('Close').to_csv(f'{self.directory}/HRZ.csv')
+        self.predictor = Predictor(data_source=CSVDataSource(self.directory))
+
+    def tearDown(self):
+        self.predictor.clear_cache()
+        shutil.rmtree(self.directory)
+
+    def test_make_horizon_forecast(self):
+        data = self.predictor.download_stock_closing_data('HRZ')
+        forecast = self.predictor.make_horizon_forecast(data, years=2, frequency='M', pdq_order=(1, 1, 0))
+
+        self.assertEqual(len(forecast), 24)
+        last_month = data.index[-1] + pd.offsets.MonthEnd(0)
+        self.assertEqual(forecast.index[0], last_month + pd.offsets.MonthEnd(1))
+        self.assertEqual(forecast.index[-1], last_month + pd.offsets.MonthEnd(24))
+        self.assertEqual(self.predictor.get_arima_model().nobs, 120)
+
+    def test_predict_with_frequency(self):
+        request = self.predictor.predict(PredictionRequest('HRZ', years=1, pdq_order=(1, 1, 0), frequency='W'))
+        self.assertEqual(len(request.forecast), 52)
+        self.assertEqual(request.forecast.index.freqstr, 'W-FRI')
+        self.assertEqual(len(request.data), 260)
+        self.assertEqual(len(request.performance_prediction), 260)
+        self.assertIsNotNone(self.predictor._models.load_latest('HRZ@W'))
+        self.assertIsNone(self.predictor._models.load_latest('HRZ'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import time
+import unittest
+import numpy as np
+from src.models.lru_cache import MISSING, LRUCache, sizeof
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(max_bytes=3000, sizeof=lambda value: len(value))
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        self.cache.set('a', 'x' * 1000)
+        self.cache.set('b', 'x' * 1000)
+        self.cache.set('c', 'x' * 1000)
+        self.cache.get('a')
+        self.cache.set('d', 'x' * 1500)
+
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+        self.assertNotIn('c', self.cache)
+        stats = self.cache.stats()
+        self.assertEqual(stats['evictions'], 2)
+        self.assertEqual(stats['bytes'], 2500)
+
+    def test_too_large_values_are_not_kept(self):
+        self.assertFalse(self.cache.set('big', 'x' * 4000))
+        self.assertIs(self.cache.lookup('big'), MISSING)
+
+    def test_expiration(self):
+        self.cache.set('a', 'x', expire_at=time.time() - 1)
+        self.cache.set('b', 'y', expire_at=time.time() + 60)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('b'), 'y')
+        self.assertEqual(self.cache.stats()['expirations'], 1)
+
+    def test_hits_and_misses(self):
+        self.cache.set('none', [])
+        self.cache.get('none')
+        self.cache.get('missing')
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_sizeof(self):
+        self.assertEqual(sizeof(np.zeros(100)), 800)
+        self.assertGreater(sizeof({'order': (1, 1, 1), 'params': list(range(100))}), 100)
+
+    def test_sizeof_does_not_pickle(self):
+        class Unpicklable:
+            def __init__(self):
+                self.values = np.zeros(1000)
+                self.view = self.values[:10]  # Shares the buffer, counted once
+                self.callback = lambda: None
+
+            def __reduce__(self):
+                raise AssertionError('sizeof must not pickle')
+
+        size = sizeof(Unpicklable())
+        self.assertGreaterEqual(size, 8000)
+        self.assertLess(size, 16000)
+
+
+if __name__ == '__main__':
+    unittest.main()
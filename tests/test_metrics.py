@@ -0,0 +1,53 @@
+import json
+import logging
+import unittest
+from src.models.metrics import Metrics
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_span_and_counter(self):
+        for _ in range(3):
+            with self.metrics.span('fit'):
+                pass
+        self.metrics.incr('fits')
+        self.metrics.incr('fits', 2)
+
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['spans']['fit']['count'], 3)
+        self.assertGreaterEqual(snapshot['spans']['fit']['max_seconds'], 0)
+        self.assertEqual(snapshot['counters'], {'fits': 3})
+
+    def test_span_records_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.metrics.span('download'):
+                raise ValueError()
+        self.assertEqual(self.metrics.snapshot()['spans']['download']['count'], 1)
+
+    def test_to_prometheus(self):
+        with self.metrics.span('forecast'):
+            pass
+        self.metrics.incr('cache_hits')
+        text = self.metrics.to_prometheus()
+        self.assertIn('stockpredictor_stage_seconds_count{stage="forecast"} 1', text)
+        self.assertIn('stockpredictor_cache_hits_total 1', text)
+
+    def test_log(self):
+        self.metrics.incr('fits')
+        with self.assertLogs('stockpredictor.metrics', level=logging.INFO) as logs:
+            self.metrics.log()
+        self.assertEqual(json.loads(logs.records[0].getMessage()), {'counter': 'fits', 'value': 1})
+
+    def test_profile(self):
+        with self.metrics.profile() as profile:
+            sorted(range(1000))
+        self.assertIn('function calls', profile.text)
+
+        with self.metrics.profile(enabled=False) as profile:
+            pass
+        self.assertEqual(profile.text, '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA, ARIMAResultsWrapper
+from src.models.cache_handler import CacheHandler, fingerprint
+from src.models.model_store import ModelStore
+from src.models.predictor import Predictor
+
+class TestModelStore(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        dates = pd.date_range('2020-01-01', periods=300, freq='B')
+        self.data = pd.Series(100 + np.cumsum(rng.normal(size=300)), index=dates)
+        self.cache = CacheHandler()
+        self.store = ModelStore(self.cache)
+        self.model = ARIMA(self.data, order=(1, 1, 1)).fit()
+
+    def test_save_and_load(self):
+        record = self.store.save('MODEL', self.data, self.model)
+        loaded = self.store.load('MODEL', (1, 1, 1), self.data)
+        np.testing.assert_array_equal(loaded['params'], record['params'])
+        self.assertEqual(loaded['cov_params'].shape, (3, 3))
+        self.assertEqual(self.store.load_latest('MODEL')['fingerprint'], record['fingerprint'])
+
+    def test_changed_data_is_not_loaded(self):
+        self.store.save('MODEL', self.data, self.model)
+        self.assertIsNone(self.store.load('MODEL', (1, 1, 1), self.data.iloc[:-1]))
+        self.assertIsNone(self.store.load('MODEL', (2, 1, 1), self.data))
+
+    def test_restore(self):
+        record = self.store.save('MODEL', self.data, self.model)
+        restored = self.store.restore(self.data, record)
+        self.assertTrue(isinstance(restored, ARIMAResultsWrapper))
+        np.testing.assert_allclose(restored.forecast(10), self.model.forecast(10))
+
+    def test_predictor_reuses_fitted_model(self):
+        predictor = Predictor()
+        predictor.create_ARIMA_model(self.data, (1, 1, 1), symbol='MODEL')
+        with mock.patch.object(ARIMA, 'fit', side_effect=AssertionError('fitted again')):
+            model = predictor.create_ARIMA_model(self.data, (1, 1, 1), symbol='MODEL')
+        np.testing.assert_allclose(model.forecast(5), self.model.forecast(5))
+        self.assertEqual(predictor.metrics.snapshot()['counters']['model_cache_hits'], 1)
+
+    def tearDown(self):
+        self.cache.delete(['arima_MODEL_latest', ModelStore.key('MODEL', (1, 1, 1), fingerprint(self.data))])
+        self.cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
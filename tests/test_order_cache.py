@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from time import sleep
+from src.models.cache_handler import CacheHandler
+from src.models.order_cache import OrderCache
+from src.models.order_search import OrderSearch, SearchResult
+
+class TestOrderCache(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        dates = pd.date_range('2020-01-01', periods=300, freq='B')
+        self.data = pd.Series(100 + np.cumsum(rng.normal(size=300)), index=dates)
+        self.cache = CacheHandler()
+        self.orders = OrderCache(self.cache, revalidation_search=OrderSearch(max_workers=2))
+        self.orders.invalidate('ORDER')
+        self.cache.delete([self.orders.key('ORDER', data) for data in (self.data, self.data.iloc[:-1], self.data.iloc[:10])])
+        self.search = mock.Mock(return_value=(1, 1, 1))
+
+    def test_hit_after_search(self):
+        self.assertEqual(self.orders.get_or_search('ORDER', self.data, self.search), (1, 1, 1))
+        self.assertEqual(self.orders.get_or_search('ORDER', self.data, self.search), (1, 1, 1))
+        self.search.assert_called_once()
+        self.assertEqual(self.orders.stats()['hits'], 1)
+        self.assertEqual(self.orders.stats()['misses'], 1)
+
+    def test_new_bars_without_drift_reuse_the_order(self):
+        self.orders.get_or_search('ORDER', self.data.iloc[:-1], self.search)
+        with mock.patch.object(OrderSearch, 'run') as run:
+            pdq_order = self.orders.get_or_search('ORDER', self.data, self.search)
+
+        self.assertEqual(pdq_order, (1, 1, 1))
+        run.assert_not_called()
+        self.search.assert_called_once()
+        self.assertEqual(self.orders.stats()['reuses'], 1)
+        self.assertEqual(self.orders.stats()['revalidations'], 0)
+
+    def test_drift_revalidates_neighbours(self):
+        self.orders.get_or_search('ORDER', self.data.iloc[:-1], self.search)
+        jump = self.data.copy()
+        jump.iloc[-1] += 20  # Twenty standard deviations of the daily changes
+        with mock.patch.object(OrderSearch, 'run', autospec=True, return_value=SearchResult((0, 1, 1), {(0, 1, 1): 1.0})) as search:
+            pdq_order = self.orders.get_or_search('ORDER', jump, self.search)
+
+        self.assertEqual(pdq_order, (0, 1, 1))
+        search.assert_called_once()
+        self.assertEqual(self.orders.stats()['revalidations'], 1)
+        self.cache.delete(self.orders.key('ORDER', jump))
+
+    def test_changed_data_revalidates_neighbours(self):
+        self.orders = OrderCache(self.cache, revalidation_search=OrderSearch(max_workers=2), drift_level=None)
+        self.orders.get_or_search('ORDER', self.data.iloc[:-1], self.search)
+        with mock.patch.object(OrderSearch, 'run', autospec=True, return_value=SearchResult((0, 1, 1), {(0, 1, 1): 1.0})) as search:
+            pdq_order = self.orders.get_or_search('ORDER', self.data, self.search)
+
+        self.assertEqual(pdq_order, (0, 1, 1))
+        self.search.assert_called_once()
+        neighbours = search.call_args.args[0]
+        self.assertEqual(neighbours._p_values, [0, 1, 2])
+        self.assertEqual(neighbours._d_values, [1])
+        self.assertEqual(self.orders.stats()['revalidations'], 1)
+
+    def test_revalidates_with_auto_arima_without_a_search(self):
+        orders = OrderCache(self.cache, drift_level=None)
+        orders.get_or_search('ORDER', self.data.iloc[:-1], mock.Mock(return_value=(2, 1, 2)))
+        with mock.patch.object(OrderSearch, 'run') as run:
+            p, d, q = orders.get_or_search('ORDER', self.data, self.search)
+
+        run.assert_not_called()
+        self.search.assert_not_called()
+        self.assertEqual(d, 1)
+        self.assertIn(p, (1, 2, 3))
+        self.assertIn(q, (1, 2, 3))
+        self.assertEqual(orders.stats()['revalidations'], 1)
+
+    def test_order_kept_without_estimate_is_revalidated(self):
+        self.cache.insert_tmp({'pdq_ORDER_latest': (1, 1, 1)}, 60)
+        with mock.patch.object(OrderSearch, 'run', autospec=True, return_value=SearchResult((1, 1, 1), {(1, 1, 1): 1.0})):
+            self.orders.get_or_search('ORDER', self.data, self.search)
+        self.assertEqual(self.orders.stats()['revalidations'], 1)
+        self.assertEqual(self.cache.get('pdq_ORDER_latest')['order'], (1, 1, 1))
+
+    def test_counters_are_thread_safe(self):
+        from concurrent.futures import ThreadPoolExecutor
+        self.orders.get_or_search('ORDER', self.data, self.search)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: self.orders.get_or_search('ORDER', self.data, self.search), range(200)))
+        self.assertEqual(self.orders.stats()['hits'], 200)
+
+    def test_ttl(self):
+        orders = OrderCache(self.cache, ttl=1)
+        orders.invalidate('ORDER')
+        orders.get_or_search('ORDER', self.data.iloc[:10], self.search)
+        sleep(2)
+        orders.get_or_search('ORDER', self.data.iloc[:10], self.search)
+        self.assertEqual(self.search.call_count, 2)
+
+    def tearDown(self):
+        self.orders.invalidate('ORDER')
+        self.cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+from benchmarks.bench_order_prescreen import run_benchmark
+from src.models.order_prescreen import PrescreenOrderSearch
+
+
+class TestPrescreenOrderSearch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        noise = rng.normal(size=400)
+        ar = np.zeros(400)
+        for t in range(1, 400):
+            ar[t] = 0.7 * ar[t - 1] + noise[t]
+        dates = pd.date_range('2020-01-01', periods=400, freq='B')
+        self.data = pd.Series(100 + np.cumsum(ar), index=dates)
+
+    def test_search(self):
+        search = PrescreenOrderSearch(p_values=range(0, 3), q_values=range(0, 3), d_values=[1])
+        result = search.run(self.data)
+        self.assertEqual(result.order, (1, 1, 0))
+        self.assertEqual(result.results[result.order], min(result.results.values()))
+        self.assertEqual(search.search(self.data), (1, 1, 0))
+
+    def test_fits_only_the_finalists(self):
+        result = PrescreenOrderSearch(d_values=[1], top_k=3).run(self.data)
+        self.assertEqual(len(result.approximate), 36)
+        self.assertEqual(result.fits_avoided, 0)
+        self.assertLessEqual(len(result.results), 3 + 4)
+        ranked = sorted(result.approximate, key=result.approximate.get)
+        self.assertTrue(set(ranked[:3]) <= set(result.results))
+        for order in set(result.results) - set(ranked[:3]):
+            self.assertEqual(sum(abs(i - j) for i, j in zip(order, ranked[0])), 1)
+            self.assertLessEqual(result.approximate[order], result.approximate[ranked[0]] + 2)
+
+    def test_exact_fits_in_processes(self):
+        search = PrescreenOrderSearch(p_values=range(0, 3), q_values=range(0, 3), d_values=[1], max_workers=2)
+        self.addCleanup(search.close)
+        self.assertEqual(search.run(self.data).order, (1, 1, 0))
+        self.assertIs(search.around((1, 1, 0))._pool, search._pool)
+
+    def test_choose_d(self):
+        search = PrescreenOrderSearch(p_values=range(0, 2), q_values=range(0, 2))
+        p, d, q = search.search(self.data)
+        self.assertEqual(d, 1)
+
+    def test_around(self):
+        result = PrescreenOrderSearch(top_k=2).around((1, 1, 0)).run(self.data)
+        self.assertEqual(result.order[1], 1)
+        self.assertEqual(len(result.approximate), 6)
+
+    def test_short_series_shrink_the_grid(self):
+        for length in (40, 12):
+            result = PrescreenOrderSearch().run(self.data.iloc[:length])
+            self.assertLessEqual(max(p + q for p, _, q in result.approximate), 2 * (length // 3))
+            self.assertIn(result.order, result.results)
+
+    def test_concurrent_searches_keep_their_results(self):
+        search = PrescreenOrderSearch(p_values=range(0, 3), q_values=range(0, 3), d_values=[1])
+        results = {}
+
+        def run(name, data):
+            results[name] = search.run(data)
+
+        threads = [threading.Thread(target=run, args=('long', self.data)), threading.Thread(target=run, args=('short', self.data.iloc[:60]))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertNotEqual(results['long'].approximate, results['short'].approximate)
+        self.assertEqual(results['long'].order, (1, 1, 0))
+
+    def test_top_k(self):
+        with self.assertRaises(ValueError):
+            PrescreenOrderSearch(top_k=0)
+
+    def test_against_auto_arima(self):
+        # One series of each order of the benchmark, seeds 0 to 9
+        result = run_benchmark(length=600, repeat=1, top_k=3)
+        self.assertGreaterEqual(result['aic_as_good_rate'], 0.4)
+        self.assertGreaterEqual(result['aic_within_2_rate'], 0.7)
+        self.assertLess(result['exact_fits'], result['auto_arima_fits'] / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+from src.models.order_search import OrderSearch
+
+class TestOrderSearch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        noise = rng.normal(size=400)
+        ar = np.zeros(400)
+        for t in range(1, 400):
+            ar[t] = 0.7 * ar[t - 1] + noise[t]
+        dates = pd.date_range('2020-01-01', periods=400, freq='B')
+        self.data = pd.Series(100 + np.cumsum(ar), index=dates)
+        self.ma_data = pd.Series(100 + np.cumsum(noise[1:] + 0.8 * noise[:-1]), index=dates[1:])
+
+    def test_search(self):
+        search = OrderSearch(p_values=range(0, 3), q_values=range(0, 3), d_values=[1], max_workers=2)
+        self.addCleanup(search.close)
+        result = search.run(self.data)
+        self.assertEqual(result.order, (1, 1, 0))
+        self.assertEqual(result.results[result.order], min(result.results.values()))
+        self.assertEqual(search.search(self.data), (1, 1, 0))
+
+    def test_abandon_worse_candidates(self):
+        search = OrderSearch(p_values=range(0, 4), q_values=range(0, 4), d_values=[1], max_workers=2, abandon_delta=0)
+        self.addCleanup(search.close)
+        result = search.run(self.data)
+        self.assertLess(len(result.results), 16)
+
+    def test_choose_d(self):
+        search = OrderSearch(p_values=range(0, 2), q_values=range(0, 1), max_workers=2)
+        self.addCleanup(search.close)
+        p, d, q = search.search(self.data)
+        self.assertEqual(d, 1)
+
+    def test_concurrent_searches_keep_their_results(self):
+        search = OrderSearch(p_values=range(0, 2), q_values=range(0, 2), d_values=[1], max_workers=2)
+        self.addCleanup(search.close)
+        results = {}
+
+        def run(name, data):
+            results[name] = search.run(data)
+
+        threads = [threading.Thread(target=run, args=('ar', self.data)), threading.Thread(target=run, args=('ma', self.ma_data))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results['ar'].order, (1, 1, 0))
+        self.assertEqual(results['ma'].order, (0, 1, 1))
+        self.assertNotEqual(results['ar'].results, results['ma'].results)
+
+    def test_processes_are_reused(self):
+        search = OrderSearch(p_values=range(0, 2), q_values=range(0, 1), d_values=[1], max_workers=2)
+        self.addCleanup(search.close)
+        search.run(self.data)
+        workers = list(search._pool._workers)
+        search.around((1, 1, 0)).run(self.data)
+        self.assertTrue(set(workers) <= set(search._pool._workers))
+        self.assertLessEqual(len(search._pool), 2)
+
+    def test_fit_timeout_kills_the_worker(self):
+        search = OrderSearch(p_values=range(0, 2), q_values=range(0, 2), d_values=[1], max_workers=2, fit_timeout=0.001)
+        self.addCleanup(search.close)
+        with self.assertRaises(ValueError):
+            search.run(self.data)
+        self.assertGreater(search._pool.killed, 0)
+        self.assertEqual(len(search._pool), 0)  # No stuck worker is left running
+
+
+if __name__ == '__main__':
+    unittest.main()
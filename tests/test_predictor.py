@@ -1,6 +1,14 @@
+import io
+import shutil
+import tempfile
+import threading
 import unittest
-from pandas import Series
+from contextlib import redirect_stdout
+import numpy as np
+from pandas import DataFrame, Series, date_range
 from statsmodels.tsa.arima.model import ARIMAResultsWrapper
+from src.models.data_source import CSVDataSource
+from src.models.prediction_request import PredictionRequest
 from src.models.predictor import Predictor
 
 class TestPredictor(unittest.TestCase):
@@ -65,6 +73,93 @@ class TestPredictor(unittest.TestCase):
         expected_data = self.predictor.get_data_on_process()
         self.assertTrue(isinstance(expected_data, Series))
 
+class TestPredictorDownloadMany(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        dates = date_range('2024-01-01', periods=30, freq='B')
+        for i, symbol in enumerate(['FAKE1', 'FAKE2']):
+            DataFrame({'Close': np.arange(30.0 - i) + i}, index=dates[i:]).to_csv(f'{self.directory}/{symbol}.csv')
+        self.predictor = Predictor(data_source=CSVDataSource(self.directory))
+        self.predictor.clear_cache()
+
+    def test_download_many(self):
+        data = self.predictor.download_many(['FAKE1', 'FAKE2', 'FAKE1', 'MISSING'], max_workers=2, batch_size=1)
+        self.assertEqual(list(data.keys()), ['FAKE1', 'FAKE2'])
+        self.assertTrue(all(isinstance(series, Series) for series in data.values()))
+
+    def test_download_many_as_frame(self):
+        frame = self.predictor.download_many(['FAKE1', 'FAKE2'], as_frame=True)
+        self.assertTrue(isinstance(frame, DataFrame))
+        self.assertEqual(list(frame.columns), ['FAKE1', 'FAKE2'])
+        self.assertEqual(len(frame), 30)
+
+    def test_download_many_uses_cache(self):
+        self.predictor.download_many(['FAKE1'])
+        shutil.rmtree(self.directory)  # Cached symbols must not be downloaded again
+        data = self.predictor.download_many(['FAKE1'])
+        self.assertIn('FAKE1', data)
+
+    def tearDown(self):
+        self.predictor.clear_cache()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class TestPredictionRequest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(4)
+        dates = date_range('2021-01-01', periods=150, freq='B')
+        self.symbols = ['REQ1', 'REQ2', 'REQ3', 'REQ4']
+        for symbol in self.symbols:
+            DataFrame({'Close': 60 + np.cumsum(rng.normal(size=150))}, index=dates).to_csv(f'{self.directory}/{symbol}.csv')
+        self.predictor = Predictor(data_source=CSVDataSource(self.directory))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_predict(self):
+        stages = []
+        request = self.predictor.predict(PredictionRequest('REQ1', years=1, pdq_order=(1, 1, 0)), report=stages.append)
+        self.assertEqual(stages, ['download', 'order', 'fit', 'forecast', 'prediction'])
+        self.assertEqual(len(request.forecast), 12)
+        self.assertEqual(len(request.performance_prediction), len(request.data))
+        self.assertIsNone(self.predictor._cache.get('symbol_on_process'))
+
+        with self.assertRaises(ValueError):
+            self.predictor.predict(PredictionRequest('MISSING', pdq_order=(1, 1, 0)))
+
+    def test_autofit_without_trace_is_quiet(self):
+        data = self.predictor.load_closing_data('REQ2')
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.predictor.autofit_ARIMA(data, symbol='REQ2', trace=False)
+        self.assertEqual(output.getvalue(), '')
+
+    def test_predict_profile(self):
+        request = self.predictor.predict(PredictionRequest('REQ1', years=1, pdq_order=(1, 1, 0), profile=True))
+        self.assertIn('_run_pipeline', request.profile_report)
+        self.assertIsNone(self.predictor.predict(PredictionRequest('REQ1', years=1, pdq_order=(1, 1, 0))).profile_report)
+
+    def test_concurrent_requests(self):
+        results = {}
+
+        def run(symbol):
+            self.predictor.download_stock_closing_data(symbol)
+            request = self.predictor.predict(PredictionRequest(symbol, pdq_order=(1, 1, 0)))
+            results[symbol] = (request, self.predictor.get_symbol_on_process(), self.predictor.get_arima_model())
+
+        threads = [threading.Thread(target=run, args=(symbol,)) for symbol in self.symbols]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for symbol, (request, symbol_on_process, model) in results.items():
+            self.assertEqual(symbol_on_process, symbol)
+            self.assertIs(model, request.model)
+            self.assertTrue(request.data.equals(self.predictor._load_closing_data(symbol)))
+        self.assertIsNone(self.predictor.get_symbol_on_process())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,92 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.models.batch_arima import BatchARIMA
+from src.models.data_source import CSVDataSource
+from src.models.predictor import Predictor
+from src.models.price_panel import PricePanel, build_panel
+
+
+class TestBuildPanel(unittest.TestCase):
+    def setUp(self):
+        dates = pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05', '2024-01-08'])
+        self.histories = {
+            'AAA': pd.DataFrame({'Close': [1.0, 2.0, 3.0, 4.0, 5.0]}, index=dates),
+            'BBB': pd.DataFrame({'Close': [10.0, np.nan, 30.0]}, index=dates[[0, 2, 4]]),
+            'CCC': pd.Series([7.0, 8.0], index=dates[[3, 3]]),  # Duplicated date
+            'EMPTY': pd.DataFrame({'Close': []}),
+        }
+
+    def test_observed_calendar(self):
+        panel = build_panel(self.histories)
+
+        self.assertEqual(panel.symbols, ['AAA', 'BBB', 'CCC'])
+        self.assertEqual(len(panel.dates), 5)  # 2024-01-01 (holiday) is not padded
+        self.assertTrue(panel.values.flags['F_CONTIGUOUS'])
+        self.assertEqual(panel.values.dtype, np.float64)
+        np.testing.assert_array_equal(panel.mask[:, 1], [True, False, False, False, True])
+        self.assertEqual(panel.column('CCC')[3], 8.0)
+        self.assertTrue(np.shares_memory(panel.column('AAA'), panel.values))
+        self.assertEqual(panel.span('BBB'), (0, 4))
+        self.assertEqual(panel.series('BBB').tolist(), [10.0, 30.0])
+
+    def test_frequency_calendar(self):
+        panel = build_panel(self.histories, calendar='B')
+        self.assertEqual(len(panel.dates), 5)
+        panel = build_panel(self.histories, calendar='D')
+        self.assertEqual(len(panel.dates), 7)  # The weekend is in the calendar, never observed
+        self.assertFalse(panel.mask[4:6].any())
+
+    def test_filled(self):
+        panel = PricePanel(
+            pd.date_range('2024-01-01', periods=5),
+            ['A', 'B'],
+            np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, np.nan], [4.0, 3.0], [np.nan, np.nan]]),
+        )
+        filled = panel.filled()
+        np.testing.assert_array_equal(filled[:, 0], [np.nan, 2.0, 2.0, 4.0, np.nan])
+        np.testing.assert_array_equal(filled[:, 1], [1.0, 1.0, 1.0, 3.0, np.nan])
+        self.assertTrue(panel.to_frame(fill=True).equals(pd.DataFrame(filled, index=panel.dates, columns=['A', 'B'])))
+        self.assertTrue(np.isnan(panel.values[2, 0]))  # The panel itself is not filled
+
+    def test_empty(self):
+        self.assertEqual(build_panel({}).shape, (0, 0))
+
+    def test_only_missing_values(self):
+        dates = pd.date_range('2024-01-02', periods=3, freq='B')
+        histories = {'NAN': pd.Series([np.nan] * 3, index=dates)}
+        self.assertEqual(build_panel(histories, calendar='B').shape, (0, 0))
+        self.assertEqual(build_panel(histories).shape, (0, 0))
+
+
+class TestDownloadPanel(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(5)
+        dates = pd.date_range('2023-01-02', periods=120, freq='B')
+        holidays = dates[[10, 50]]
+        for symbol in ('PANEL1', 'PANEL2'):
+            close = pd.Series(40 + np.cumsum(rng.normal(size=120)), index=dates).drop(holidays)
+            close.to_frame('Close').to_csv(f'{self.directory}/{symbol}.csv')
+        self.predictor = Predictor(data_source=CSVDataSource(self.directory))
+        self.predictor.clear_cache()
+
+    def tearDown(self):
+        self.predictor.clear_cache()
+        shutil.rmtree(self.directory)
+
+    def test_download_panel(self):
+        panel = self.predictor.download_panel(['PANEL1', 'PANEL2', 'MISSING'])
+        self.assertEqual(panel.symbols, ['PANEL1', 'PANEL2'])
+        self.assertEqual(panel.shape, (118, 2))
+        self.assertTrue(panel.mask.all())
+
+        results = BatchARIMA((1, 1, 0)).fit(panel)
+        self.assertEqual(results.symbols, ['PANEL1', 'PANEL2'])
+        self.assertEqual(len(results.fallback), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
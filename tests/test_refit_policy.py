@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from src.models.cache_handler import fingerprint
+from src.models.predictor import Predictor
+from src.models.refit_policy import EXTEND, REFIT, RESELECT, RefitPolicy
+
+class TestRefitPolicy(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        dates = pd.date_range('2020-01-01', periods=300, freq='B')
+        self.data = pd.Series(100 + np.cumsum(rng.normal(size=300)), index=dates)
+        self.predictor = Predictor()
+        self.predictor._cache.delete('arima_UPDATE_latest')
+        self.predictor.create_ARIMA_model(self.data.iloc[:-3], (1, 1, 1), symbol='UPDATE')
+
+    def test_decide(self):
+        record = self.predictor._models.load_latest('UPDATE')
+        extended = self.predictor._models.restore(self.data, record)
+        self.assertEqual(RefitPolicy().decide(record, extended, 3), EXTEND)
+        self.assertEqual(RefitPolicy(refit_every=3).decide(record, extended, 3), REFIT)
+        self.assertEqual(RefitPolicy(reselect_every=3).decide(record, extended, 3), RESELECT)
+        self.assertEqual(RefitPolicy(error_threshold=0).decide(record, extended, 3), REFIT)
+
+    def test_update_extends_without_fitting(self):
+        with mock.patch.object(ARIMA, 'fit', side_effect=AssertionError('fitted again')):
+            model = self.predictor.update_ARIMA_model(self.data, symbol='UPDATE')
+        self.assertEqual(model.nobs, 300)
+
+        record = self.predictor._models.load_latest('UPDATE')
+        self.assertEqual(record['nobs'], 300)
+        self.assertEqual(record['fitted_nobs'], 297)
+
+    def test_update_refits_from_previous_parameters(self):
+        previous_params = self.predictor._models.load_latest('UPDATE')['params']
+        with mock.patch.object(ARIMA, 'fit', autospec=True, side_effect=ARIMA.fit) as fit:
+            self.predictor.update_ARIMA_model(self.data, symbol='UPDATE', policy=RefitPolicy(refit_every=1))
+        np.testing.assert_array_equal(fit.call_args.kwargs['start_params'], previous_params)
+        self.assertEqual(self.predictor._models.load_latest('UPDATE')['fitted_nobs'], 300)
+
+    def test_update_reselects_order(self):
+        with mock.patch.object(Predictor, 'autofit_ARIMA', return_value=(1, 1, 0)) as autofit:
+            model = self.predictor.update_ARIMA_model(self.data, symbol='UPDATE', policy=RefitPolicy(reselect_every=1))
+        autofit.assert_called_once()
+        self.assertEqual(model.model.order, (1, 1, 0))
+
+    def test_revised_history_is_fitted_again(self):
+        revised = self.data.copy()
+        revised.iloc[-10] += 1
+        self.predictor.update_ARIMA_model(revised, symbol='UPDATE')
+        record = self.predictor._models.load_latest('UPDATE')
+        self.assertEqual(record['fitted_nobs'], 300)
+        self.assertEqual(record['fingerprint'], fingerprint(revised))
+
+    def tearDown(self):
+        self.predictor._cache.delete('arima_UPDATE_latest')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+from time import sleep
+import numpy as np
+import pandas as pd
+from src.models.series_store import SeriesStore
+
+class TestSeriesStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = SeriesStore(self.directory)
+        dates = pd.date_range('1995-01-02', periods=300, freq='B')
+        self.series = pd.Series(np.linspace(10, 20, 300), index=dates, name='Close')
+
+    def test_write_and_read(self):
+        self.store.write('AAPL_close_prices', self.series)
+        result = self.store.read('AAPL_close_prices')
+
+        pd.testing.assert_series_equal(result, self.series)
+        self.assertEqual(result.index.freqstr, 'B')
+
+    def test_read_is_memory_mapped(self):
+        self.store.write('AAPL', self.series)
+        result = self.store.read('AAPL')
+        values = result.to_numpy()
+        while not isinstance(values, np.memmap) and values.base is not None:
+            values = values.base
+        self.assertIsInstance(values, np.memmap)
+        self.assertFalse(result.to_numpy().flags.writeable)
+
+    def test_nan_and_timezone_are_kept(self):
+        series = self.series.tz_localize('America/Sao_Paulo')
+        series.iloc[3] = np.nan
+        self.store.write('PETR4.SA', series)
+        result = self.store.read('PETR4.SA')
+        pd.testing.assert_series_equal(result, series)
+
+    def test_expire(self):
+        self.store.write('AAPL', self.series, expire=1)
+        sleep(2)
+        self.assertIsNone(self.store.read('AAPL'))
+        self.assertFalse(os.listdir(self.directory))
+
+    def test_delete_and_missing(self):
+        self.store.write('AAPL', self.series)
+        self.store.delete('AAPL')
+        self.assertIsNone(self.store.read('AAPL'))
+
+    def test_similar_keys_do_not_collide(self):
+        other = self.series * 2
+        self.store.write('A/B', self.series)
+        self.store.write('A_B', other)
+        pd.testing.assert_series_equal(self.store.read('A/B'), self.series)
+        pd.testing.assert_series_equal(self.store.read('A_B'), other)
+        self.assertEqual(set(self.store.sizes()), {'A/B', 'A_B'})
+
+    def test_one_file_per_series(self):
+        self.store.write('AAPL', self.series)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_corrupt_file_is_a_miss(self):
+        self.store.write('AAPL', self.series)
+        path = os.path.join(self.directory, os.listdir(self.directory)[0])
+        with open(path, 'r+b') as f:
+            f.seek(8)
+            f.write(b'{"key": "AAPL", "freq": "not a frequency"')
+        self.assertIsNone(self.store.read('AAPL'))
+
+    def test_bad_frequency_is_a_miss(self):
+        self.store.write('AAPL', self.series)
+        path = os.path.join(self.directory, os.listdir(self.directory)[0])
+        with open(path, 'rb') as f:
+            content = f.read()
+        with open(path, 'wb') as f:
+            f.write(content.replace(b'"freq": "B"', b'"freq": "?"'))
+        self.assertIsNone(self.store.read('AAPL'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
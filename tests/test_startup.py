@@ -0,0 +1,21 @@
+import sys
+import unittest
+from benchmarks.bench_startup import loaded_modules
+from src.models.warmup import prewarm
+
+class TestStartup(unittest.TestCase):
+    def test_heavy_modules_not_imported_at_startup(self):
+        self.assertEqual(loaded_modules('src.controllers.predictor_controller'), [])
+
+    def test_predictor_does_not_import_heavy_modules(self):
+        self.assertEqual(loaded_modules('src.models.predictor'), [])
+
+    def test_prewarm(self):
+        thread = prewarm(['json', 'missing_module_for_test'])
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        self.assertIn('json', sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
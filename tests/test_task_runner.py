@@ -0,0 +1,74 @@
+import threading
+import unittest
+from time import monotonic, sleep
+from src.controllers.task_runner import CANCELLED, DONE, ERROR, PROGRESS, TaskRunner
+
+class TestTaskRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = TaskRunner(max_workers=2)
+
+    def wait_events(self, count, timeout=5):
+        events = []
+        deadline = monotonic() + timeout
+        while len(events) < count and monotonic() < deadline:
+            events += self.runner.poll()
+            sleep(0.01)
+        return events
+
+    def test_progress_and_result(self):
+        def task(report):
+            report('download')
+            report('fit')
+            return 42
+
+        self.assertTrue(self.runner.submit('AAPL', task))
+        events = self.wait_events(3)
+        self.assertEqual(events, [(PROGRESS, 'AAPL', 'download'), (PROGRESS, 'AAPL', 'fit'), (DONE, 'AAPL', 42)])
+
+    def test_error(self):
+        def task(report):
+            raise ValueError('no data')
+
+        self.runner.submit('AAPL', task)
+        event, key, error = self.wait_events(1)[0]
+        self.assertEqual((event, key), (ERROR, 'AAPL'))
+        self.assertIsInstance(error, ValueError)
+
+    def test_cancel_and_duplicates(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def task(report):
+            started.set()
+            release.wait(5)
+            report('fit')
+            return 42
+
+        self.runner.submit('AAPL', task)
+        started.wait(5)
+        self.assertFalse(self.runner.submit('AAPL', task))
+        self.assertEqual(self.runner.running(), ['AAPL'])
+
+        self.runner.cancel('AAPL')
+        release.set()
+        self.assertEqual(self.wait_events(1), [(CANCELLED, 'AAPL', None)])
+        self.assertEqual(self.runner.running(), [])
+
+    def test_concurrent_tasks(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def task(report):
+            barrier.wait()  # Only returns if both tasks run at the same time
+            return True
+
+        self.runner.submit('AAPL', task)
+        self.runner.submit('MSFT', task)
+        events = self.wait_events(2)
+        self.assertEqual(sorted(key for event, key, _ in events if event == DONE), ['AAPL', 'MSFT'])
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()